@@ -38,7 +38,7 @@ INSTALLED_APPS = [
     'django.contrib.messages',
     'django.contrib.staticfiles',
     'rest_framework',
-    'nglogman',
+    'nglogman.apps.NglogmanConfig',
     'widget_tweaks'
 ]
 
@@ -82,6 +82,11 @@ DATABASES = {
         'NAME': os.path.join(BASE_DIR, 'db.sqlite3'),
     }
 }
+# Milliseconds a SQLite connection waits for another writer's lock before
+# failing with 'database is locked'.
+SQLITE_BUSY_TIMEOUT_MS = 20000
+# The most status writes of the gRPC handlers committed in one transaction.
+DB_WRITE_BATCH = 64
 
 
 # Password validation
@@ -125,3 +130,120 @@ STATICFILES_DIRS = [os.path.join(BASE_DIR, 'static'), os.path.join(BASE_DIR, 'no
 
 OUTPUT_ROOT = os.path.join(BASE_DIR, 'Reports')
 OUTPUT_URL = '/Reports'
+
+# gRPC health checks
+# Maximum number of nodes pinged concurrently during a health-check sweep.
+HEALTHCHECK_WORKERS = 64
+# Seconds between background health-check sweeps.
+HEALTHCHECK_INTERVAL = 60
+# Seconds between heartbeats on a client's control stream. Clients with a
+# recent heartbeat are not health-checked.
+CONTROL_HEARTBEAT_SECS = 5
+# Missed heartbeats after which a streaming client is marked Offline.
+CONTROL_MISSED_HEARTBEATS = 3
+
+# gRPC channel pool
+# Seconds an outbound channel to a node may go unused before it is closed.
+CHANNEL_IDLE_SECS = 300
+# Interval and ack timeout of HTTP/2 keepalive pings on pooled channels,
+# sent while calls are in progress. Clients' gRPC servers reject pings more
+# frequent than every 5 minutes, so the interval must not be lower.
+CHANNEL_KEEPALIVE_MS = 300000
+CHANNEL_KEEPALIVE_TIMEOUT_MS = 10000
+
+# gRPC server
+GRPC_ADDRESS = '[::]:50051'
+# 'thread' serves each call on a worker of a GRPC_MAX_WORKERS thread pool.
+# 'aio' serves calls on an asyncio event loop (requires grpcio>=1.32), with
+# database and file work run on bounded pools of GRPC_DB_WORKERS and
+# GRPC_IO_WORKERS threads.
+GRPC_SERVER_MODE = 'thread'
+GRPC_MAX_WORKERS = 10
+# Control streams served at once in 'thread' mode. Each holds a worker of
+# the thread pool for as long as its client is connected, so this must stay
+# below GRPC_MAX_WORKERS to leave workers for other calls. Clients turned
+# away are health-checked instead. Streams are not capped in 'aio' mode.
+CONTROL_THREAD_STREAMS = GRPC_MAX_WORKERS // 2
+GRPC_DB_WORKERS = 4
+GRPC_IO_WORKERS = 8
+# When True, the gRPC server, node health checks and task scheduler are run
+# by `manage.py rungrpc` rather than alongside `manage.py runserver`.
+GRPC_STANDALONE = False
+# Number of rungrpc worker processes sharing GRPC_ADDRESS. More than one
+# needs SO_REUSEPORT support in gRPC, available in grpcio 1.32 or newer.
+GRPC_PROCESSES = 1
+# Seconds between rungrpc scans of the database for newly scheduled tasks.
+SCHEDULE_SYNC_SECS = 10
+# Size of the chunks files are streamed in, in bytes. Sent to clients as
+# the preferred chunk size of their uploads.
+GRPC_CHUNK_SIZE = 256 << 10
+# Largest gRPC message accepted or sent, in bytes. Must exceed the chunk
+# size of any client.
+GRPC_MAX_MESSAGE_BYTES = 4 << 20
+# Resumable result uploads beyond this many at once are turned away, with a
+# hint of when to retry. Uploads through the older 'output' call, whose
+# clients do not retry, are always accepted. In 'thread' mode each upload
+# holds a worker of the pool, so by default uploads may take the workers
+# left by the control streams, less two kept free for registrations,
+# errors and other short calls.
+if GRPC_SERVER_MODE == 'thread':
+    UPLOAD_MAX_CONCURRENT = max(
+        1, GRPC_MAX_WORKERS - CONTROL_THREAD_STREAMS - 2)
+else:
+    UPLOAD_MAX_CONCURRENT = 64
+# Uploads are also turned away while those in progress hold this many bytes
+# in memory, waiting to be written. Each holds one chunk at a time, so by
+# default this is reached once clients send chunks over twice
+# GRPC_CHUNK_SIZE.
+UPLOAD_MAX_PENDING_BYTES = UPLOAD_MAX_CONCURRENT * 2 * GRPC_CHUNK_SIZE
+# Base delay, in seconds, suggested to clients whose upload was turned away.
+UPLOAD_RETRY_SECS = 5
+# Compression of gRPC messages: 'none', 'deflate' or 'gzip'. Used for
+# requests to clients, such as uploaded configs.
+GRPC_COMPRESSION = 'gzip'
+# Compression level of the server's responses: 'none', 'low', 'medium' or
+# 'high'. Other than 'none', gRPC picks gzip or deflate per call, depending
+# on what the client accepts. Clients choose the compression of their own
+# uploads; the server accepts either.
+GRPC_COMPRESSION_LEVEL = 'low'
+# One in this many transferred messages is compressed to estimate the
+# savings reported at /api/stats/compression, or none if 0. Sampling costs
+# CPU on the threads serving calls, so by default it is off unless
+# compression is enabled. Set it to estimate what enabling it would save.
+if GRPC_COMPRESSION != 'none' or GRPC_COMPRESSION_LEVEL != 'none':
+    COMPRESSION_SAMPLE_EVERY = 16
+else:
+    COMPRESSION_SAMPLE_EVERY = 0
+# Link speed, in bytes per second, used to estimate the transfer time saved.
+COMPRESSION_LINK_BYTES_PER_SEC = 1.25e6
+
+# Task dispatch
+# Number of clients sent the start request of a task at once.
+DISPATCH_WORKERS = 32
+# Least number of seconds between dispatching a task and the instant every
+# client begins sampling. The delay is lengthened to the time taken to reach
+# every client of the group, should each take DISPATCH_TIMEOUT_SECS, in
+# rounds of DISPATCH_WORKERS. 0 lets each client start as soon as it is
+# reached.
+DISPATCH_START_DELAY = 2
+# Seconds to wait for a client to accept a start request.
+DISPATCH_TIMEOUT_SECS = 10
+# Number of clients configs are set on or fetched from at once.
+CONFIG_WORKERS = 32
+
+# Report processing
+# Number of processes that build overview workbooks in the background.
+REPORT_WORKERS = 2
+
+# Overview graphs
+# Rendered overview graphs are cached in memory, up to this many runs and
+# this many bytes of rendered output.
+GRAPH_CACHE_ENTRIES = 32
+GRAPH_CACHE_BYTES = 256 << 20
+# Series are downsampled to at most this many points when sent to the
+# browser. Zooming in fetches the visible range at the same budget.
+GRAPH_POINTS_PER_SERIES = 1000
+# Parsed overview workbooks, used to serve zoomed series, are cached up to
+# this many runs and this many bytes.
+GRAPH_FRAME_ENTRIES = 8
+GRAPH_FRAME_BYTES = 512 << 20
@@ -17,7 +17,8 @@ from django.contrib import admin
 from django.urls import path, include
 import sys
 import threading
-from nglm_grpc.gRPCMethods import checkNodes
+from nglm_grpc.gRPCMethods import checkNodes, reapNodes
+from NGLogmanServer.settings import GRPC_STANDALONE
 
 urlpatterns = [
     path('admin/', admin.site.urls),
@@ -35,18 +36,14 @@ urlpatterns = [
 if sys.version_info[0] < 3:
     raise Exception("Must be using Python 3.")
 
-if 'runserver' in sys.argv:
-    import grpc
+if 'runserver' in sys.argv and not GRPC_STANDALONE:
+    from nglm_grpc.gRPCServer import startServer
 
-    from nglm_grpc.modules.Utility import singletonThreadPool
-    from nglm_grpc.gRPCMethods import addToServer, checkNodes
-    from nglogman.models import LGNode
-
-    server = grpc.server(singletonThreadPool(max_workers=10))
-    addToServer(server)
-    server.add_insecure_port('[::]:50051')
-    server.start()
+    server = startServer()
 
     threading.Thread(
         target=checkNodes, kwargs={'repeat': True}
     ).start()
+    threading.Thread(
+        target=reapNodes, kwargs={'repeat': True}, daemon=True
+    ).start()
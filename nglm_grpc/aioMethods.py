@@ -0,0 +1,254 @@
+import asyncio
+import functools
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import grpc
+
+from . import nglm_pb2
+from . import nglm_pb2_grpc
+from nglm_grpc.gRPCMethods import ServerServicer, LoggingServicer, \
+    getNodeUUID, getNodeTask, getResultPath, getMetricPath, completeOutput, \
+    recordError, openControl, closeControl, COMPRESSION_STATS, UPLOADS, \
+    CONTROL_HUB
+from nglm_grpc.modules.MetricStore import MetricWriter
+from nglm_grpc.modules.Upload import PartialUpload
+from NGLogmanServer.settings import GRPC_DB_WORKERS, GRPC_IO_WORKERS
+
+"""
+Asyncio versions of the gRPC servicers, used when GRPC_SERVER_MODE is 'aio'.
+Handlers run on the event loop and never block it: database work is handed
+to DB_EXECUTOR and file work to IO_EXECUTOR, both bounded thread pools, so
+thousands of concurrent streams do not need a thread each.
+"""
+
+DB_EXECUTOR = ThreadPoolExecutor(max_workers=GRPC_DB_WORKERS)
+IO_EXECUTOR = ThreadPoolExecutor(max_workers=GRPC_IO_WORKERS)
+# Bytes of a stream buffered in memory before being handed to IO_EXECUTOR.
+WRITE_BATCH = 1 << 20
+
+
+def runDB(func, *args):
+    return asyncio.get_event_loop().run_in_executor(DB_EXECUTOR, func, *args)
+
+
+def runIO(func, *args):
+    return asyncio.get_event_loop().run_in_executor(IO_EXECUTOR, func, *args)
+
+
+class AsyncServerServicer(ServerServicer):
+    async def register(self, request, context):
+        """
+        Runs ServerServicer.register on the database executor. The context
+        is unused by register, so it is safe to pass across threads.
+        """
+        return await runDB(super().register, request, context)
+
+    async def isAlive(self, request, context):
+        return super().isAlive(request, context)
+
+    async def control(self, request, context):
+        """
+        The control stream of a client, on the event loop rather than a
+        thread per stream. Commands are queued from any thread onto the loop.
+        See ServerServicer.control.
+        """
+        nodeUUID = getNodeUUID(context)
+        loop = asyncio.get_event_loop()
+        commands = asyncio.Queue()
+        session = await runDB(
+            openControl, nodeUUID,
+            lambda command: loop.call_soon_threadsafe(commands.put_nowait,
+                                                      command))
+
+        async def receive():
+            try:
+                async for message in request:
+                    CONTROL_HUB.heartbeat(nodeUUID)
+                    if message.HasField('result'):
+                        session.resolve(message.result)
+            except Exception:
+                pass
+            finally:
+                DB_EXECUTOR.submit(closeControl, session)
+
+        receiver = asyncio.ensure_future(receive())
+        try:
+            while True:
+                command = await commands.get()
+                if command is None:
+                    return
+                yield command
+        finally:
+            receiver.cancel()
+            DB_EXECUTOR.submit(closeControl, session)
+
+
+class AsyncLoggingServicer(LoggingServicer):
+    async def output(self, request, context):
+        """
+        Receives the output workbook of a client. Chunks are written in
+        batches on the IO executor, and completion is checked on the database
+        executor. See LoggingServicer.output.
+        """
+        res = nglm_pb2.response()
+        try:
+            node, task = await runDB(getNodeTask, getNodeUUID(context))
+            path = getResultPath(node, task)
+            f = await runIO(openResult, path)
+            try:
+                batch = []
+                size = 0
+                async for chunk in request:
+                    COMPRESSION_STATS.record('output', chunk)
+                    batch.append(chunk.buffer)
+                    size += len(chunk.buffer)
+                    if size >= WRITE_BATCH:
+                        await runIO(f.writelines, batch)
+                        batch = []
+                        size = 0
+                await runIO(f.writelines, batch)
+            except BaseException:
+                await runIO(discardResult, f)
+                raise
+            await runIO(commitResult, f, path)
+            print('saved to %s' % path)
+            res.success = True
+            await runDB(completeOutput, node, task)
+        except Exception:
+            res.success = False
+        return res
+
+    async def err(self, request, context):
+        """
+        Records a client's error on the database executor. See
+        LoggingServicer.err.
+        """
+        res = nglm_pb2.response()
+        try:
+            await runDB(recordError, getNodeUUID(context), request.exception)
+            res.success = True
+        except Exception:
+            res.success = False
+        return res
+
+    async def streamMetrics(self, request, context):
+        """
+        Appends streamed metric samples to the run's metric store, flushing
+        on the IO executor. See LoggingServicer.streamMetrics.
+        """
+        res = nglm_pb2.response()
+        writer = None
+        try:
+            node, task = await runDB(getNodeTask, getNodeUUID(context))
+            path = getMetricPath(node, task)
+            async for sample in request:
+                COMPRESSION_STATS.record('metrics', sample)
+                if writer is None:
+                    writer = await runIO(functools.partial(
+                        MetricWriter, path, sample.names, autoFlush=False))
+                writer.append(sample.timestamp, sample.values)
+                if writer.isFull:
+                    await runIO(writer.flush)
+            res.success = True
+        except Exception:
+            res.success = False
+        finally:
+            if writer is not None:
+                await runIO(writer.close)
+        return res
+
+    async def outputOffset(self, request, context):
+        """
+        Returns the committed offset of a client's resumable upload. See
+        LoggingServicer.outputOffset.
+        """
+        res = nglm_pb2.uploadStatus()
+        try:
+            node, task = await runDB(getNodeTask, getNodeUUID(context))
+            upload = PartialUpload(getResultPath(node, task))
+            res.offset = await runIO(lambda: upload.offset)
+            res.success = True
+        except Exception as e:
+            res.success = False
+            res.message = str(e)
+        return res
+
+    async def resumeOutput(self, request, context):
+        """
+        Receives a client's output as a resumable upload, writing and
+        verifying it on the IO executor. See LoggingServicer.resumeOutput.
+        """
+        ticket = await admitUpload(context)
+        res = nglm_pb2.uploadStatus()
+        upload = None
+        try:
+            node, task = await runDB(getNodeTask, getNodeUUID(context))
+            upload = PartialUpload(getResultPath(node, task))
+            async for chunk in request:
+                COMPRESSION_STATS.record('output', chunk)
+                ticket.hold(len(chunk.buffer))
+                await runIO(upload.write, chunk.offset, chunk.buffer)
+                ticket.release(len(chunk.buffer))
+                if chunk.sha256:
+                    await runIO(upload.commit, chunk.sha256)
+                    print('saved to %s' % upload.path)
+                    res.success = True
+                    res.offset = chunk.offset + len(chunk.buffer)
+                    await runDB(completeOutput, node, task)
+                    break
+        except Exception as e:
+            res.success = False
+            res.message = str(e)
+        finally:
+            ticket.close()
+            if upload is not None:
+                await runIO(upload.close)
+                if not res.success:
+                    res.offset = await runIO(lambda: upload.offset)
+        return res
+
+
+async def admitUpload(context):
+    """
+    Admits an upload, or ends the call with RESOURCE_EXHAUSTED. See
+    gRPCMethods.admitUpload.
+    """
+    ticket = UPLOADS.admit()
+    if ticket is None:
+        retry = UPLOADS.retryAfter()
+        await context.abort(
+            grpc.StatusCode.RESOURCE_EXHAUSTED,
+            'Too many uploads in progress, retry in %.1f seconds.' % retry,
+            trailing_metadata=(('retry-after', '%.1f' % retry),))
+    return ticket
+
+
+def openResult(path):
+    """
+    Opens a temporary file to receive a result, which commitResult moves to
+    the result path once complete.
+    """
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    return open(path + '.tmp', 'wb')
+
+
+def commitResult(f, path):
+    f.close()
+    os.replace(f.name, path)
+
+
+def discardResult(f):
+    f.close()
+    os.remove(f.name)
+
+
+def addToAioServer(server):
+    """
+    Registers the asyncio gRPC Services on a grpc.aio server. Should new
+    services be added, add their Servicer below.
+    :param server: The grpc.aio.server instance to add the servicer to.
+    :return: None.
+    """
+    nglm_pb2_grpc.add_ServerServicer_to_server(AsyncServerServicer(), server)
+    nglm_pb2_grpc.add_LoggingServicer_to_server(AsyncLoggingServicer(), server)
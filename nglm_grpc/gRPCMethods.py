@@ -1,17 +1,44 @@
 import grpc
+import hashlib
+import math
+import queue
 import sys
 import os
 import uuid
-import re
-from openpyxl import Workbook, load_workbook
+import time
+import threading
+import multiprocessing
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
 from time import sleep
 
 from . import nglm_pb2
 from . import nglm_pb2_grpc
-from nglogman.models import LGNode, Task, NodeGroup
+from nglogman.models import LGNode, Task, NodeGroup, TestRun, ResultFile, \
+    TaskFailure
 from nglm_grpc.modules.Utility import timestamp
+from nglm_grpc.modules.Admission import AdmissionController
+from nglm_grpc.modules.ChannelPool import ChannelPool
+from nglm_grpc.modules.Compression import CompressionStats, channelArgs
+from nglm_grpc.modules.ControlHub import ControlHub
+from nglm_grpc.modules.DBWriter import DBWriter
+from nglm_grpc.modules.MetricStore import MetricWriter
+from nglm_grpc.modules.Overview import buildOverview, OVERVIEW_NAME
+from nglm_grpc.modules.Upload import PartialUpload
+from NGLogmanServer.settings import HEALTHCHECK_WORKERS, \
+    HEALTHCHECK_INTERVAL, CHANNEL_IDLE_SECS, CHANNEL_KEEPALIVE_MS, \
+    CHANNEL_KEEPALIVE_TIMEOUT_MS, GRPC_STANDALONE, SCHEDULE_SYNC_SECS, \
+    REPORT_WORKERS, DISPATCH_WORKERS, DISPATCH_START_DELAY, \
+    DISPATCH_TIMEOUT_SECS, CONFIG_WORKERS, \
+    GRPC_CHUNK_SIZE, GRPC_MAX_MESSAGE_BYTES, GRPC_COMPRESSION, \
+    COMPRESSION_SAMPLE_EVERY, COMPRESSION_LINK_BYTES_PER_SEC, \
+    UPLOAD_MAX_CONCURRENT, UPLOAD_MAX_PENDING_BYTES, UPLOAD_RETRY_SECS, \
+    CONTROL_HEARTBEAT_SECS, CONTROL_MISSED_HEARTBEATS, DB_WRITE_BATCH, \
+    CONTROL_THREAD_STREAMS
 from apscheduler.schedulers.background import BackgroundScheduler
+from django.db import transaction, IntegrityError
 from django.db.models import Q
+from django.utils import timezone
+from datetime import timedelta
 
 """
 Contains the methods that relate to the gRPC methods used in NGLogman. This
@@ -20,26 +47,58 @@ contain procedures called by the client to the server, and vice versa.
 
 SCHEDULER = BackgroundScheduler()
 TIMEOUT_SECS = 2
+# Rows updated per 'IN' query, to stay under SQLite's limit of 999 query
+# parameters.
+UPDATE_BATCH = 900
+# Timing and result counts of the most recent health-check sweep.
+LAST_SWEEP = {}
+CHANNEL_POOL = ChannelPool(
+    idleTimeout=CHANNEL_IDLE_SECS, keepaliveMs=CHANNEL_KEEPALIVE_MS,
+    keepaliveTimeoutMs=CHANNEL_KEEPALIVE_TIMEOUT_MS,
+    options=[('grpc.max_send_message_length', GRPC_MAX_MESSAGE_BYTES),
+             ('grpc.max_receive_message_length', GRPC_MAX_MESSAGE_BYTES)]
+    + channelArgs(GRPC_COMPRESSION))
+# Limits the result uploads in progress at once.
+UPLOADS = AdmissionController(maxUploads=UPLOAD_MAX_CONCURRENT,
+                              maxPendingBytes=UPLOAD_MAX_PENDING_BYTES,
+                              retrySecs=UPLOAD_RETRY_SECS)
+# Transferred bytes and estimated compression savings, per stream.
+COMPRESSION_STATS = CompressionStats(
+    sampleEvery=COMPRESSION_SAMPLE_EVERY,
+    linkBytesPerSec=COMPRESSION_LINK_BYTES_PER_SEC)
+# Status writes of the gRPC handlers, committed in batches by one thread.
+DB_WRITER = DBWriter(transaction.atomic, batchSize=DB_WRITE_BATCH)
+# Control streams of the clients connected to this process.
+CONTROL_HUB = ControlHub()
+CONTROL_FLUSHER = None
+CONTROL_FLUSHER_LOCK = threading.Lock()
 ROOT_DIR = os.path.dirname(sys.modules['__main__'].__file__)
+# Completion checks run one at a time on REPORT_QUEUE, and overviews are
+# built on REPORT_POOL, created by getReportPool.
+REPORT_QUEUE = ThreadPoolExecutor(max_workers=1)
+REPORT_POOL = None
+REPORT_POOL_LOCK = threading.Lock()
 
 class ServerServicer(nglm_pb2_grpc.ServerServicer):
     def register(self, request, context):
         """
         Register procedure called by client. Should not be called manually.
+        The node is written through DB_WRITER.
         :param request: Attributes are hostname, ipv4, port, uuid. Contains
         the information sent by the client in the registration call.
         :param context: gRPC context object. Unused in this function.
         :return: A boolean to the client describing success.
         """
         res = nglm_pb2.registerResponse()
-        try:
+
+        def write():
             matchedNodes = LGNode.objects.filter(
-                Q(ip__iexact=request.ipv4) |
+                Q(ip=request.ipv4) |
                 Q(nodeUUID__exact=uuid.UUID(request.uuid))
             )
+            name = request.alias if request.alias else request.hostname
             if matchedNodes.count() == 0:
                 res.uuid = request.uuid if request.uuid else str(uuid.uuid4())
-                name = request.alias if request.alias else request.hostname
                 LGNode.objects.create(hostname=name, ip=request.ipv4,
                                       port=request.port,
                                       nodeUUID=uuid.UUID(res.uuid))
@@ -47,12 +106,20 @@ class ServerServicer(nglm_pb2_grpc.ServerServicer):
                       request.hostname + ' IP: ' + request.ipv4 +
                       ' Host Port:' + str(request.port))
             else:
-                name = request.alias if request.alias else request.hostname
-                matchedNodes.update(hostname=name, port=request.port)
+                for node in matchedNodes.exclude(port=request.port):
+                    CHANNEL_POOL.invalidate(getAddress(node))
+                # A returning client may have had its config changed while
+                # it was away, so its cached config is refetched.
+                matchedNodes.update(hostname=name, port=request.port,
+                                    configHash='')
                 res.uuid = str(matchedNodes[0].nodeUUID)
                 print('Returning node. Hostname: ' +
                       request.hostname + ' IP: ' + request.ipv4 +
                       ' Host Port:' + str(request.port))
+
+        try:
+            DB_WRITER.call(write)
+            res.heartbeatSecs = CONTROL_HEARTBEAT_SECS
             res.success = True
         except Exception as e:
             res.success = False
@@ -70,6 +137,144 @@ class ServerServicer(nglm_pb2_grpc.ServerServicer):
         res.success = True
         return res
 
+    def control(self, request_iterator, context):
+        """
+        The control stream a client keeps open after registering. Messages
+        from the client are read on a separate thread, each counting as a
+        heartbeat, while commands pushed through CONTROL_HUB are sent down
+        the stream. The client is marked Available when the stream opens,
+        and Offline as soon as it closes. Each stream holds a worker of the
+        server's thread pool, so at most CONTROL_THREAD_STREAMS are served,
+        and further clients are turned away with RESOURCE_EXHAUSTED, to be
+        health-checked instead.
+        :param request_iterator: A stream of controlMessage messages.
+        :param context: Metadata in context provides the UUID of the client.
+        :return: A stream of controlCommand messages.
+        """
+        nodeUUID = getNodeUUID(context)
+        commands = queue.Queue()
+        session = openControl(nodeUUID, commands.put, CONTROL_THREAD_STREAMS)
+        if session is None:
+            context.abort(grpc.StatusCode.RESOURCE_EXHAUSTED,
+                          'Too many control streams, falling back to '
+                          'health checks.')
+
+        def receive():
+            try:
+                for message in request_iterator:
+                    CONTROL_HUB.heartbeat(nodeUUID)
+                    if message.HasField('result'):
+                        session.resolve(message.result)
+            except Exception:
+                pass
+            finally:
+                closeControl(session)
+
+        threading.Thread(target=receive, daemon=True).start()
+        context.add_callback(lambda: closeControl(session))
+        while True:
+            command = commands.get()
+            if command is None:
+                return
+            yield command
+
+
+def openControl(nodeUUID, put, limit=None):
+    """
+    Opens a client's control session, and marks the client Available.
+    :param nodeUUID: The UUID of the client.
+    :param put: A thread-safe callable queueing commands onto the stream.
+    :param limit: The most control sessions open at once, or None.
+    :return: The ControlHub Session, or None if the limit is reached.
+    """
+    session = CONTROL_HUB.open(nodeUUID, put, limit)
+    if session is None:
+        return None
+    startControlFlusher()
+
+    def write():
+        LGNode.objects.filter(nodeUUID=nodeUUID).exclude(
+            status="Busy").update(status="Available")
+        LGNode.objects.filter(nodeUUID=nodeUUID).update(
+            lastSeen=timezone.now())
+    DB_WRITER.call(write)
+    return session
+
+
+def closeControl(session):
+    """
+    Closes a client's control session. Unless the client has already
+    reconnected, it is marked Offline, and left to the health-check sweep.
+    :param session: The ControlHub Session.
+    :return: None.
+    """
+    def write():
+        LGNode.objects.filter(nodeUUID=session.nodeUUID).exclude(
+            status="Busy").update(status="Offline")
+        LGNode.objects.filter(nodeUUID=session.nodeUUID).update(
+            lastSeen=None)
+    if CONTROL_HUB.close(session):
+        DB_WRITER.call(write)
+
+
+def startControlFlusher():
+    """
+    Starts the thread writing heartbeats to the database, in the process
+    serving control streams, if not already running.
+    :return: None.
+    """
+    global CONTROL_FLUSHER
+    with CONTROL_FLUSHER_LOCK:
+        if CONTROL_FLUSHER is None:
+            CONTROL_FLUSHER = threading.Thread(
+                target=flushHeartbeats, kwargs={'repeat': True}, daemon=True)
+            CONTROL_FLUSHER.start()
+
+
+def flushHeartbeats(repeat=False):
+    """
+    Writes the heartbeats received since the last flush to LGNode.lastSeen,
+    in one batch rather than a write per heartbeat. Clients heard from are
+    marked Available if they were Offline.
+    :param repeat: Whether to flush every CONTROL_HEARTBEAT_SECS seconds.
+    :return: None.
+    """
+    def write(chunk, now):
+        LGNode.objects.filter(nodeUUID__in=chunk).update(lastSeen=now)
+        LGNode.objects.filter(nodeUUID__in=chunk, status="Offline").update(
+            status="Available")
+
+    while True:
+        seen = list(CONTROL_HUB.takeSeen())
+        now = timezone.now()
+        for i in range(0, len(seen), UPDATE_BATCH):
+            DB_WRITER.call(write, seen[i:i + UPDATE_BATCH], now)
+        if not repeat:
+            return
+        sleep(CONTROL_HEARTBEAT_SECS)
+
+
+def reapNodes(repeat=False):
+    """
+    Marks clients Offline once they have missed CONTROL_MISSED_HEARTBEATS
+    heartbeats. Their lastSeen is cleared, leaving them to the health-check
+    sweep until they reconnect. Busy clients are left alone, as they are
+    freed when their output or error arrives.
+    :param repeat: Whether to check every CONTROL_HEARTBEAT_SECS seconds.
+    :return: The number of clients marked Offline by the last check.
+    """
+    while True:
+        cutoff = timezone.now() - timedelta(
+            seconds=CONTROL_HEARTBEAT_SECS * CONTROL_MISSED_HEARTBEATS)
+        reaped = DB_WRITER.call(
+            lambda: LGNode.objects.filter(lastSeen__lt=cutoff).exclude(
+                status="Busy").update(status="Offline", lastSeen=None))
+        if reaped:
+            print('%d node(s) missed their heartbeats.' % reaped)
+        if not repeat:
+            return reaped
+        sleep(CONTROL_HEARTBEAT_SECS)
+
 
 class LoggingServicer(nglm_pb2_grpc.LoggingServicer):
     def output(self, request, context):
@@ -80,22 +285,15 @@ class LoggingServicer(nglm_pb2_grpc.LoggingServicer):
         :param context: Metadata in context provides the UUID of the client.
         :return: A boolean representing whether the call was successful.
         """
+        # Not admitted through UPLOADS, as the clients using this call do
+        # not retry an upload turned away. See resumeOutput.
         res = nglm_pb2.response()
         try:
-            metadata = context.invocation_metadata()
-            node_uuid = uuid.UUID(metadata[0].value)
-            node = LGNode.objects.filter(nodeUUID=node_uuid)[0]
-            task = Task.objects.filter(taskUUID=node.currentTask)[0]
-
-            saveResponse(request, os.path.join(
-                ROOT_DIR, "Reports", task.taskName + '_' + str(task.taskUUID),
-                timestamp(task.startTime),
-                node.hostname + '_' + node.ip.split('.')[-1] + '_' +
-                str(task.taskUUID) + '_result.xlsx'))
-            LGNode.objects.filter(nodeUUID=node.nodeUUID).update(
-                status="Available", currentTask=None)
+            node, task = getNodeTask(getNodeUUID(context))
+            saveResponse(COMPRESSION_STATS.track('output', request),
+                         getResultPath(node, task))
             res.success = True
-            validateTask(task)
+            completeOutput(node, task)
         except:
             res.success = False
         return res
@@ -110,29 +308,267 @@ class LoggingServicer(nglm_pb2_grpc.LoggingServicer):
         """
         res = nglm_pb2.response()
         try:
-            metadata = context.invocation_metadata()
-            node_uuid = uuid.UUID(metadata[0].value)
-            node = LGNode.objects.filter(nodeUUID=node_uuid)[0]
-            task = Task.objects.filter(taskUUID=node.currentTask)[0]
-
-            if 'Failed' in task.status:
-                task.status = task.status + '\n%s: %s' \
-                              % (node.ip, request.exception)
-            else:
-                task.status = 'Failed: \n%s: %s' \
-                            % (node.ip, request.exception)
-            task.save()
-            NodeGroup.objects.filter(currentTask=task.taskUUID).update(
-                currentTask=None)
-            node.status = 'Available'
-            node.currentTask = None
-            node.save()
+            recordError(getNodeUUID(context), request.exception)
+            res.success = True
+        except:
+            res.success = False
+        return res
 
+    def streamMetrics(self, request, context):
+        """
+        Receives metric samples from a client while a task is running, and
+        appends them to the run's columnar metric store. The first sample
+        must carry the metric names; later samples only need values.
+        :param request: A stream of metricSample messages.
+        :param context: Metadata in context provides the UUID of the client.
+        :return: A boolean representing whether the call was successful.
+        """
+        res = nglm_pb2.response()
+        writer = None
+        try:
+            node, task = getNodeTask(getNodeUUID(context))
+            path = getMetricPath(node, task)
+            for sample in COMPRESSION_STATS.track('metrics', request):
+                if writer is None:
+                    writer = MetricWriter(path, sample.names)
+                writer.append(sample.timestamp, sample.values)
             res.success = True
         except:
             res.success = False
+        finally:
+            if writer is not None:
+                writer.close()
         return res
 
+    def outputOffset(self, request, context):
+        """
+        Returns the number of bytes of a client's output committed so far by
+        resumeOutput, so an interrupted upload can resume from there.
+        :param request: gRPC request object. Unused in this function.
+        :param context: Metadata in context provides the UUID of the client.
+        :return: The committed offset.
+        """
+        res = nglm_pb2.uploadStatus()
+        try:
+            node, task = getNodeTask(getNodeUUID(context))
+            res.offset = PartialUpload(getResultPath(node, task)).offset
+            res.success = True
+        except Exception as e:
+            res.success = False
+            res.message = str(e)
+        return res
+
+    def resumeOutput(self, request, context):
+        """
+        Receives the output workbook of a client as a resumable upload. The
+        first chunk may start at any offset up to the committed one, and the
+        last chunk carries the digest of the whole file. The workbook is
+        only moved into place, and completion checked, once the digest
+        matches.
+        :param request: A stream of uploadChunk messages.
+        :param context: Metadata in context provides the UUID of the client.
+        :return: Whether the upload completed, and the committed offset.
+        """
+        ticket = admitUpload(context)
+        res = nglm_pb2.uploadStatus()
+        upload = None
+        try:
+            node, task = getNodeTask(getNodeUUID(context))
+            upload = PartialUpload(getResultPath(node, task))
+            for chunk in ticket.track(COMPRESSION_STATS.track('output',
+                                                              request)):
+                upload.write(chunk.offset, chunk.buffer)
+                if chunk.sha256:
+                    upload.commit(chunk.sha256)
+                    print('saved to %s' % upload.path)
+                    res.success = True
+                    res.offset = chunk.offset + len(chunk.buffer)
+                    completeOutput(node, task)
+                    break
+        except Exception as e:
+            res.success = False
+            res.message = str(e)
+        finally:
+            ticket.close()
+            if upload is not None:
+                upload.close()
+                if not res.success:
+                    res.offset = upload.offset
+        return res
+
+
+def admitUpload(context):
+    """
+    Admits an upload through UPLOADS, or ends the call with
+    RESOURCE_EXHAUSTED and a 'retry-after' trailer, in seconds, if too many
+    uploads are in progress.
+    :param context: The gRPC context of the upload.
+    :return: The admission Ticket, to be closed once the upload ends.
+    """
+    ticket = UPLOADS.admit()
+    if ticket is None:
+        retry = UPLOADS.retryAfter()
+        context.set_trailing_metadata((('retry-after', '%.1f' % retry),))
+        context.abort(grpc.StatusCode.RESOURCE_EXHAUSTED,
+                      'Too many uploads in progress, retry in %.1f seconds.'
+                      % retry)
+    return ticket
+
+
+def getNodeUUID(context):
+    """
+    Reads the UUID sent by a client in its call metadata.
+    :param context: The gRPC context object of the call.
+    :return: The UUID of the calling client.
+    """
+    metadata = [(key, value) for key, value in context.invocation_metadata()
+                if key != 'user-agent' and not key.startswith('grpc-')]
+    return uuid.UUID(metadata[0][1])
+
+
+def getNodeTask(node_uuid):
+    """
+    Looks up a client and the task it is currently running.
+    :param node_uuid: The UUID of the client.
+    :return: A tuple of the LGNode and Task instances.
+    """
+    node = LGNode.objects.filter(nodeUUID=node_uuid)[0]
+    task = Task.objects.filter(taskUUID=node.currentTask)[0]
+    return node, task
+
+
+def getResultPath(node, task):
+    """
+    Returns the path that a client's output workbook is saved to.
+    :param node: The LGNode instance.
+    :param task: The Task instance the output belongs to.
+    :return: The path of the result file.
+    """
+    return os.path.join(
+        getOutputPath(task),
+        node.hostname + '_' + node.ip.split('.')[-1] + '_' +
+        str(task.taskUUID) + '_result.xlsx')
+
+
+def getMetricPath(node, task):
+    """
+    Returns the directory of a client's streamed metric store.
+    :param node: The LGNode instance.
+    :param task: The Task instance the metrics belong to.
+    :return: The path of the metric store.
+    """
+    return os.path.join(getOutputPath(task), 'metrics',
+                        node.hostname + '_' + node.ip.split('.')[-1])
+
+
+def completeOutput(node, task):
+    """
+    Frees a client once its output has been saved, through DB_WRITER, and
+    queues a check of whether the task is now complete. The check and any
+    report building run in the background, off the request path.
+    :param node: The LGNode instance that sent the output.
+    :param task: The Task instance the output belongs to.
+    :return: None.
+    """
+    def write():
+        LGNode.objects.filter(nodeUUID=node.nodeUUID).update(
+            status="Available", currentTask=None)
+        catalogResult(node, task)
+    DB_WRITER.call(write)
+    REPORT_QUEUE.submit(validateTask, task)
+
+
+def catalogResult(node, task):
+    """
+    Records a client's saved result file in the run catalog, creating the
+    run's TestRun if it is the first result of the run.
+    :param node: The LGNode instance that sent the output.
+    :param task: The Task instance the output belongs to.
+    :return: None.
+    """
+    lookup = {'task': task, 'testTime': timestamp(task.startTime)}
+    try:
+        # A savepoint, so the transaction survives the run being created at
+        # the same time by another rungrpc process.
+        with transaction.atomic():
+            run = TestRun.objects.get_or_create(
+                defaults={'reportStatus': 'Waiting'}, **lookup)[0]
+    except IntegrityError:
+        run = TestRun.objects.get(**lookup)
+    path = getResultPath(node, task)
+    name = os.path.basename(path)
+    size = os.path.getsize(path)
+    files = ResultFile.objects.filter(run=run, name=name)
+    # Not update_or_create, whose read-then-write transaction deadlocks on
+    # SQLite when several clients complete at once.
+    if not files.update(node=node, size=size):
+        try:
+            # A savepoint, so the transaction survives a duplicate.
+            with transaction.atomic():
+                ResultFile.objects.create(run=run, name=name, node=node,
+                                          size=size)
+        except IntegrityError:
+            files.update(node=node, size=size)
+
+
+def catalogRuns(task, taskPath, testTimes, nodes=None):
+    """
+    Adds runs of a task found on disk, and their result files, to the run
+    catalog. Used to backfill runs written before the catalog existed, or
+    copied in from elsewhere.
+    :param task: The Task instance the runs belong to.
+    :param taskPath: The task's directory under Reports.
+    :param testTimes: The timestamps of the runs, naming their directories.
+    :param nodes: A dict mapping node names, as in result file names, to
+    LGNode instances. Defaults to every registered node.
+    :return: A tuple of the numbers of runs and result files cataloged.
+    """
+    if nodes is None:
+        nodes = {node.hostname + '_' + node.ip.split('.')[-1]: node
+                 for node in LGNode.objects.all()}
+    suffix = '_' + str(task.taskUUID) + '_result.xlsx'
+    runCount = fileCount = 0
+    for testTime in testTimes:
+        runPath = os.path.join(taskPath, testTime)
+        hasOverview = os.path.isfile(os.path.join(runPath, OVERVIEW_NAME))
+        run, created = TestRun.objects.get_or_create(
+            task=task, testTime=testTime, defaults={
+                'reportStatus': 'Done' if hasOverview else 'Waiting',
+                'hasOverview': hasOverview})
+        if not created and run.hasOverview != hasOverview:
+            TestRun.objects.filter(pk=run.pk).update(hasOverview=hasOverview)
+        runCount += 1
+
+        for name in os.listdir(runPath):
+            if not name.endswith(suffix):
+                continue
+            ResultFile.objects.update_or_create(
+                run=run, name=name, defaults={
+                    'node': nodes.get(name[:-len(suffix)]),
+                    'size': os.path.getsize(os.path.join(runPath, name))})
+            fileCount += 1
+    return runCount, fileCount
+
+
+def recordError(node_uuid, exception):
+    """
+    Records the error a client reported for its current task, marks the task
+    failed, and frees the client, on the DB_WRITER thread.
+    :param node_uuid: The UUID of the client reporting the error.
+    :param exception: The error message sent by the client.
+    :return: None.
+    """
+    def write():
+        node, task = getNodeTask(node_uuid)
+        TaskFailure.objects.create(task=task, node=node, message=exception)
+        task.transition('Failed', ('Scheduled', 'In Progress'))
+        NodeGroup.objects.filter(currentTask=task.taskUUID).update(
+            currentTask=None)
+        node.status = 'Available'
+        node.currentTask = None
+        node.save()
+    DB_WRITER.call(write)
+
 
 def addToServer(server):
     # Adds services to server, called on server start
@@ -146,213 +582,516 @@ def addToServer(server):
     nglm_pb2_grpc.add_LoggingServicer_to_server(LoggingServicer(), server)
 
 
+def getOutputPath(task):
+    """
+    Returns the directory holding the output of a task's current run.
+    :param task: The Task model instance.
+    :return: The path of the run's output directory.
+    """
+    return os.path.join(ROOT_DIR, "Reports",
+                        task.taskName + '_' + str(task.taskUUID),
+                        timestamp(task.startTime))
+
+
 def validateTask(task):
     """
     Called when the server receives an output, and checks for task completion.
-    If the task is completed, generate the overview workbook, and update task
-    status.
+    If the task is completed, queue a job on the report process pool to
+    generate the overview workbook. The task status is updated once the job
+    is done. Run on REPORT_QUEUE, so checks for the same run never overlap.
     :param task: The task to check completion for.
     :return: A boolean representing whether the task is completed or not.
     """
-    output_path = os.path.join(ROOT_DIR, "Reports",
-                               task.taskName + '_' + str(task.taskUUID),
-                               timestamp(task.startTime))
-    for node in task.assignedNode.nodes.all():
-        path = os.path.join(
-            output_path,
-            node.hostname + '_' + node.ip.split('.')[-1] + '_' +
-            str(task.taskUUID) + '_result.xlsx'
-        )
-        if not os.path.isfile(path):
-            return False
+    run = TestRun.objects.filter(
+        task=task, testTime=timestamp(task.startTime)).first()
+    nodes = task.assignedNode.nodes.all()
+    if run is None or run.files.filter(node__in=nodes).values(
+            'node').distinct().count() < nodes.count():
+        return False
+
+    # Checked and set in one update, so that of several processes receiving
+    # the last results at once, only one builds the overview.
+    if not DB_WRITER.call(lambda: TestRun.objects.filter(pk=run.pk).exclude(
+            reportStatus='Queued').update(reportStatus='Queued',
+                                          reportMessage='')):
+        return True
 
-    res_path = os.path.join(output_path, 'overview.xlsx')
-    wb = Workbook()
-    for root, dirs, files in os.walk(output_path):
-        for f in files:
-            name = re.compile(r'(.*)_.*_.*_(?:result.xlsx)').match(f).group(1)
-            wb.create_sheet(name, 0)
-            read_wb = load_workbook(os.path.join(root, f))
-            read_ws = read_wb.worksheets[0]
-            for row in read_ws:
-                for cell in row:
-                    wb.active[cell.coordinate].value = cell.value
-    del wb['Sheet']  # removes extra default sheet
-    wb.save(res_path)
-
-    Task.objects.filter(taskUUID=task.taskUUID).update(
-        status="Completed")
-    NodeGroup.objects.filter(currentTask=task.taskUUID).update(
-        currentTask=None)
+    future = getReportPool().submit(buildOverview, getOutputPath(task))
+    future.add_done_callback(
+        lambda future: finishReport(future, task, run.pk))
     return True
 
 
-def checkNodes(nodes=LGNode.objects.all(), timeout=TIMEOUT_SECS, repeat=False):
+def finishReport(future, task, runID):
+    """
+    Records the outcome of an overview job, and marks the task completed if
+    it succeeded. Called once the job's future is done.
+    :param future: The future of the buildOverview job.
+    :param task: The task the overview belongs to.
+    :param runID: The primary key of the TestRun of the job.
+    :return: None.
+    """
+    def fail(e):
+        TestRun.objects.filter(pk=runID).update(reportStatus='Failed',
+                                                reportMessage=str(e))
+
+    def complete():
+        TestRun.objects.filter(pk=runID).update(reportStatus='Done',
+                                                hasOverview=True)
+        task.transition('Completed', ('In Progress',))
+        NodeGroup.objects.filter(currentTask=task.taskUUID).update(
+            currentTask=None)
+
+    try:
+        future.result()
+    except Exception as e:
+        DB_WRITER.call(fail, e)
+        print('Overview for task %s failed: %s' % (task.taskUUID, e))
+        return
+    DB_WRITER.call(complete)
+
+
+def getReportPool():
+    """
+    Returns the process pool that builds overview workbooks, starting it on
+    first use. Workers are spawned rather than forked, as the gRPC threads of
+    this process do not survive a fork.
+    :return: A ProcessPoolExecutor.
+    """
+    global REPORT_POOL
+    with REPORT_POOL_LOCK:
+        if REPORT_POOL is None:
+            REPORT_POOL = ProcessPoolExecutor(
+                max_workers=REPORT_WORKERS,
+                mp_context=multiprocessing.get_context('spawn'))
+    return REPORT_POOL
+
+
+def getAddress(node):
+    """
+    Returns the gRPC address of a client.
+    :param node: The LGNode instance.
+    :return: The address in the form 'ip:port'.
+    """
+    return node.ip + ':' + str(node.port)
+
+
+def pingNode(node, timeout=TIMEOUT_SECS):
+    """
+    Makes a single health check to a client, over its pooled channel. The
+    channel is dropped on failure so the next check dials afresh instead of
+    waiting on gRPC's reconnect backoff.
+    :param node: The LGNode instance to check.
+    :param timeout: Time to respond before considering the node offline.
+    :return: A boolean representing whether the node responded.
+    """
+    nodeAddress = getAddress(node)
+    try:
+        nglm_pb2_grpc.ServerStub(CHANNEL_POOL.get(nodeAddress))\
+            .isAlive(nglm_pb2.query(query=''), timeout=timeout)
+        return True
+    except grpc.RpcError:
+        CHANNEL_POOL.invalidate(nodeAddress)
+        return False
+
+
+def checkNodes(nodes=None, timeout=TIMEOUT_SECS, repeat=False):
     """
     Makes a health check to the provided clients, and updates status
-    accordingly. If a node fails enough health-checks, it is
-    removed from the database.
-    :param nodes: A QuerySet or list-like object of clients to check.
+    accordingly. Checks are made concurrently, up to HEALTHCHECK_WORKERS at a
+    time, so a sweep takes roughly one timeout rather than one per node.
+    Clients with a recent heartbeat on their control stream are skipped. If a
+    node fails enough health-checks, it is removed from the database.
+    :param nodes: A QuerySet or list-like object of clients to check. Defaults
+    to all registered nodes, re-queried on every sweep.
     :param timeout: Time to respond before considering a node offline.
-    :param repeat: Whether to recursively check nodes every 60s. Mainly used
-    for the automatic checks done in the background on startup.
-    :return:
-    """
-    import time
-    start = time.time()
-    availableNodes = []
-    for node in nodes:
-        nodeAddress = node.ip + ':' + str(node.port)
-        try:
-            print('checking: %s' % node)
-            channel = grpc.insecure_channel(nodeAddress)
-            nglm_pb2_grpc.ServerStub(channel)\
-                .isAlive(nglm_pb2.query(query=''), timeout=timeout)
-            print('checked: %s' % node)
-            availableNodes.append(node)
-            channel.close()
-        except:
-            uuidAttr = str(node.nodeUUID).replace('-', '_')
-            if hasattr(checkNodes, uuidAttr):
-                retries = getattr(checkNodes, uuidAttr)
-                if retries >= 10:
-                    LGNode.objects.filter(nodeUUID=node.nodeUUID).delete()
-                    delattr(checkNodes, uuidAttr)
-                else:
-                    setattr(checkNodes, uuidAttr, retries + 1)
+    :param repeat: Whether to check nodes every HEALTHCHECK_INTERVAL seconds.
+    Mainly used for the automatic checks done in the background on startup.
+    :return: A list of the nodes that responded in the last sweep.
+    """
+    while True:
+        # Clients heard from on their control stream are known to be alive,
+        # and are not dialled.
+        cutoff = timezone.now() - timedelta(
+            seconds=CONTROL_HEARTBEAT_SECS * CONTROL_MISSED_HEARTBEATS)
+        sweep = []
+        availableNodes = []
+        for node in (LGNode.objects.all() if nodes is None else nodes):
+            if node.lastSeen and node.lastSeen >= cutoff:
+                availableNodes.append(node)
             else:
-                setattr(checkNodes, uuidAttr, 1)
-            continue
-    end = time.time()
-    print('Available nodes updated. Elapsed: %.2fs' % (end - start))
-    updateNodes(availableNodes)
-    if repeat:
-        sleep(60)
-        return checkNodes(repeat=True)
-    return availableNodes
+                sweep.append(node)
+        streaming = len(availableNodes)
+        start = time.time()
+        if sweep:
+            workers = min(HEALTHCHECK_WORKERS, len(sweep))
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                results = list(pool.map(
+                    lambda node: pingNode(node, timeout), sweep))
+            for node, alive in zip(sweep, results):
+                if alive:
+                    availableNodes.append(node)
+                    continue
+                uuidAttr = str(node.nodeUUID).replace('-', '_')
+                if hasattr(checkNodes, uuidAttr):
+                    retries = getattr(checkNodes, uuidAttr)
+                    if retries >= 10:
+                        DB_WRITER.call(LGNode.objects.filter(
+                            nodeUUID=node.nodeUUID).delete)
+                        delattr(checkNodes, uuidAttr)
+                    else:
+                        setattr(checkNodes, uuidAttr, retries + 1)
+                else:
+                    setattr(checkNodes, uuidAttr, 1)
+        elapsed = time.time() - start
+        LAST_SWEEP.update(time=start, elapsed=elapsed, checked=len(sweep),
+                          available=len(availableNodes), streaming=streaming)
+        print('Available nodes updated. %d/%d responded, %d streaming. '
+              'Elapsed: %.2fs' % (len(availableNodes) - streaming, len(sweep),
+                                  streaming, elapsed))
+        updateNodes(availableNodes)
+        if not repeat:
+            return availableNodes
+        # Channels to nodes now streaming, or gone, are no longer dialled.
+        CHANNEL_POOL.evictIdle()
+        sleep(max(0, HEALTHCHECK_INTERVAL - elapsed))
 
 
 def scheduleTask(task):
     """
     Adds a task to the APScheduler BackgroundScheduler instance. Called on
-    task creation.
+    task creation. When GRPC_STANDALONE is set, the task is left for the
+    scheduler of the rungrpc process to pick up from the database instead.
     :param task: The Task model instance to schedule.
-    :return: Returns an APScheduler job object.
+    :return: Returns an APScheduler job object, or None if the task is
+    scheduled by rungrpc.
     """
-    job = SCHEDULER.add_job(
-        startLogging, replace_existing=True,
-        trigger='date', args=(task.assignedNode.nodes.all(), task),
-        run_date=task.startTime, id=str(task.taskUUID)
-    )
+    if GRPC_STANDALONE:
+        print('Task with UUID %s will be scheduled by rungrpc.'
+              % task.taskUUID)
+        return None
+    job = addTaskJob(task)
     if not SCHEDULER.running:
         SCHEDULER.start()
     print('Task with UUID %s scheduled.' % task.taskUUID)
     return job
 
 
+def addTaskJob(task, misfireGrace=1):
+    """
+    Adds or replaces the APScheduler job that starts a task.
+    :param task: The Task model instance to schedule.
+    :param misfireGrace: Seconds after the start time that the job may still
+    run, should the scheduler miss it.
+    :return: Returns an APScheduler job object.
+    """
+    return SCHEDULER.add_job(
+        startLogging, replace_existing=True,
+        trigger='date', args=(task.assignedNode.nodes.all(), task),
+        run_date=task.startTime, id=str(task.taskUUID),
+        misfire_grace_time=misfireGrace
+    )
+
+
+def syncSchedule():
+    """
+    Brings the scheduler in line with the scheduled tasks in the database,
+    adding jobs for new or rescheduled tasks and removing jobs of tasks that
+    were deleted. Run periodically by rungrpc, as tasks are created by the
+    web server in another process.
+    :return: None.
+    """
+    grace = SCHEDULE_SYNC_SECS * 2
+    tasks = {str(task.taskUUID): task for task in Task.objects.filter(
+        status='Scheduled',
+        startTime__gte=timezone.now() - timedelta(seconds=grace)
+    ).select_related('assignedNode')}
+    for job in SCHEDULER.get_jobs():
+        if job.func is startLogging and job.id not in tasks:
+            job.remove()
+    for taskUUID, task in tasks.items():
+        job = SCHEDULER.get_job(taskUUID)
+        if job is None or job.trigger.run_date != task.startTime:
+            addTaskJob(task, misfireGrace=grace)
+
+
 def updateNodes(nodes):
-    LGNode.objects.exclude(status="Busy").update(status="Offline")
-    for node in nodes:
-        LGNode.objects.exclude(status="Busy")\
-            .filter(ip__iexact=node.ip).update(status="Available")
+    """
+    Reconciles node statuses with the result of a health-check sweep. The
+    change from the current statuses is computed first, and applied on
+    DB_WRITER in one transaction of at most two updates, so unchanged nodes
+    are not written and nodes are never shown Offline part way through. Busy
+    nodes are left alone, as they are freed when their output or error
+    arrives.
+    :param nodes: The nodes that responded to the sweep. All others are
+    marked Offline.
+    :return: None.
+    """
+    alive = {node.nodeUUID for node in nodes}
+
+    def write():
+        online = []
+        offline = []
+        for nodeUUID, status in LGNode.objects.filter(
+                status__in=("Available", "Offline")
+        ).values_list('nodeUUID', 'status'):
+            if nodeUUID in alive and status != "Available":
+                online.append(nodeUUID)
+            elif nodeUUID not in alive and status != "Offline":
+                offline.append(nodeUUID)
+        for status, changed in (("Available", online),
+                                ("Offline", offline)):
+            for i in range(0, len(changed), UPDATE_BATCH):
+                LGNode.objects.filter(
+                    nodeUUID__in=changed[i:i + UPDATE_BATCH]
+                ).exclude(status="Busy").update(status=status)
+    DB_WRITER.call(write)
 
 
 def saveResponse(chunks, path):
     """
-    Saves a list-like object of byte chunks to a file.
+    Saves a list-like object of byte chunks to a file, replacing it
+    atomically once every chunk is written.
     :param chunks: A list-like object of byte chunks.
     :param path: The destination path for the file.
     :return: None.
     """
     os.makedirs(os.path.dirname(path), exist_ok=True)
-    with open(path, 'wb') as f:
-        for chunk in chunks:
-            f.write(chunk.buffer)
-        print('saved to %s' % path)
+    # Written to a temporary file first, so an interrupted transfer never
+    # leaves a truncated file at the destination.
+    tmpPath = path + '.tmp'
+    try:
+        with open(tmpPath, 'wb') as f:
+            f.writelines(chunk.buffer for chunk in chunks)
+        os.replace(tmpPath, path)
+    except BaseException:
+        if os.path.exists(tmpPath):
+            os.remove(tmpPath)
+        raise
+    print('saved to %s' % path)
 
 
 def startLogging(nodes, task):
     """
-    Starts logging for a task, and updates the statuses accordingly.
+    Starts logging for a task, and updates the statuses accordingly. Clients
+    are sent the start request concurrently, along with a common start time
+    far enough away that every client can be reached before it, so that they
+    all begin sampling at the same instant. Statuses are updated together
+    once every client responded.
     :param nodes: The nodes to begin the task for.
     :param task: The task to be executed.
     :return: None.
     """
-    for node in nodes:
-        nodeAddress = node.ip + ':' + str(node.port)
-        try:
-            channel = grpc.insecure_channel(nodeAddress)
-            stub = nglm_pb2_grpc.LoggingStub(channel)
-            itr = task.interval if task.interval else 2
-            dur = int(task.duration.total_seconds()) if task.duration else 4
-            params = nglm_pb2.params(pname='', interval=itr, duration=dur)
-
-            response = stub.start(params)
-            task.assignedNode.currentTask = task.taskUUID
-            task.assignedNode.save()
-            Task.objects.filter(taskUUID=task.taskUUID).update(
-                status="In Progress")
-            LGNode.objects.filter(nodeUUID=node.nodeUUID).update(
+    nodes = list(nodes)
+    if not nodes:
+        return
+    itr = task.interval if task.interval else 2
+    dur = int(task.duration.total_seconds()) if task.duration else 4
+    startAt = time.time() + startDelay(len(nodes)) \
+        if DISPATCH_START_DELAY else 0
+    params = nglm_pb2.params(pname='', interval=itr, duration=dur,
+                             taskUUID=str(task.taskUUID), startAt=startAt,
+                             chunkSize=GRPC_CHUNK_SIZE / 1024)
+
+    with ThreadPoolExecutor(min(DISPATCH_WORKERS, len(nodes))) as executor:
+        errors = list(executor.map(
+            lambda node: dispatchStart(node, params), nodes))
+
+    started = [node.nodeUUID for node, e in zip(nodes, errors) if e is None]
+    failed = [(node, e) for node, e in zip(nodes, errors) if e is not None]
+    for node, e in failed:
+        print(str(node) + ' was not available for task.')
+
+    def write():
+        if started:
+            LGNode.objects.filter(nodeUUID__in=started).update(
                 status="Busy", currentTask=task.taskUUID)
-        except Exception as e:
-            Task.objects.filter(taskUUID=task.taskUUID).update(
-                status="Failed: %s" % e)
-            print(str(node) + ' was not available for task.')
-            continue
+            NodeGroup.objects.filter(pk=task.assignedNode_id).update(
+                currentTask=task.taskUUID)
+        if failed:
+            TaskFailure.objects.bulk_create(
+                TaskFailure(task=task, node=node, message=str(e))
+                for node, e in failed)
+            task.transition('Failed', ('Scheduled',))
+        else:
+            task.transition('In Progress', ('Scheduled',))
+    DB_WRITER.call(write)
+
+
+def startDelay(count):
+    """
+    Returns the delay before a task's common start time, long enough for
+    every client to be reached even should each take the full timeout, and
+    no less than DISPATCH_START_DELAY.
+    :param count: The number of clients the task is dispatched to.
+    :return: The delay in seconds.
+    """
+    rounds = math.ceil(count / DISPATCH_WORKERS)
+    return max(DISPATCH_START_DELAY, rounds * DISPATCH_TIMEOUT_SECS)
+
+
+def dispatchStart(node, params):
+    """
+    Sends a task's start request to a client, down its control stream if it
+    has one open with this process, otherwise by dialling it.
+    :param node: The LGNode instance to start.
+    :param params: The nglm_pb2.params of the task.
+    :return: None if the client accepted the request, otherwise the error.
+    """
+    try:
+        if CONTROL_HUB.isConnected(node.nodeUUID):
+            CONTROL_HUB.send(node.nodeUUID,
+                             nglm_pb2.controlCommand(start=params),
+                             DISPATCH_TIMEOUT_SECS)
+            return None
+        stub = nglm_pb2_grpc.LoggingStub(CHANNEL_POOL.get(getAddress(node)))
+        stub.start(params, timeout=DISPATCH_TIMEOUT_SECS)
+    except Exception as e:
+        return e
+    return None
 
 
-def getChunks(f):
+def getChunks(f, size=GRPC_CHUNK_SIZE):
+    """
+    Reads a file into chunk messages. The file is read into one reusable
+    buffer, so the only copy made per chunk is the message's own.
+    :param f: A binary file object.
+    :param size: The chunk size in bytes.
+    :return: A generator of nglm_pb2.chunks messages.
+    """
+    buf = bytearray(size)
+    view = memoryview(buf)
     while True:
-        chunk = f.read(1024)
-        if not chunk:
+        count = f.readinto(buf)
+        if not count:
             break
-        yield nglm_pb2.chunks(buffer=chunk)
+        yield nglm_pb2.chunks(buffer=bytes(view[:count]))
 
 
 def setConfig(nodes, f):
     """
     Sets the configuration file for the given clients, overriding the current.
+    Clients already known to have an identical config are skipped, and the
+    rest are sent the file concurrently, down their control stream if open.
     :param nodes: The nodes to set this configuration for.
     :param f: The File object of the configuration.
     :return: A list of clients in which setting failed. (Generally offline)
     """
-    failedNodes = []
     chunkList = list(getChunks(f))
-    for node in nodes:
-        nodeAddress = node.ip + ':' + str(node.port)
-        try:
-            iterator = iter(chunkList)
-            channel = grpc.insecure_channel(nodeAddress)
-            stub = nglm_pb2_grpc.LoggingStub(channel)
-            response = stub.setConfig(iterator)
+    digest = hashlib.sha256()
+    for chunk in chunkList:
+        digest.update(chunk.buffer)
+    digest = digest.hexdigest()
+    nodes = [node for node in nodes if node.configHash != digest]
+    if not nodes:
+        return []
+
+    def send(node):
+        if CONTROL_HUB.isConnected(node.nodeUUID):
+            config = nglm_pb2.chunks(
+                buffer=b''.join(chunk.buffer for chunk in chunkList))
+            COMPRESSION_STATS.record('setConfig', config)
+            CONTROL_HUB.send(node.nodeUUID,
+                             nglm_pb2.controlCommand(setConfig=config),
+                             TIMEOUT_SECS * 5)
+        else:
+            stub = nglm_pb2_grpc.LoggingStub(
+                CHANNEL_POOL.get(getAddress(node)))
+            response = stub.setConfig(
+                COMPRESSION_STATS.track('setConfig', chunkList),
+                timeout=TIMEOUT_SECS * 5)
             if not response.success:
-                failedNodes.append(node.ip)
-        except:
-            failedNodes.append(node.ip)
-            continue
-    return failedNodes
+                raise RuntimeError('Config was not set.')
+        saveResponse(chunkList, getConfigPath(node))
+
+    def write(succeeded, failed):
+        LGNode.objects.filter(nodeUUID__in=succeeded).update(
+            configHash=digest)
+        # A failed upload may have been partly applied.
+        LGNode.objects.filter(nodeUUID__in=failed).update(configHash='')
 
+    succeeded, failed = fanOut(send, nodes)
+    DB_WRITER.call(write, succeeded, failed)
+    return [node.ip for node in nodes if node.nodeUUID in failed]
 
-def getConfig(nodes, size=1):
+
+def getConfig(nodes, size=GRPC_CHUNK_SIZE / 1024, refresh=False):
     """
     Retrieves the current configuration file(s) for the given client(s).
+    Configs are cached in nodeConfigs, and only fetched for clients whose
+    cached config is missing or may be stale, unless refresh is set.
+    Fetches are made concurrently, over control streams where open.
     :param nodes: The clients to retrieve the file from.
-    :param size: The desired chunk size in KB. Defaults to 1KB.
+    :param size: The desired chunk size in KB. Defaults to GRPC_CHUNK_SIZE.
+    :param refresh: Whether to fetch every client's config regardless.
     :return: Returns a list of clients that failed. (Generally offline)
     """
-    failedNodes = []
-    for node in nodes:
+    if not refresh:
+        nodes = [node for node in nodes if not node.configHash or
+                 not os.path.isfile(getConfigPath(node))]
+    if not nodes:
+        return []
+    hashes = {}
+
+    def fetch(node):
+        if CONTROL_HUB.isConnected(node.nodeUUID):
+            result = CONTROL_HUB.send(
+                node.nodeUUID,
+                nglm_pb2.controlCommand(
+                    getConfig=nglm_pb2.chunkSize(size=size)),
+                TIMEOUT_SECS)
+            response = [nglm_pb2.chunks(buffer=result.config)]
+        else:
+            stub = nglm_pb2_grpc.LoggingStub(
+                CHANNEL_POOL.get(getAddress(node)))
+            response = stub.getConfig(nglm_pb2.chunkSize(size=size),
+                                      timeout=TIMEOUT_SECS)
+        path = getConfigPath(node)
+        saveResponse(COMPRESSION_STATS.track('getConfig', response), path)
+        with open(path, 'rb') as f:
+            hashes[node.nodeUUID] = hashlib.sha256(f.read()).hexdigest()
+
+    succeeded, failed = fanOut(fetch, nodes)
+    byHash = {}
+    for nodeUUID in succeeded:
+        byHash.setdefault(hashes[nodeUUID], []).append(nodeUUID)
+
+    def write():
+        for digest, nodeUUIDs in byHash.items():
+            LGNode.objects.filter(nodeUUID__in=nodeUUIDs).update(
+                configHash=digest)
+    DB_WRITER.call(write)
+    return [node.ip for node in nodes if node.nodeUUID in failed]
+
+
+def getConfigPath(node):
+    """
+    Returns the path that a client's config is cached at.
+    :param node: The LGNode instance.
+    :return: The path of the cached config.
+    """
+    return os.path.join(ROOT_DIR, "nodeConfigs",
+                        str(node.nodeUUID) + '_config.ini')
+
+
+def fanOut(func, nodes):
+    """
+    Calls a function for each node concurrently, on at most CONFIG_WORKERS
+    threads.
+    :param func: The function to call with each node.
+    :param nodes: A list of LGNode instances.
+    :return: A tuple of the sets of UUIDs of the nodes for which the call
+    succeeded and failed.
+    """
+    def call(node):
         try:
-            nodeAddress = node.ip + ':' + str(node.port)
-            channel = grpc.insecure_channel(nodeAddress)
-            stub = nglm_pb2_grpc.LoggingStub(channel)
-            params = nglm_pb2.chunkSize(size=size)
-
-            response = stub.getConfig(params, timeout=TIMEOUT_SECS)
-            saveResponse(response, os.path.join(
-                os.path.dirname(sys.modules['__main__'].__file__),
-                "nodeConfigs", str(node.nodeUUID) + '_config.ini'))
-        except:
-            failedNodes.append(node.ip)
-            continue
-    return failedNodes
+            func(node)
+            return True
+        except Exception:
+            return False
+
+    with ThreadPoolExecutor(min(CONFIG_WORKERS, len(nodes))) as executor:
+        results = list(executor.map(call, nodes))
+    succeeded = {node.nodeUUID for node, ok in zip(nodes, results) if ok}
+    failed = {node.nodeUUID for node, ok in zip(nodes, results) if not ok}
+    return succeeded, failed
@@ -0,0 +1,118 @@
+import asyncio
+import threading
+import time
+
+import grpc
+from django.core.exceptions import ImproperlyConfigured
+
+from nglm_grpc.modules.Compression import serverArgs
+from nglm_grpc.modules.Utility import singletonThreadPool
+from NGLogmanServer.settings import GRPC_ADDRESS, GRPC_SERVER_MODE, \
+    GRPC_MAX_WORKERS, GRPC_MAX_MESSAGE_BYTES, GRPC_COMPRESSION, \
+    GRPC_COMPRESSION_LEVEL
+
+"""
+Starts the gRPC server that clients connect to, in the mode selected by
+GRPC_SERVER_MODE.
+"""
+
+
+def startServer(address=GRPC_ADDRESS, mode=GRPC_SERVER_MODE, options=None):
+    """
+    Starts the gRPC server in the background and returns immediately.
+    :param address: The address to listen on.
+    :param mode: 'thread' for a thread-pool server, or 'aio' for an asyncio
+    server running on its own event loop thread.
+    :param options: A list of gRPC server channel arguments.
+    :return: The started server. For 'aio', the grpc.aio.Server instance,
+    whose coroutine methods must be run on the server's event loop.
+    """
+    options = serverOptions(options)
+    if mode == 'thread':
+        from nglm_grpc.gRPCMethods import addToServer
+        server = grpc.server(singletonThreadPool(max_workers=GRPC_MAX_WORKERS),
+                             options=options)
+        addToServer(server)
+        bindServer(server, address)
+        server.start()
+        return server
+    if mode == 'aio':
+        loop = asyncio.new_event_loop()
+        server = loop.run_until_complete(createAioServer(address, options))
+        threading.Thread(target=loop.run_forever, daemon=True).start()
+        return server
+    raise ImproperlyConfigured("GRPC_SERVER_MODE must be 'thread' or 'aio'.")
+
+
+async def createAioServer(address=GRPC_ADDRESS, options=None):
+    """
+    Creates and starts an asyncio gRPC server on the running event loop.
+    :param address: The address to listen on.
+    :param options: A list of gRPC server channel arguments.
+    :return: The started grpc.aio.Server instance.
+    """
+    if not hasattr(grpc, 'aio'):
+        raise ImproperlyConfigured(
+            "GRPC_SERVER_MODE 'aio' requires grpcio 1.32 or newer.")
+    from nglm_grpc.aioMethods import addToAioServer
+    server = grpc.aio.server(options=options)
+    addToAioServer(server)
+    bindServer(server, address)
+    await server.start()
+    return server
+
+
+def serverOptions(options=None):
+    """
+    Returns the gRPC server channel arguments, with the message size limits
+    and compression set from the settings unless given.
+    :param options: A list of gRPC server channel arguments.
+    :return: The list of channel arguments.
+    """
+    options = list(options or [])
+    names = {name for name, value in options}
+    defaults = [('grpc.max_send_message_length', GRPC_MAX_MESSAGE_BYTES),
+                ('grpc.max_receive_message_length', GRPC_MAX_MESSAGE_BYTES)] \
+        + serverArgs(GRPC_COMPRESSION, GRPC_COMPRESSION_LEVEL)
+    options.extend((name, value) for name, value in defaults
+                   if name not in names)
+    return options
+
+
+def bindServer(server, address):
+    """
+    Binds a gRPC server to an address.
+    :param server: The grpc.server or grpc.aio.server instance.
+    :param address: The address to listen on.
+    :return: The bound port.
+    """
+    port = server.add_insecure_port(address)
+    if not port:
+        raise RuntimeError('Could not bind the gRPC server to %s.' % address)
+    return port
+
+
+def serveForever(address=GRPC_ADDRESS, mode=GRPC_SERVER_MODE, options=None):
+    """
+    Runs the gRPC server until the process is terminated. Used as the entry
+    point of rungrpc worker processes, so Django is set up first.
+    :param address: The address to listen on.
+    :param mode: The gRPC server mode, 'thread' or 'aio'.
+    :param options: A list of gRPC server channel arguments.
+    :return: None.
+    """
+    import django
+    django.setup()
+    waitForServer(startServer(address, mode, options))
+
+
+def waitForServer(server):
+    """
+    Blocks until the process is terminated. gRPC stops a server once it is
+    garbage collected, so the server is held here for as long as it should
+    keep serving.
+    :param server: The started server.
+    :return: None.
+    """
+    while server is not None:
+        time.sleep(3600)
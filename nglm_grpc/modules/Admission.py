@@ -0,0 +1,136 @@
+import random
+import threading
+
+"""
+Admission control for client uploads. When a large group finishes a task,
+every client uploads its output at once; rather than accepting them all and
+thrashing the disk and database, uploads beyond a limit are turned away with
+a hint of when to retry, spread out so the retries do not arrive together.
+"""
+
+
+class AdmissionController(object):
+    """
+    Caps the number of uploads in progress, and the bytes they hold in memory
+    waiting to be written. Counters are kept per process, so each rungrpc
+    worker process admits up to the limits on its own.
+    """
+    def __init__(self, maxUploads, maxPendingBytes, retrySecs):
+        """
+        :param maxUploads: The number of uploads admitted at once.
+        :param maxPendingBytes: The bytes admitted uploads may hold in
+        memory before further uploads are turned away.
+        :param retrySecs: The base delay suggested to rejected clients.
+        """
+        self.maxUploads = maxUploads
+        self.maxPendingBytes = maxPendingBytes
+        self.retrySecs = retrySecs
+        self._active = 0
+        self._pending = 0
+        self._peakActive = 0
+        self._peakPending = 0
+        self._admitted = 0
+        self._rejected = 0
+        self._lock = threading.Lock()
+
+    def admit(self):
+        """
+        Admits an upload if below both limits.
+        :return: A Ticket, which must be closed once the upload ends, or
+        None if the upload is turned away.
+        """
+        with self._lock:
+            if self._active >= self.maxUploads or \
+                    self._pending >= self.maxPendingBytes:
+                self._rejected += 1
+                return None
+            self._active += 1
+            self._admitted += 1
+            self._peakActive = max(self._peakActive, self._active)
+        return Ticket(self)
+
+    def retryAfter(self):
+        """
+        Returns the delay suggested to a rejected client, in seconds. The
+        delay grows with the number of uploads in progress, and is jittered
+        so that rejected clients spread out their retries.
+        :return: The delay in seconds.
+        """
+        with self._lock:
+            load = self._active / max(1, self.maxUploads)
+        return self.retrySecs * (1 + load) * random.uniform(1, 2)
+
+    def snapshot(self):
+        """
+        Returns the current and peak upload counts and pending bytes.
+        :return: A dict of counters.
+        """
+        with self._lock:
+            return {
+                'activeUploads': self._active,
+                'pendingBytes': self._pending,
+                'peakUploads': self._peakActive,
+                'peakPendingBytes': self._peakPending,
+                'admitted': self._admitted,
+                'rejected': self._rejected,
+                'maxUploads': self.maxUploads,
+                'maxPendingBytes': self.maxPendingBytes,
+            }
+
+    def _hold(self, count):
+        with self._lock:
+            self._pending += count
+            self._peakPending = max(self._peakPending, self._pending)
+
+    def _release(self, count, close=False):
+        with self._lock:
+            self._pending -= count
+            if close:
+                self._active -= 1
+
+
+class Ticket(object):
+    """
+    An admitted upload. Bytes are held from the moment they are received
+    until they are written.
+    """
+    def __init__(self, controller):
+        self._controller = controller
+        self._held = 0
+        self._closed = False
+
+    def hold(self, count):
+        self._held += count
+        self._controller._hold(count)
+
+    def release(self, count):
+        count = min(count, self._held)
+        self._held -= count
+        self._controller._release(count)
+
+    def track(self, chunks):
+        """
+        Holds the bytes of each chunk until the next one is requested, by
+        which time the consumer has written it.
+        :param chunks: An iterable of messages with a 'buffer' field.
+        :return: A generator of the same messages.
+        """
+        for chunk in chunks:
+            size = len(chunk.buffer)
+            self.hold(size)
+            try:
+                yield chunk
+            finally:
+                self.release(size)
+
+    def close(self):
+        if not self._closed:
+            self._closed = True
+            self._controller._release(self._held, close=True)
+            self._held = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,85 @@
+import os
+import zipfile
+
+"""
+Streams ZIP archives of report files. The archive is written through a
+buffer that is drained after every chunk, so its bytes can be sent as they
+are produced: nothing is staged on disk, and memory use does not grow with
+the size or number of files.
+"""
+
+CHUNK_SIZE = 64 << 10
+
+
+class StreamBuffer(object):
+    """
+    A write-only, unseekable file object that holds written bytes until they
+    are drained. zipfile writes data descriptors after each member when its
+    output cannot seek, which is what allows the archive to be streamed.
+    """
+    def __init__(self):
+        self._chunks = []
+
+    def write(self, data):
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def drain(self):
+        """
+        Returns and clears the bytes written since the last drain.
+        :return: A byte string.
+        """
+        data = b''.join(self._chunks)
+        self._chunks = []
+        return data
+
+
+def streamZip(files):
+    """
+    Streams a ZIP archive of files. Members are stored uncompressed, as the
+    reports are already compressed workbooks.
+    :param files: An iterable of (path, arcname) tuples. Files that no longer
+    exist when reached are skipped.
+    :return: A generator of the archive's bytes.
+    """
+    buffer = StreamBuffer()
+    with zipfile.ZipFile(buffer, 'w', zipfile.ZIP_STORED) as zf:
+        for path, arcname in files:
+            try:
+                f = open(path, 'rb')
+            except FileNotFoundError:
+                continue
+            with f:
+                # The size is known up front, so zipfile only switches to
+                # ZIP64 records for members that need them.
+                info = zipfile.ZipInfo.from_file(path, arcname)
+                with zf.open(info, 'w') as member:
+                    while True:
+                        chunk = f.read(CHUNK_SIZE)
+                        if not chunk:
+                            break
+                        member.write(chunk)
+                        yield buffer.drain()
+            yield buffer.drain()
+    yield buffer.drain()
+
+
+def runFiles(path, arcdir):
+    """
+    Lists the files of a run's output directory for archiving. Partially
+    written files are left out.
+    :param path: The run's output directory.
+    :param arcdir: The directory to place the files under in the archive.
+    :return: A generator of (path, arcname) tuples.
+    """
+    for root, dirs, files in os.walk(path):
+        dirs.sort()
+        for name in sorted(files):
+            if name.endswith(('.tmp', '.part')):
+                continue
+            filePath = os.path.join(root, name)
+            yield filePath, os.path.join(
+                arcdir, os.path.relpath(filePath, path))
@@ -0,0 +1,108 @@
+import threading
+import time
+
+import grpc
+
+"""
+A pool of reusable gRPC channels to clients, so that health checks and task
+dispatch do not pay for a new TCP and HTTP/2 handshake on every call.
+"""
+
+
+class ChannelPool(object):
+    """
+    Keeps one gRPC channel per client address ('ip:port'). Channels are
+    closed once unused for longer than the idle timeout, either on the next
+    call to get() or by evictIdle(), which the health-check loop runs after
+    each sweep.
+    """
+    def __init__(self, idleTimeout=300, keepaliveMs=300000,
+                 keepaliveTimeoutMs=10000, options=None):
+        """
+        :param idleTimeout: Seconds a channel may go unused before it is
+        evicted and closed.
+        :param keepaliveMs: Interval between HTTP/2 keepalive pings, sent
+        only while a call is in progress. Clients' gRPC servers answer pings
+        more frequent than every 5 minutes with GOAWAY, so this must not be
+        lower.
+        :param keepaliveTimeoutMs: Time to wait for a keepalive ack before
+        the connection is considered dead.
+        :param options: Additional gRPC channel arguments.
+        """
+        self.idleTimeout = idleTimeout
+        self.options = [
+            ('grpc.keepalive_time_ms', keepaliveMs),
+            ('grpc.keepalive_timeout_ms', keepaliveTimeoutMs),
+        ] + list(options or [])
+        self._channels = {}
+        self._lastUsed = {}
+        self._lock = threading.Lock()
+
+    def get(self, address):
+        """
+        Returns the channel for an address, creating it if necessary. Idle
+        channels are evicted as a side effect.
+        :param address: The client address, in the form 'ip:port'.
+        :return: A grpc.Channel.
+        """
+        now = time.time()
+        with self._lock:
+            stale = self._evict(now)
+            channel = self._channels.get(address)
+            if channel is None:
+                channel = grpc.insecure_channel(address, options=self.options)
+                self._channels[address] = channel
+            self._lastUsed[address] = now
+        for oldChannel in stale:
+            oldChannel.close()
+        return channel
+
+    def invalidate(self, address):
+        """
+        Closes and removes the channel for an address, if any. Called when a
+        client becomes unreachable or re-registers on a different port.
+        :param address: The client address, in the form 'ip:port'.
+        :return: None.
+        """
+        with self._lock:
+            channel = self._channels.pop(address, None)
+            self._lastUsed.pop(address, None)
+        if channel is not None:
+            channel.close()
+
+    def evictIdle(self):
+        """
+        Closes every channel that has been idle for longer than the idle
+        timeout.
+        :return: The number of channels evicted.
+        """
+        with self._lock:
+            stale = self._evict(time.time())
+        for channel in stale:
+            channel.close()
+        return len(stale)
+
+    def close(self):
+        """
+        Closes every pooled channel.
+        :return: None.
+        """
+        with self._lock:
+            channels = list(self._channels.values())
+            self._channels.clear()
+            self._lastUsed.clear()
+        for channel in channels:
+            channel.close()
+
+    def _evict(self, now):
+        # Must be called with the lock held. Returns the evicted channels so
+        # they can be closed outside of the lock.
+        stale = []
+        for address, lastUsed in list(self._lastUsed.items()):
+            if now - lastUsed > self.idleTimeout:
+                stale.append(self._channels.pop(address))
+                del self._lastUsed[address]
+        return stale
+
+    def __len__(self):
+        return len(self._channels)
@@ -0,0 +1,129 @@
+import threading
+import time
+import zlib
+
+"""
+gRPC message compression settings, and counters estimating what compression
+saves. gRPC does not report compressed sizes, so a sample of the messages
+sent or received is compressed with zlib, as gRPC's gzip and deflate both
+are, and the ratio and CPU time measured are applied to all traffic.
+"""
+
+ALGORITHMS = {'none': 0, 'deflate': 1, 'gzip': 2}
+LEVELS = {'none': 0, 'low': 1, 'medium': 2, 'high': 3}
+
+
+def channelArgs(algorithm):
+    """
+    Returns the channel arguments that compress the messages sent on a
+    channel.
+    :param algorithm: 'none', 'deflate' or 'gzip'.
+    :return: A list of gRPC channel arguments.
+    """
+    return [('grpc.default_compression_algorithm', ALGORITHMS[algorithm])]
+
+
+def serverArgs(algorithm, level):
+    """
+    Returns the server arguments that compress responses. The level lets
+    gRPC pick, per call, an algorithm the client accepts, preferring gzip
+    and falling back to deflate.
+    :param algorithm: The algorithm used when the level is 'none'.
+    :param level: 'none', 'low', 'medium' or 'high'.
+    :return: A list of gRPC channel arguments.
+    """
+    return channelArgs(algorithm) + [
+        ('grpc.default_compression_level', LEVELS[level])]
+
+
+class CompressionStats(object):
+    """
+    Counts the bytes of messages passing through named streams, and
+    estimates the bytes and time compression saves on each. Counters are
+    kept per process.
+    """
+    def __init__(self, sampleEvery=16, linkBytesPerSec=1.25e6):
+        """
+        :param sampleEvery: One in this many messages is compressed to
+        measure the compression ratio and CPU time. If 0, none are, and
+        only the bytes are counted.
+        :param linkBytesPerSec: The link speed used to convert bytes saved
+        into transfer time saved.
+        """
+        self.sampleEvery = sampleEvery
+        self.linkBytesPerSec = linkBytesPerSec
+        self._counters = {}
+        self._lock = threading.Lock()
+
+    def track(self, stream, messages):
+        """
+        Counts messages as they are iterated over.
+        :param stream: The name of the stream, e.g. 'output'.
+        :param messages: An iterable of protobuf messages.
+        :return: A generator of the same messages.
+        """
+        for message in messages:
+            self.record(stream, message)
+            yield message
+
+    def record(self, stream, message):
+        """
+        Counts a single message.
+        :param stream: The name of the stream.
+        :param message: The protobuf message.
+        :return: None.
+        """
+        size = message.ByteSize()
+        with self._lock:
+            counter = self._counters.setdefault(stream, {
+                'messages': 0, 'bytes': 0, 'sampledBytes': 0,
+                'sampledCompressed': 0, 'sampledSecs': 0.0})
+            counter['messages'] += 1
+            counter['bytes'] += size
+            sample = self.sampleEvery and (
+                counter['messages'] % self.sampleEvery == 1 or
+                self.sampleEvery == 1)
+        if not sample:
+            return
+        data = message.SerializeToString()
+        start = time.process_time()
+        compressed = len(zlib.compress(data))
+        elapsed = time.process_time() - start
+        with self._lock:
+            counter['sampledBytes'] += size
+            counter['sampledCompressed'] += compressed
+            counter['sampledSecs'] += elapsed
+
+    def snapshot(self):
+        """
+        Returns the counters and estimates of every stream.
+        :return: A dict mapping stream names to dicts of 'messages',
+        'bytes', 'compressedBytes', 'bytesSaved', 'cpuSecs' and 'secsSaved'.
+        The estimates assume every message is compressed, and show no
+        savings if no messages were sampled.
+        """
+        result = {}
+        with self._lock:
+            counters = {stream: dict(counter)
+                        for stream, counter in self._counters.items()}
+        for stream, counter in counters.items():
+            ratio = counter['sampledCompressed'] / counter['sampledBytes'] \
+                if counter['sampledBytes'] else 1.0
+            secsPerByte = counter['sampledSecs'] / counter['sampledBytes'] \
+                if counter['sampledBytes'] else 0.0
+            compressed = int(counter['bytes'] * ratio)
+            cpuSecs = counter['bytes'] * secsPerByte
+            result[stream] = {
+                'messages': counter['messages'],
+                'bytes': counter['bytes'],
+                'compressedBytes': compressed,
+                'bytesSaved': counter['bytes'] - compressed,
+                'cpuSecs': cpuSecs,
+                'secsSaved': (counter['bytes'] - compressed)
+                / self.linkBytesPerSec - cpuSecs,
+            }
+        return result
+
+    def clear(self):
+        with self._lock:
+            self._counters.clear()
@@ -0,0 +1,165 @@
+import itertools
+import threading
+import time
+from concurrent.futures import Future, TimeoutError
+
+"""
+Tracks the control streams that clients keep open with the server. Each
+stream is a Session, through which commands are pushed to the client and
+their results received. Any message from a client counts as a heartbeat.
+Sessions only exist in the process serving the stream; other processes fall
+back to dialling the client.
+"""
+
+
+class ControlError(Exception):
+    """
+    Raised when a command cannot be delivered over a control stream, or its
+    client reports a failure.
+    """
+
+
+class Session(object):
+    """
+    A client's open control stream.
+    """
+    def __init__(self, nodeUUID, put):
+        """
+        :param nodeUUID: The UUID of the client.
+        :param put: A thread-safe callable queueing a command to be sent
+        down the stream. None is queued when the session closes.
+        """
+        self.nodeUUID = nodeUUID
+        self._put = put
+        self._pending = {}
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+        self.closed = False
+
+    def send(self, command, timeout):
+        """
+        Sends a command and waits for the client's result.
+        :param command: A controlCommand message. Its id is assigned here.
+        :param timeout: Seconds to wait for the result.
+        :return: The commandResult message.
+        """
+        future = Future()
+        with self._lock:
+            if self.closed:
+                raise ControlError('The control stream is closed.')
+            command.id = next(self._ids)
+            self._pending[command.id] = future
+        self._put(command)
+        try:
+            result = future.result(timeout)
+        except TimeoutError:
+            raise ControlError('No result within %s seconds.' % timeout)
+        finally:
+            with self._lock:
+                self._pending.pop(command.id, None)
+        if not result.success:
+            raise ControlError(result.message or 'The command failed.')
+        return result
+
+    def resolve(self, result):
+        """
+        Hands a client's commandResult to the command waiting on it.
+        :param result: The commandResult message.
+        :return: None.
+        """
+        with self._lock:
+            future = self._pending.get(result.id)
+        if future is not None and not future.done():
+            future.set_result(result)
+
+    def close(self):
+        with self._lock:
+            if self.closed:
+                return
+            self.closed = True
+            pending = list(self._pending.values())
+        for future in pending:
+            if not future.done():
+                future.set_exception(
+                    ControlError('The control stream was closed.'))
+        self._put(None)
+
+
+class ControlHub(object):
+    """
+    The open control sessions of this process, keyed by client UUID.
+    """
+    def __init__(self):
+        self._sessions = {}
+        self._seen = {}
+        self._lock = threading.Lock()
+
+    def open(self, nodeUUID, put, limit=None):
+        """
+        Opens a session for a client, closing any earlier session it had.
+        :param nodeUUID: The UUID of the client.
+        :param put: See Session.
+        :param limit: The most sessions open at once, or None for no limit.
+        A client replacing its own session is always let through.
+        :return: The new Session, or None if the limit is reached.
+        """
+        session = Session(nodeUUID, put)
+        with self._lock:
+            old = self._sessions.get(nodeUUID)
+            if old is None and limit is not None and \
+                    len(self._sessions) >= limit:
+                return None
+            self._sessions[nodeUUID] = session
+            self._seen[nodeUUID] = time.time()
+        if old is not None:
+            old.close()
+        return session
+
+    def close(self, session):
+        """
+        Closes a session.
+        :param session: The Session to close.
+        :return: Whether it was the client's current session, rather than
+        one already replaced by a reconnection.
+        """
+        with self._lock:
+            current = self._sessions.get(session.nodeUUID) is session
+            if current:
+                del self._sessions[session.nodeUUID]
+                self._seen.pop(session.nodeUUID, None)
+        session.close()
+        return current
+
+    def heartbeat(self, nodeUUID):
+        with self._lock:
+            if nodeUUID in self._sessions:
+                self._seen[nodeUUID] = time.time()
+
+    def isConnected(self, nodeUUID):
+        with self._lock:
+            return nodeUUID in self._sessions
+
+    def send(self, nodeUUID, command, timeout):
+        """
+        Sends a command to a client over its control stream.
+        :param nodeUUID: The UUID of the client.
+        :param command: A controlCommand message.
+        :param timeout: Seconds to wait for the result.
+        :return: The commandResult message.
+        """
+        with self._lock:
+            session = self._sessions.get(nodeUUID)
+        if session is None:
+            raise ControlError('The client has no control stream.')
+        return session.send(command, timeout)
+
+    def takeSeen(self):
+        """
+        Returns the clients heard from since the last call, for their
+        heartbeats to be written to the database in one batch.
+        :return: A dict mapping client UUIDs to the time last heard from.
+        """
+        with self._lock:
+            seen = self._seen
+            self._seen = {}
+        return seen
@@ -0,0 +1,100 @@
+import queue
+import threading
+from concurrent.futures import Future
+
+"""
+A single thread through which database writes are made. SQLite allows one
+writer at a time, so rather than many threads contending for the lock, and
+failing with 'database is locked' under load, writes are queued to one
+thread. Writes queued while it is busy are committed together in a single
+transaction, each in a savepoint of its own so that one failing write does
+not undo the others.
+"""
+
+
+class DBWriter(object):
+    """
+    Runs queued writes on one thread, batched into transactions.
+    """
+    def __init__(self, atomic, batchSize=64):
+        """
+        :param atomic: A callable returning a transaction context manager,
+        such as django.db.transaction.atomic. Nested calls create savepoints.
+        :param batchSize: The most writes committed in one transaction.
+        """
+        self.atomic = atomic
+        self.batchSize = batchSize
+        self._queue = queue.Queue()
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def submit(self, func, *args):
+        """
+        Queues a write.
+        :param func: The callable making the write.
+        :param args: The arguments passed to func.
+        :return: A Future of func's result, set once its transaction is
+        committed.
+        """
+        future = Future()
+        if threading.current_thread() is self._thread:
+            # Already on the writer thread, inside the batch's transaction.
+            try:
+                future.set_result(func(*args))
+            except Exception as e:
+                future.set_exception(e)
+            return future
+        self._start()
+        self._queue.put((future, func, args))
+        return future
+
+    def call(self, func, *args):
+        """
+        Queues a write and waits for it to be committed.
+        :param func: The callable making the write.
+        :param args: The arguments passed to func.
+        :return: The result of func. Any exception it raised is re-raised.
+        """
+        return self.submit(func, *args).result()
+
+    def _start(self):
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run,
+                                                daemon=True)
+                self._thread.start()
+
+    def _run(self):
+        while True:
+            batch = [self._queue.get()]
+            while len(batch) < self.batchSize:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            self._commit(batch)
+
+    def _commit(self, batch):
+        """
+        Runs a batch of writes in one transaction, and resolves their futures
+        once it is committed.
+        """
+        results = []
+        try:
+            with self.atomic():
+                for future, func, args in batch:
+                    try:
+                        with self.atomic():
+                            results.append((future, func(*args), None))
+                    except Exception as e:
+                        results.append((future, None, e))
+        except Exception as e:
+            # The commit failed, so none of the batch was written.
+            for future, func, args in batch:
+                future.set_exception(e)
+            return
+        for future, result, error in results:
+            if error is None:
+                future.set_result(result)
+            else:
+                future.set_exception(error)
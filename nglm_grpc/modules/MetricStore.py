@@ -0,0 +1,154 @@
+import os
+from array import array
+
+import numpy
+
+"""
+A minimal on-disk columnar store for the metric samples streamed by clients
+during a task. Each node of a run gets its own directory, holding a list of
+column names and one file of raw float64 values per column. Appending a
+sample is a buffered write to each column file, and the store can be read at
+any time, including while the run is still in progress.
+"""
+
+COLUMNS_FILE = 'columns.txt'
+
+
+def columnFile(path, index):
+    return os.path.join(path, 'col_%03d.f64' % index)
+
+
+class MetricWriter(object):
+    """
+    Appends samples to a node's metric store. The first column is always the
+    sample timestamp, followed by one column per metric.
+    """
+    def __init__(self, path, names, flushEvery=16, autoFlush=True):
+        """
+        :param path: The directory of the node's store.
+        :param names: The metric names, in the order values will be sent.
+        :param flushEvery: Number of samples buffered before writing to disk.
+        :param autoFlush: Whether append writes to disk itself once
+        flushEvery samples are buffered. If not, the caller must check
+        isFull and call flush.
+        """
+        names = ['Time'] + list(names)
+        os.makedirs(path, exist_ok=True)
+        namesPath = os.path.join(path, COLUMNS_FILE)
+        if os.path.isfile(namesPath):
+            existing = readColumns(path)
+            if existing != names:
+                raise ValueError('Metric names do not match the existing '
+                                 'store at %s' % path)
+            truncateColumns(path, len(names))
+        else:
+            with open(namesPath, 'w') as f:
+                f.write('\n'.join(names))
+        self.path = path
+        self.names = names
+        self.flushEvery = flushEvery
+        self.autoFlush = autoFlush
+        self._buffers = [array('d') for _ in names]
+        self._files = [open(columnFile(path, i), 'ab')
+                       for i in range(len(names))]
+
+    def append(self, timestamp, values):
+        """
+        Buffers a single sample.
+        :param timestamp: The sample time, in seconds since the epoch.
+        :param values: The metric values, in the same order as the names.
+        :return: None.
+        """
+        if len(values) != len(self.names) - 1:
+            raise ValueError('Expected %d values, got %d'
+                             % (len(self.names) - 1, len(values)))
+        self._buffers[0].append(timestamp)
+        for buf, value in zip(self._buffers[1:], values):
+            buf.append(value)
+        if self.autoFlush and self.isFull:
+            self.flush()
+
+    @property
+    def isFull(self):
+        return len(self._buffers[0]) >= self.flushEvery
+
+    def flush(self):
+        """
+        Writes the buffered samples to the column files.
+        :return: None.
+        """
+        for buf, f in zip(self._buffers, self._files):
+            buf.tofile(f)
+            f.flush()
+            del buf[:]
+
+    def close(self):
+        self.flush()
+        for f in self._files:
+            f.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def readColumn(path, index):
+    """
+    Reads a column of a node's metric store. A column whose file has not
+    been created yet reads as empty.
+    :param path: The directory of the node's store.
+    :param index: The index of the column.
+    :return: A numpy array of the column's samples.
+    """
+    try:
+        return numpy.fromfile(columnFile(path, index), dtype='d')
+    except FileNotFoundError:
+        return numpy.empty(0, dtype='d')
+
+
+def readColumns(path):
+    """
+    Reads the column names of a node's metric store.
+    :param path: The directory of the node's store.
+    :return: A list of column names, starting with 'Time'.
+    """
+    with open(os.path.join(path, COLUMNS_FILE)) as f:
+        return f.read().split('\n')
+
+
+def truncateColumns(path, count):
+    """
+    Truncates every column file to the length of the shortest, discarding any
+    partially written sample left by an interrupted stream.
+    :param path: The directory of the node's store.
+    :param count: The number of columns.
+    :return: None.
+    """
+    sizes = [os.path.getsize(columnFile(path, i))
+             if os.path.isfile(columnFile(path, i)) else 0
+             for i in range(count)]
+    size = min(sizes) // 8 * 8
+    for i, current in enumerate(sizes):
+        if current != size:
+            with open(columnFile(path, i), 'ab') as f:
+                f.truncate(size)
+
+
+def readMetrics(path, since=None):
+    """
+    Reads a node's metric store. Columns are cut to a common length, so
+    samples still being written are never returned half-complete.
+    :param path: The directory of the node's store.
+    :param since: Only return samples with a timestamp after this value.
+    :return: A dict mapping column names to numpy arrays.
+    """
+    names = readColumns(path)
+    columns = [readColumn(path, i) for i in range(len(names))]
+    length = min(len(col) for col in columns)
+    columns = [col[:length] for col in columns]
+    if since is not None:
+        mask = columns[0] > since
+        columns = [col[mask] for col in columns]
+    return dict(zip(names, columns))
@@ -0,0 +1,42 @@
+import os
+import re
+
+from openpyxl import Workbook, load_workbook
+
+"""
+Builds the overview workbook of a test run, which gathers the result
+workbook of every node into one sheet per node. Workbooks are streamed row
+by row with openpyxl's read-only and write-only modes, so time and memory
+grow with the number of rows rather than being spent per cell.
+"""
+
+RESULT_PATTERN = re.compile(r'(.*)_.*_.*_(?:result.xlsx)$')
+OVERVIEW_NAME = 'overview.xlsx'
+
+
+def buildOverview(output_path):
+    """
+    Builds the overview workbook of a run from the node results found in its
+    output directory. The workbook is written to a temporary file first, so
+    a partially written overview is never visible.
+    :param output_path: The output directory of the run.
+    :return: The path of the overview workbook.
+    """
+    res_path = os.path.join(output_path, OVERVIEW_NAME)
+    wb = Workbook(write_only=True)
+    for f in sorted(os.listdir(output_path)):
+        match = RESULT_PATTERN.match(f)
+        if not match:
+            continue
+        ws = wb.create_sheet(match.group(1))
+        read_wb = load_workbook(os.path.join(output_path, f), read_only=True)
+        try:
+            for row in read_wb.worksheets[0].iter_rows(values_only=True):
+                ws.append(row)
+        finally:
+            read_wb.close()
+
+    tmp_path = res_path + '.tmp'
+    wb.save(tmp_path)
+    os.replace(tmp_path, res_path)
+    return res_path
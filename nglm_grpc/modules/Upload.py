@@ -0,0 +1,116 @@
+import hashlib
+import os
+
+"""
+Resumable, checksummed file uploads. Data is appended to a '.part' file next
+to the destination, whose size is the offset committed so far. A client that
+loses its connection asks for that offset and resumes from it. Once the last
+chunk arrives, the whole file is checked against the client's SHA-256 digest
+and atomically renamed into place, so the destination is never seen
+truncated or corrupt.
+"""
+
+PART_SUFFIX = '.part'
+HASH_BLOCK = 1 << 20
+
+
+class UploadError(Exception):
+    """
+    Raised when an upload chunk is out of order, or the uploaded file does
+    not match its digest.
+    """
+
+
+class PartialUpload(object):
+    """
+    An upload in progress to a destination path.
+    """
+    def __init__(self, path):
+        """
+        :param path: The destination path of the upload.
+        """
+        self.path = path
+        self.partPath = path + PART_SUFFIX
+        self._file = None
+        self._hash = None
+        self._offset = None
+
+    @property
+    def offset(self):
+        """
+        The number of bytes committed to the partial file.
+        """
+        if self._offset is not None:
+            return self._offset
+        try:
+            return os.path.getsize(self.partPath)
+        except FileNotFoundError:
+            return 0
+
+    def write(self, offset, data):
+        """
+        Writes a chunk of the upload. The first chunk may start at or before
+        the committed offset, anything after it being discarded. Later
+        chunks must follow on from the previous one.
+        :param offset: The position of the chunk in the file.
+        :param data: The bytes of the chunk.
+        :return: None.
+        """
+        if self._file is None:
+            self._open(offset)
+        if offset != self._offset:
+            raise UploadError('Expected a chunk at offset %d, got %d.'
+                              % (self._offset, offset))
+        self._file.write(data)
+        self._hash.update(data)
+        self._offset += len(data)
+
+    def commit(self, digest):
+        """
+        Completes the upload, moving the partial file to the destination if
+        it matches the digest. A mismatched file is discarded, so the upload
+        restarts from the beginning.
+        :param digest: The hex SHA-256 digest of the whole file.
+        :return: None.
+        """
+        if self._file is None:
+            self._open(self.offset)
+        actual = self._hash.hexdigest()
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self.close()
+        if actual != digest.lower():
+            os.remove(self.partPath)
+            raise UploadError('Upload of %s does not match its digest.'
+                              % os.path.basename(self.path))
+        os.replace(self.partPath, self.path)
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+            self._offset = None
+
+    def _open(self, offset):
+        """
+        Opens the partial file for appending at an offset, and hashes the
+        data already committed before it.
+        """
+        committed = self.offset
+        if offset > committed:
+            raise UploadError('Expected a chunk at offset %d or before, '
+                              'got %d.' % (committed, offset))
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        self._file = open(self.partPath, 'ab+')
+        self._file.truncate(offset)
+        self._file.seek(0)
+        self._hash = hashlib.sha256()
+        remaining = offset
+        while remaining:
+            block = self._file.read(min(HASH_BLOCK, remaining))
+            if not block:
+                break
+            self._hash.update(block)
+            remaining -= len(block)
+        self._file.seek(offset)
+        self._offset = offset
@@ -1,8 +1,12 @@
 from __future__ import division
 import logging
+import threading
+from collections import OrderedDict
 from concurrent.futures.thread import ThreadPoolExecutor
 from functools import wraps
 
+import numpy
+
 logger = logging.getLogger(__name__)
 
 Units = ['BYTES', 'KB', 'MB', 'GB', 'TB']
@@ -103,3 +107,91 @@ class singletonThreadPool(ThreadPoolExecutor,metaclass=Singleton):
     A singleton ThreadpoolExecutor class.
     """
     pass
+
+
+class LRUCache(object):
+    """
+    A thread-safe least-recently-used cache, bounded both by its number of
+    entries and by the total size of its values.
+    """
+    def __init__(self, maxEntries=32, maxSize=64 << 20, sizeof=len):
+        """
+        :param maxEntries: The maximum number of entries kept.
+        :param maxSize: The maximum total size of the values kept.
+        :param sizeof: A function returning the size of a value.
+        """
+        self.maxEntries = maxEntries
+        self.maxSize = maxSize
+        self.sizeof = sizeof
+        self.size = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        with self._lock:
+            if key not in self._entries:
+                return default
+            self._entries.move_to_end(key)
+            return self._entries[key][0]
+
+    def set(self, key, value):
+        """
+        Adds a value to the cache, evicting the least recently used entries
+        as needed. Values larger than maxSize are not cached.
+        """
+        size = self.sizeof(value)
+        with self._lock:
+            if key in self._entries:
+                self.size -= self._entries.pop(key)[1]
+            if size > self.maxSize:
+                return
+            self._entries[key] = (value, size)
+            self.size += size
+            while (len(self._entries) > self.maxEntries or
+                   self.size > self.maxSize):
+                self.size -= self._entries.popitem(last=False)[1][1]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.size = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+
+def lttb(x, y, threshold):
+    """
+    Downsamples a series with the Largest-Triangle-Three-Buckets algorithm,
+    which keeps the visual shape of the series, peaks included. Points with
+    a NaN x or y are left out, as they cannot be plotted.
+    :param x: A numpy array of x values, in increasing order.
+    :param y: A numpy array of y values.
+    :param threshold: The number of points to keep.
+    :return: A tuple of the downsampled x and y arrays.
+    """
+    present = ~(numpy.isnan(x) | numpy.isnan(y))
+    if not present.all():
+        x, y = x[present], y[present]
+    length = len(x)
+    if threshold >= length or threshold < 3:
+        return x, y
+
+    # The first and last points are always kept, and the points between are
+    # split into threshold - 2 buckets, each contributing one point.
+    edges = numpy.linspace(1, length - 1, threshold - 1).astype(int)
+    keep = numpy.empty(threshold, dtype=int)
+    keep[0] = 0
+    keep[-1] = length - 1
+    for i in range(threshold - 2):
+        start, end = edges[i], edges[i + 1]
+        nextEnd = edges[i + 2] if i + 2 < len(edges) else length
+        # The point forming the largest triangle with the last kept point
+        # and the average of the next bucket is kept.
+        avgX = x[end:nextEnd].mean()
+        avgY = y[end:nextEnd].mean()
+        prevX, prevY = x[keep[i]], y[keep[i]]
+        areas = numpy.abs((prevX - avgX) * (y[start:end] - prevY) -
+                          (prevX - x[start:end]) * (avgY - prevY))
+        keep[i + 1] = start + areas.argmax()
+    return x[keep], y[keep]
@@ -19,7 +19,7 @@ DESCRIPTOR = _descriptor.FileDescriptor(
   package='nglm_grpc',
   syntax='proto3',
   serialized_options=None,
-  serialized_pb=_b('\n\x14nglm_grpc/nglm.proto\x12\tnglm_grpc\"W\n\nclientInfo\x12\x10\n\x08hostname\x18\x01 \x01(\t\x12\x0c\n\x04ipv4\x18\x02 \x01(\t\x12\x0c\n\x04port\x18\x03 \x01(\x05\x12\x0c\n\x04uuid\x18\x04 \x01(\t\x12\r\n\x05\x61lias\x18\x05 \x01(\t\"1\n\x10registerResponse\x12\x0c\n\x04uuid\x18\x01 \x01(\t\x12\x0f\n\x07success\x18\x02 \x01(\x08\"\x1b\n\x08response\x12\x0f\n\x07success\x18\x01 \x01(\x08\"\x16\n\x05query\x12\r\n\x05query\x18\x01 \x01(\t\"\x1e\n\texception\x12\x11\n\texception\x18\x01 \x01(\t\"\x19\n\tchunkSize\x12\x0c\n\x04size\x18\x01 \x01(\x01\"Z\n\x06params\x12\x0b\n\x03pid\x18\x01 \x01(\x05\x12\r\n\x05pname\x18\x02 \x01(\t\x12\x10\n\x08interval\x18\x03 \x01(\x05\x12\x10\n\x08\x64uration\x18\x04 \x01(\x05\x12\x10\n\x08taskUUID\x18\x05 \x01(\t\"\x18\n\x06\x63hunks\x12\x0e\n\x06\x62uffer\x18\x01 \x01(\x0c\x32~\n\x06Server\x12@\n\x08register\x12\x15.nglm_grpc.clientInfo\x1a\x1b.nglm_grpc.registerResponse\"\x00\x12\x32\n\x07isAlive\x12\x10.nglm_grpc.query\x1a\x13.nglm_grpc.response\"\x00\x32\x99\x02\n\x07Logging\x12\x31\n\x05start\x12\x11.nglm_grpc.params\x1a\x13.nglm_grpc.response\"\x00\x12\x34\n\x06output\x12\x11.nglm_grpc.chunks\x1a\x13.nglm_grpc.response\"\x00(\x01\x12\x32\n\x03\x65rr\x12\x14.nglm_grpc.exception\x1a\x13.nglm_grpc.response\"\x00\x12\x38\n\tgetConfig\x12\x14.nglm_grpc.chunkSize\x1a\x11.nglm_grpc.chunks\"\x00\x30\x01\x12\x37\n\tsetConfig\x12\x11.nglm_grpc.chunks\x1a\x13.nglm_grpc.response\"\x00(\x01\x62\x06proto3')
+  serialized_pb=_b('\n\x14nglm_grpc/nglm.proto\x12\tnglm_grpc\"W\n\nclientInfo\x12\x10\n\x08hostname\x18\x01 \x01(\t\x12\x0c\n\x04ipv4\x18\x02 \x01(\t\x12\x0c\n\x04port\x18\x03 \x01(\x05\x12\x0c\n\x04uuid\x18\x04 \x01(\t\x12\r\n\x05\x61lias\x18\x05 \x01(\t\"H\n\x10registerResponse\x12\x0c\n\x04uuid\x18\x01 \x01(\t\x12\x0f\n\x07success\x18\x02 \x01(\x08\x12\x15\n\rheartbeatSecs\x18\x03 \x01(\x01\"\x1b\n\x08response\x12\x0f\n\x07success\x18\x01 \x01(\x08\"\x16\n\x05query\x12\r\n\x05query\x18\x01 \x01(\t\"\x1e\n\texception\x12\x11\n\texception\x18\x01 \x01(\t\"\x19\n\tchunkSize\x12\x0c\n\x04size\x18\x01 \x01(\x01\"~\n\x06params\x12\x0b\n\x03pid\x18\x01 \x01(\x05\x12\r\n\x05pname\x18\x02 \x01(\t\x12\x10\n\x08interval\x18\x03 \x01(\x05\x12\x10\n\x08\x64uration\x18\x04 \x01(\x05\x12\x10\n\x08taskUUID\x18\x05 \x01(\t\x12\x0f\n\x07startAt\x18\x06 \x01(\x01\x12\x11\n\tchunkSize\x18\x07 \x01(\x01\"\x18\n\x06\x63hunks\x12\x0e\n\x06\x62uffer\x18\x01 \x01(\x0c\"@\n\x0cmetricSample\x12\x11\n\ttimestamp\x18\x01 \x01(\x01\x12\x0e\n\x06values\x18\x02 \x03(\x01\x12\r\n\x05names\x18\x03 \x03(\t\"=\n\x0buploadChunk\x12\x0e\n\x06offset\x18\x01 \x01(\x03\x12\x0e\n\x06\x62uffer\x18\x02 \x01(\x0c\x12\x0e\n\x06sha256\x18\x03 \x01(\t\"@\n\x0cuploadStatus\x12\x0f\n\x07success\x18\x01 \x01(\x08\x12\x0e\n\x06offset\x18\x02 \x01(\x03\x12\x0f\n\x07message\x18\x03 \x01(\t\"n\n\x0e\x63ontrolMessage\x12%\n\theartbeat\x18\x01 \x01(\x0b\x32\x10.nglm_grpc.queryH\x00\x12*\n\x06result\x18\x02 \x01(\x0b\x32\x18.nglm_grpc.commandResultH\x00\x42\t\n\x07message\"\x9e\x01\n\x0e\x63ontrolCommand\x12\n\n\x02id\x18\x01 \x01(\x03\x12\"\n\x05start\x18\x02 \x01(\x0b\x32\x11.nglm_grpc.paramsH\x00\x12&\n\tsetConfig\x18\x03 \x01(\x0b\x32\x11.nglm_grpc.chunksH\x00\x12)\n\tgetConfig\x18\x04 \x01(\x0b\x32\x14.nglm_grpc.chunkSizeH\x00\x42\t\n\x07\x63ommand\"M\n\rcommandResult\x12\n\n\x02id\x18\x01 \x01(\x03\x12\x0f\n\x07success\x18\x02 \x01(\x08\x12\x0f\n\x07message\x18\x03 \x01(\t\x12\x0e\n\x06\x63onfig\x18\x04 \x01(\x0c\x32\xc5\x01\n\x06Server\x12@\n\x08register\x12\x15.nglm_grpc.clientInfo\x1a\x1b.nglm_grpc.registerResponse\"\x00\x12\x32\n\x07isAlive\x12\x10.nglm_grpc.query\x1a\x13.nglm_grpc.response\"\x00\x12\x45\n\x07\x63ontrol\x12\x19.nglm_grpc.controlMessage\x1a\x19.nglm_grpc.controlCommand\"\x00(\x01\x30\x01\x32\xde\x03\n\x07Logging\x12\x31\n\x05start\x12\x11.nglm_grpc.params\x1a\x13.nglm_grpc.response\"\x00\x12\x34\n\x06output\x12\x11.nglm_grpc.chunks\x1a\x13.nglm_grpc.response\"\x00(\x01\x12\x32\n\x03\x65rr\x12\x14.nglm_grpc.exception\x1a\x13.nglm_grpc.response\"\x00\x12\x38\n\tgetConfig\x12\x14.nglm_grpc.chunkSize\x1a\x11.nglm_grpc.chunks\"\x00\x30\x01\x12\x37\n\tsetConfig\x12\x11.nglm_grpc.chunks\x1a\x13.nglm_grpc.response\"\x00(\x01\x12\x41\n\rstreamMetrics\x12\x17.nglm_grpc.metricSample\x1a\x13.nglm_grpc.response\"\x00(\x01\x12;\n\x0coutputOffset\x12\x10.nglm_grpc.query\x1a\x17.nglm_grpc.uploadStatus\"\x00\x12\x43\n\x0cresumeOutput\x12\x16.nglm_grpc.uploadChunk\x1a\x17.nglm_grpc.uploadStatus\"\x00(\x01\x62\x06proto3')
 )
 
 
@@ -105,6 +105,13 @@ _REGISTERRESPONSE = _descriptor.Descriptor(
       message_type=None, enum_type=None, containing_type=None,
       is_extension=False, extension_scope=None,
       serialized_options=None, file=DESCRIPTOR),
+    _descriptor.FieldDescriptor(
+      name='heartbeatSecs', full_name='nglm_grpc.registerResponse.heartbeatSecs', index=2,
+      number=3, type=1, cpp_type=5, label=1,
+      has_default_value=False, default_value=float(0),
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR),
   ],
   extensions=[
   ],
@@ -118,7 +125,7 @@ _REGISTERRESPONSE = _descriptor.Descriptor(
   oneofs=[
   ],
   serialized_start=124,
-  serialized_end=173,
+  serialized_end=196,
 )
 
 
@@ -148,8 +155,8 @@ _RESPONSE = _descriptor.Descriptor(
   extension_ranges=[],
   oneofs=[
   ],
-  serialized_start=175,
-  serialized_end=202,
+  serialized_start=198,
+  serialized_end=225,
 )
 
 
@@ -179,8 +186,8 @@ _QUERY = _descriptor.Descriptor(
   extension_ranges=[],
   oneofs=[
   ],
-  serialized_start=204,
-  serialized_end=226,
+  serialized_start=227,
+  serialized_end=249,
 )
 
 
@@ -210,8 +217,8 @@ _EXCEPTION = _descriptor.Descriptor(
   extension_ranges=[],
   oneofs=[
   ],
-  serialized_start=228,
-  serialized_end=258,
+  serialized_start=251,
+  serialized_end=281,
 )
 
 
@@ -241,8 +248,8 @@ _CHUNKSIZE = _descriptor.Descriptor(
   extension_ranges=[],
   oneofs=[
   ],
-  serialized_start=260,
-  serialized_end=285,
+  serialized_start=283,
+  serialized_end=308,
 )
 
 
@@ -288,6 +295,20 @@ _PARAMS = _descriptor.Descriptor(
       message_type=None, enum_type=None, containing_type=None,
       is_extension=False, extension_scope=None,
       serialized_options=None, file=DESCRIPTOR),
+    _descriptor.FieldDescriptor(
+      name='startAt', full_name='nglm_grpc.params.startAt', index=5,
+      number=6, type=1, cpp_type=5, label=1,
+      has_default_value=False, default_value=float(0),
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR),
+    _descriptor.FieldDescriptor(
+      name='chunkSize', full_name='nglm_grpc.params.chunkSize', index=6,
+      number=7, type=1, cpp_type=5, label=1,
+      has_default_value=False, default_value=float(0),
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR),
   ],
   extensions=[
   ],
@@ -300,8 +321,8 @@ _PARAMS = _descriptor.Descriptor(
   extension_ranges=[],
   oneofs=[
   ],
-  serialized_start=287,
-  serialized_end=377,
+  serialized_start=310,
+  serialized_end=436,
 )
 
 
@@ -331,10 +352,313 @@ _CHUNKS = _descriptor.Descriptor(
   extension_ranges=[],
   oneofs=[
   ],
-  serialized_start=379,
-  serialized_end=403,
+  serialized_start=438,
+  serialized_end=462,
 )
 
+
+_METRICSAMPLE = _descriptor.Descriptor(
+  name='metricSample',
+  full_name='nglm_grpc.metricSample',
+  filename=None,
+  file=DESCRIPTOR,
+  containing_type=None,
+  fields=[
+    _descriptor.FieldDescriptor(
+      name='timestamp', full_name='nglm_grpc.metricSample.timestamp', index=0,
+      number=1, type=1, cpp_type=5, label=1,
+      has_default_value=False, default_value=float(0),
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR),
+    _descriptor.FieldDescriptor(
+      name='values', full_name='nglm_grpc.metricSample.values', index=1,
+      number=2, type=1, cpp_type=5, label=3,
+      has_default_value=False, default_value=[],
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR),
+    _descriptor.FieldDescriptor(
+      name='names', full_name='nglm_grpc.metricSample.names', index=2,
+      number=3, type=9, cpp_type=9, label=3,
+      has_default_value=False, default_value=[],
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR),
+  ],
+  extensions=[
+  ],
+  nested_types=[],
+  enum_types=[
+  ],
+  serialized_options=None,
+  is_extendable=False,
+  syntax='proto3',
+  extension_ranges=[],
+  oneofs=[
+  ],
+  serialized_start=464,
+  serialized_end=528,
+)
+
+
+_UPLOADCHUNK = _descriptor.Descriptor(
+  name='uploadChunk',
+  full_name='nglm_grpc.uploadChunk',
+  filename=None,
+  file=DESCRIPTOR,
+  containing_type=None,
+  fields=[
+    _descriptor.FieldDescriptor(
+      name='offset', full_name='nglm_grpc.uploadChunk.offset', index=0,
+      number=1, type=3, cpp_type=2, label=1,
+      has_default_value=False, default_value=0,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR),
+    _descriptor.FieldDescriptor(
+      name='buffer', full_name='nglm_grpc.uploadChunk.buffer', index=1,
+      number=2, type=12, cpp_type=9, label=1,
+      has_default_value=False, default_value=_b(""),
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR),
+    _descriptor.FieldDescriptor(
+      name='sha256', full_name='nglm_grpc.uploadChunk.sha256', index=2,
+      number=3, type=9, cpp_type=9, label=1,
+      has_default_value=False, default_value=_b("").decode('utf-8'),
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR),
+  ],
+  extensions=[
+  ],
+  nested_types=[],
+  enum_types=[
+  ],
+  serialized_options=None,
+  is_extendable=False,
+  syntax='proto3',
+  extension_ranges=[],
+  oneofs=[
+  ],
+  serialized_start=530,
+  serialized_end=591,
+)
+
+
+_UPLOADSTATUS = _descriptor.Descriptor(
+  name='uploadStatus',
+  full_name='nglm_grpc.uploadStatus',
+  filename=None,
+  file=DESCRIPTOR,
+  containing_type=None,
+  fields=[
+    _descriptor.FieldDescriptor(
+      name='success', full_name='nglm_grpc.uploadStatus.success', index=0,
+      number=1, type=8, cpp_type=7, label=1,
+      has_default_value=False, default_value=False,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR),
+    _descriptor.FieldDescriptor(
+      name='offset', full_name='nglm_grpc.uploadStatus.offset', index=1,
+      number=2, type=3, cpp_type=2, label=1,
+      has_default_value=False, default_value=0,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR),
+    _descriptor.FieldDescriptor(
+      name='message', full_name='nglm_grpc.uploadStatus.message', index=2,
+      number=3, type=9, cpp_type=9, label=1,
+      has_default_value=False, default_value=_b("").decode('utf-8'),
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR),
+  ],
+  extensions=[
+  ],
+  nested_types=[],
+  enum_types=[
+  ],
+  serialized_options=None,
+  is_extendable=False,
+  syntax='proto3',
+  extension_ranges=[],
+  oneofs=[
+  ],
+  serialized_start=593,
+  serialized_end=657,
+)
+
+
+_CONTROLMESSAGE = _descriptor.Descriptor(
+  name='controlMessage',
+  full_name='nglm_grpc.controlMessage',
+  filename=None,
+  file=DESCRIPTOR,
+  containing_type=None,
+  fields=[
+    _descriptor.FieldDescriptor(
+      name='heartbeat', full_name='nglm_grpc.controlMessage.heartbeat', index=0,
+      number=1, type=11, cpp_type=10, label=1,
+      has_default_value=False, default_value=None,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR),
+    _descriptor.FieldDescriptor(
+      name='result', full_name='nglm_grpc.controlMessage.result', index=1,
+      number=2, type=11, cpp_type=10, label=1,
+      has_default_value=False, default_value=None,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR),
+  ],
+  extensions=[
+  ],
+  nested_types=[],
+  enum_types=[
+  ],
+  serialized_options=None,
+  is_extendable=False,
+  syntax='proto3',
+  extension_ranges=[],
+  oneofs=[
+    _descriptor.OneofDescriptor(
+      name='message', full_name='nglm_grpc.controlMessage.message',
+      index=0, containing_type=None, fields=[]),
+  ],
+  serialized_start=659,
+  serialized_end=769,
+)
+
+
+_CONTROLCOMMAND = _descriptor.Descriptor(
+  name='controlCommand',
+  full_name='nglm_grpc.controlCommand',
+  filename=None,
+  file=DESCRIPTOR,
+  containing_type=None,
+  fields=[
+    _descriptor.FieldDescriptor(
+      name='id', full_name='nglm_grpc.controlCommand.id', index=0,
+      number=1, type=3, cpp_type=2, label=1,
+      has_default_value=False, default_value=0,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR),
+    _descriptor.FieldDescriptor(
+      name='start', full_name='nglm_grpc.controlCommand.start', index=1,
+      number=2, type=11, cpp_type=10, label=1,
+      has_default_value=False, default_value=None,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR),
+    _descriptor.FieldDescriptor(
+      name='setConfig', full_name='nglm_grpc.controlCommand.setConfig', index=2,
+      number=3, type=11, cpp_type=10, label=1,
+      has_default_value=False, default_value=None,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR),
+    _descriptor.FieldDescriptor(
+      name='getConfig', full_name='nglm_grpc.controlCommand.getConfig', index=3,
+      number=4, type=11, cpp_type=10, label=1,
+      has_default_value=False, default_value=None,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR),
+  ],
+  extensions=[
+  ],
+  nested_types=[],
+  enum_types=[
+  ],
+  serialized_options=None,
+  is_extendable=False,
+  syntax='proto3',
+  extension_ranges=[],
+  oneofs=[
+    _descriptor.OneofDescriptor(
+      name='command', full_name='nglm_grpc.controlCommand.command',
+      index=0, containing_type=None, fields=[]),
+  ],
+  serialized_start=772,
+  serialized_end=930,
+)
+
+
+_COMMANDRESULT = _descriptor.Descriptor(
+  name='commandResult',
+  full_name='nglm_grpc.commandResult',
+  filename=None,
+  file=DESCRIPTOR,
+  containing_type=None,
+  fields=[
+    _descriptor.FieldDescriptor(
+      name='id', full_name='nglm_grpc.commandResult.id', index=0,
+      number=1, type=3, cpp_type=2, label=1,
+      has_default_value=False, default_value=0,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR),
+    _descriptor.FieldDescriptor(
+      name='success', full_name='nglm_grpc.commandResult.success', index=1,
+      number=2, type=8, cpp_type=7, label=1,
+      has_default_value=False, default_value=False,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR),
+    _descriptor.FieldDescriptor(
+      name='message', full_name='nglm_grpc.commandResult.message', index=2,
+      number=3, type=9, cpp_type=9, label=1,
+      has_default_value=False, default_value=_b("").decode('utf-8'),
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR),
+    _descriptor.FieldDescriptor(
+      name='config', full_name='nglm_grpc.commandResult.config', index=3,
+      number=4, type=12, cpp_type=9, label=1,
+      has_default_value=False, default_value=_b(""),
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR),
+  ],
+  extensions=[
+  ],
+  nested_types=[],
+  enum_types=[
+  ],
+  serialized_options=None,
+  is_extendable=False,
+  syntax='proto3',
+  extension_ranges=[],
+  oneofs=[
+  ],
+  serialized_start=932,
+  serialized_end=1009,
+)
+
+_CONTROLMESSAGE.fields_by_name['heartbeat'].message_type = _QUERY
+_CONTROLMESSAGE.fields_by_name['result'].message_type = _COMMANDRESULT
+_CONTROLMESSAGE.oneofs_by_name['message'].fields.append(
+  _CONTROLMESSAGE.fields_by_name['heartbeat'])
+_CONTROLMESSAGE.fields_by_name['heartbeat'].containing_oneof = _CONTROLMESSAGE.oneofs_by_name['message']
+_CONTROLMESSAGE.oneofs_by_name['message'].fields.append(
+  _CONTROLMESSAGE.fields_by_name['result'])
+_CONTROLMESSAGE.fields_by_name['result'].containing_oneof = _CONTROLMESSAGE.oneofs_by_name['message']
+_CONTROLCOMMAND.fields_by_name['start'].message_type = _PARAMS
+_CONTROLCOMMAND.fields_by_name['setConfig'].message_type = _CHUNKS
+_CONTROLCOMMAND.fields_by_name['getConfig'].message_type = _CHUNKSIZE
+_CONTROLCOMMAND.oneofs_by_name['command'].fields.append(
+  _CONTROLCOMMAND.fields_by_name['start'])
+_CONTROLCOMMAND.fields_by_name['start'].containing_oneof = _CONTROLCOMMAND.oneofs_by_name['command']
+_CONTROLCOMMAND.oneofs_by_name['command'].fields.append(
+  _CONTROLCOMMAND.fields_by_name['setConfig'])
+_CONTROLCOMMAND.fields_by_name['setConfig'].containing_oneof = _CONTROLCOMMAND.oneofs_by_name['command']
+_CONTROLCOMMAND.oneofs_by_name['command'].fields.append(
+  _CONTROLCOMMAND.fields_by_name['getConfig'])
+_CONTROLCOMMAND.fields_by_name['getConfig'].containing_oneof = _CONTROLCOMMAND.oneofs_by_name['command']
 DESCRIPTOR.message_types_by_name['clientInfo'] = _CLIENTINFO
 DESCRIPTOR.message_types_by_name['registerResponse'] = _REGISTERRESPONSE
 DESCRIPTOR.message_types_by_name['response'] = _RESPONSE
@@ -343,6 +667,12 @@ DESCRIPTOR.message_types_by_name['exception'] = _EXCEPTION
 DESCRIPTOR.message_types_by_name['chunkSize'] = _CHUNKSIZE
 DESCRIPTOR.message_types_by_name['params'] = _PARAMS
 DESCRIPTOR.message_types_by_name['chunks'] = _CHUNKS
+DESCRIPTOR.message_types_by_name['metricSample'] = _METRICSAMPLE
+DESCRIPTOR.message_types_by_name['uploadChunk'] = _UPLOADCHUNK
+DESCRIPTOR.message_types_by_name['uploadStatus'] = _UPLOADSTATUS
+DESCRIPTOR.message_types_by_name['controlMessage'] = _CONTROLMESSAGE
+DESCRIPTOR.message_types_by_name['controlCommand'] = _CONTROLCOMMAND
+DESCRIPTOR.message_types_by_name['commandResult'] = _COMMANDRESULT
 _sym_db.RegisterFileDescriptor(DESCRIPTOR)
 
 clientInfo = _reflection.GeneratedProtocolMessageType('clientInfo', (_message.Message,), dict(
@@ -401,6 +731,48 @@ chunks = _reflection.GeneratedProtocolMessageType('chunks', (_message.Message,),
   ))
 _sym_db.RegisterMessage(chunks)
 
+metricSample = _reflection.GeneratedProtocolMessageType('metricSample', (_message.Message,), dict(
+  DESCRIPTOR = _METRICSAMPLE,
+  __module__ = 'nglm_grpc.nglm_pb2'
+  # @@protoc_insertion_point(class_scope:nglm_grpc.metricSample)
+  ))
+_sym_db.RegisterMessage(metricSample)
+
+uploadChunk = _reflection.GeneratedProtocolMessageType('uploadChunk', (_message.Message,), dict(
+  DESCRIPTOR = _UPLOADCHUNK,
+  __module__ = 'nglm_grpc.nglm_pb2'
+  # @@protoc_insertion_point(class_scope:nglm_grpc.uploadChunk)
+  ))
+_sym_db.RegisterMessage(uploadChunk)
+
+uploadStatus = _reflection.GeneratedProtocolMessageType('uploadStatus', (_message.Message,), dict(
+  DESCRIPTOR = _UPLOADSTATUS,
+  __module__ = 'nglm_grpc.nglm_pb2'
+  # @@protoc_insertion_point(class_scope:nglm_grpc.uploadStatus)
+  ))
+_sym_db.RegisterMessage(uploadStatus)
+
+controlMessage = _reflection.GeneratedProtocolMessageType('controlMessage', (_message.Message,), dict(
+  DESCRIPTOR = _CONTROLMESSAGE,
+  __module__ = 'nglm_grpc.nglm_pb2'
+  # @@protoc_insertion_point(class_scope:nglm_grpc.controlMessage)
+  ))
+_sym_db.RegisterMessage(controlMessage)
+
+controlCommand = _reflection.GeneratedProtocolMessageType('controlCommand', (_message.Message,), dict(
+  DESCRIPTOR = _CONTROLCOMMAND,
+  __module__ = 'nglm_grpc.nglm_pb2'
+  # @@protoc_insertion_point(class_scope:nglm_grpc.controlCommand)
+  ))
+_sym_db.RegisterMessage(controlCommand)
+
+commandResult = _reflection.GeneratedProtocolMessageType('commandResult', (_message.Message,), dict(
+  DESCRIPTOR = _COMMANDRESULT,
+  __module__ = 'nglm_grpc.nglm_pb2'
+  # @@protoc_insertion_point(class_scope:nglm_grpc.commandResult)
+  ))
+_sym_db.RegisterMessage(commandResult)
+
 
 
 _SERVER = _descriptor.ServiceDescriptor(
@@ -409,8 +781,8 @@ _SERVER = _descriptor.ServiceDescriptor(
   file=DESCRIPTOR,
   index=0,
   serialized_options=None,
-  serialized_start=405,
-  serialized_end=531,
+  serialized_start=1012,
+  serialized_end=1209,
   methods=[
   _descriptor.MethodDescriptor(
     name='register',
@@ -430,6 +802,15 @@ _SERVER = _descriptor.ServiceDescriptor(
     output_type=_RESPONSE,
     serialized_options=None,
   ),
+  _descriptor.MethodDescriptor(
+    name='control',
+    full_name='nglm_grpc.Server.control',
+    index=2,
+    containing_service=None,
+    input_type=_CONTROLMESSAGE,
+    output_type=_CONTROLCOMMAND,
+    serialized_options=None,
+  ),
 ])
 _sym_db.RegisterServiceDescriptor(_SERVER)
 
@@ -442,8 +823,8 @@ _LOGGING = _descriptor.ServiceDescriptor(
   file=DESCRIPTOR,
   index=1,
   serialized_options=None,
-  serialized_start=534,
-  serialized_end=815,
+  serialized_start=1212,
+  serialized_end=1690,
   methods=[
   _descriptor.MethodDescriptor(
     name='start',
@@ -490,6 +871,33 @@ _LOGGING = _descriptor.ServiceDescriptor(
     output_type=_RESPONSE,
     serialized_options=None,
   ),
+  _descriptor.MethodDescriptor(
+    name='streamMetrics',
+    full_name='nglm_grpc.Logging.streamMetrics',
+    index=5,
+    containing_service=None,
+    input_type=_METRICSAMPLE,
+    output_type=_RESPONSE,
+    serialized_options=None,
+  ),
+  _descriptor.MethodDescriptor(
+    name='outputOffset',
+    full_name='nglm_grpc.Logging.outputOffset',
+    index=6,
+    containing_service=None,
+    input_type=_QUERY,
+    output_type=_UPLOADSTATUS,
+    serialized_options=None,
+  ),
+  _descriptor.MethodDescriptor(
+    name='resumeOutput',
+    full_name='nglm_grpc.Logging.resumeOutput',
+    index=7,
+    containing_service=None,
+    input_type=_UPLOADCHUNK,
+    output_type=_UPLOADSTATUS,
+    serialized_options=None,
+  ),
 ])
 _sym_db.RegisterServiceDescriptor(_LOGGING)
 
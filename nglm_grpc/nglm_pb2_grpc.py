@@ -24,6 +24,11 @@ class ServerStub(object):
         request_serializer=nglm__grpc_dot_nglm__pb2.query.SerializeToString,
         response_deserializer=nglm__grpc_dot_nglm__pb2.response.FromString,
         )
+    self.control = channel.stream_stream(
+        '/nglm_grpc.Server/control',
+        request_serializer=nglm__grpc_dot_nglm__pb2.controlMessage.SerializeToString,
+        response_deserializer=nglm__grpc_dot_nglm__pb2.controlCommand.FromString,
+        )
 
 
 class ServerServicer(object):
@@ -44,6 +49,14 @@ class ServerServicer(object):
     context.set_details('Method not implemented!')
     raise NotImplementedError('Method not implemented!')
 
+  def control(self, request_iterator, context):
+    """Kept open by clients after registering. Clients send heartbeats and
+    command results; the server pushes commands.
+    """
+    context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+    context.set_details('Method not implemented!')
+    raise NotImplementedError('Method not implemented!')
+
 
 def add_ServerServicer_to_server(servicer, server):
   rpc_method_handlers = {
@@ -57,6 +70,11 @@ def add_ServerServicer_to_server(servicer, server):
           request_deserializer=nglm__grpc_dot_nglm__pb2.query.FromString,
           response_serializer=nglm__grpc_dot_nglm__pb2.response.SerializeToString,
       ),
+      'control': grpc.stream_stream_rpc_method_handler(
+          servicer.control,
+          request_deserializer=nglm__grpc_dot_nglm__pb2.controlMessage.FromString,
+          response_serializer=nglm__grpc_dot_nglm__pb2.controlCommand.SerializeToString,
+      ),
   }
   generic_handler = grpc.method_handlers_generic_handler(
       'nglm_grpc.Server', rpc_method_handlers)
@@ -98,6 +116,21 @@ class LoggingStub(object):
         request_serializer=nglm__grpc_dot_nglm__pb2.chunks.SerializeToString,
         response_deserializer=nglm__grpc_dot_nglm__pb2.response.FromString,
         )
+    self.streamMetrics = channel.stream_unary(
+        '/nglm_grpc.Logging/streamMetrics',
+        request_serializer=nglm__grpc_dot_nglm__pb2.metricSample.SerializeToString,
+        response_deserializer=nglm__grpc_dot_nglm__pb2.response.FromString,
+        )
+    self.outputOffset = channel.unary_unary(
+        '/nglm_grpc.Logging/outputOffset',
+        request_serializer=nglm__grpc_dot_nglm__pb2.query.SerializeToString,
+        response_deserializer=nglm__grpc_dot_nglm__pb2.uploadStatus.FromString,
+        )
+    self.resumeOutput = channel.stream_unary(
+        '/nglm_grpc.Logging/resumeOutput',
+        request_serializer=nglm__grpc_dot_nglm__pb2.uploadChunk.SerializeToString,
+        response_deserializer=nglm__grpc_dot_nglm__pb2.uploadStatus.FromString,
+        )
 
 
 class LoggingServicer(object):
@@ -139,6 +172,27 @@ class LoggingServicer(object):
     context.set_details('Method not implemented!')
     raise NotImplementedError('Method not implemented!')
 
+  def streamMetrics(self, request_iterator, context):
+    # missing associated documentation comment in .proto file
+    pass
+    context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+    context.set_details('Method not implemented!')
+    raise NotImplementedError('Method not implemented!')
+
+  def outputOffset(self, request, context):
+    # missing associated documentation comment in .proto file
+    pass
+    context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+    context.set_details('Method not implemented!')
+    raise NotImplementedError('Method not implemented!')
+
+  def resumeOutput(self, request_iterator, context):
+    # missing associated documentation comment in .proto file
+    pass
+    context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+    context.set_details('Method not implemented!')
+    raise NotImplementedError('Method not implemented!')
+
 
 def add_LoggingServicer_to_server(servicer, server):
   rpc_method_handlers = {
@@ -167,6 +221,21 @@ def add_LoggingServicer_to_server(servicer, server):
           request_deserializer=nglm__grpc_dot_nglm__pb2.chunks.FromString,
           response_serializer=nglm__grpc_dot_nglm__pb2.response.SerializeToString,
       ),
+      'streamMetrics': grpc.stream_unary_rpc_method_handler(
+          servicer.streamMetrics,
+          request_deserializer=nglm__grpc_dot_nglm__pb2.metricSample.FromString,
+          response_serializer=nglm__grpc_dot_nglm__pb2.response.SerializeToString,
+      ),
+      'outputOffset': grpc.unary_unary_rpc_method_handler(
+          servicer.outputOffset,
+          request_deserializer=nglm__grpc_dot_nglm__pb2.query.FromString,
+          response_serializer=nglm__grpc_dot_nglm__pb2.uploadStatus.SerializeToString,
+      ),
+      'resumeOutput': grpc.stream_unary_rpc_method_handler(
+          servicer.resumeOutput,
+          request_deserializer=nglm__grpc_dot_nglm__pb2.uploadChunk.FromString,
+          response_serializer=nglm__grpc_dot_nglm__pb2.uploadStatus.SerializeToString,
+      ),
   }
   generic_handler = grpc.method_handlers_generic_handler(
       'nglm_grpc.Logging', rpc_method_handlers)
@@ -35,7 +35,7 @@ class TaskAdmin(admin.ModelAdmin):
         scheduleTask(obj)
         print('scheduleTask called')
         super().save_model(request, obj, form, change)
-        if 'Scheduled' not in obj.status:
+        if obj.status != 'Scheduled':
             obj.status = 'Scheduled'
             obj.save()
 
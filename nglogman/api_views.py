@@ -7,9 +7,14 @@ from rest_framework.reverse import reverse
 
 from django.http import Http404
 
+import os
+
 from nglogman.serializers import *
 from nglogman.models import Task, LGNode, NodeGroup
-from nglm_grpc.gRPCMethods import SCHEDULER
+from nglm_grpc.gRPCMethods import SCHEDULER, getOutputPath, COMPRESSION_STATS, \
+    UPLOADS
+from nglm_grpc.modules.MetricStore import readMetrics
+from NGLogmanServer.settings import GRPC_COMPRESSION, GRPC_COMPRESSION_LEVEL
 
 """
 Contains the views and API methods for the RESTful interface of NGLogmanServer.
@@ -20,7 +25,9 @@ def api_root(request):
     return Response({
         'tasks': reverse('api-task', request=request),
         'nodes': reverse('api-node', request=request),
-        'groups': reverse('api-group', request=request)
+        'groups': reverse('api-group', request=request),
+        'compression': reverse('api-compression', request=request),
+        'uploads': reverse('api-uploads', request=request)
     })
 
 
@@ -133,6 +140,81 @@ class TaskView(APIView):
         return Response(status=status.HTTP_204_NO_CONTENT)
 
 
+class TaskMetricsView(APIView):
+    """
+    ##GET <small>Parameters: `run`, `since`</small>
+
+    Returns the metric samples streamed by each node of this task, as
+    columns keyed by node and metric name. Samples are available while the
+    task is still running.
+
+    `run` selects a past run by its timestamp, and defaults to the current
+    run. `since` only returns samples with a later timestamp, for polling.
+    """
+    parser_classes = (JSONParser,)
+
+    def get(self, request, pk):
+        try:
+            task = Task.objects.get(taskUUID=uuid.UUID(pk))
+        except Task.DoesNotExist:
+            raise Http404
+
+        path = getOutputPath(task)
+        if request.query_params.get('run'):
+            path = os.path.join(os.path.dirname(path),
+                                os.path.basename(request.query_params['run']))
+        path = os.path.join(path, 'metrics')
+        since = request.query_params.get('since')
+        try:
+            since = float(since) if since else None
+        except ValueError:
+            return Response({'since': 'Must be a timestamp in seconds.'},
+                            status=status.HTTP_400_BAD_REQUEST)
+
+        data = {}
+        if os.path.isdir(path):
+            for node in sorted(os.listdir(path)):
+                columns = readMetrics(os.path.join(path, node), since=since)
+                data[node] = {name: col.tolist()
+                              for name, col in columns.items()}
+        return Response(data)
+
+
+class CompressionStatsView(APIView):
+    """
+    ##GET
+
+    Returns the bytes transferred over gRPC by this process since it
+    started, per stream, with estimates of the bytes compression saves, the
+    CPU time it costs, and the net transfer time saved over a link of
+    `COMPRESSION_LINK_BYTES_PER_SEC`. Estimates are made from one in
+    `COMPRESSION_SAMPLE_EVERY` messages, which by default are only sampled
+    while compression is enabled. As with the upload counters, they stay at
+    zero when gRPC is served by `rungrpc`.
+    """
+    def get(self, request):
+        return Response({
+            'algorithm': GRPC_COMPRESSION,
+            'level': GRPC_COMPRESSION_LEVEL,
+            'streams': COMPRESSION_STATS.snapshot()
+        })
+
+
+class UploadStatsView(APIView):
+    """
+    ##GET
+
+    Returns the result uploads in progress in this process, and the bytes
+    they hold waiting to be written, along with their peaks and limits and
+    the number of uploads admitted and turned away. The counters belong to
+    the process serving gRPC, so they stay at zero when it is run by
+    `rungrpc`, as with `GRPC_STANDALONE`, rather than alongside the web
+    server.
+    """
+    def get(self, request):
+        return Response(UPLOADS.snapshot())
+
+
 class NodeView(APIView):
     """
     ##GET
@@ -1,5 +1,26 @@
 from django.apps import AppConfig
+from django.db.backends.signals import connection_created
+from NGLogmanServer.settings import SQLITE_BUSY_TIMEOUT_MS
+
+
+def configureSQLite(sender, connection, **kwargs):
+    """
+    Tunes each new SQLite connection for concurrent use. WAL lets readers
+    continue while a write is in progress, the busy timeout makes writers
+    wait for the lock rather than fail, and synchronous=NORMAL, safe with
+    WAL, avoids an fsync on every commit.
+    """
+    if connection.vendor != 'sqlite':
+        return
+    with connection.cursor() as cursor:
+        cursor.execute('PRAGMA journal_mode=WAL')
+        cursor.execute('PRAGMA busy_timeout=%d' % SQLITE_BUSY_TIMEOUT_MS)
+        cursor.execute('PRAGMA synchronous=NORMAL')
 
 
 class NglogmanConfig(AppConfig):
     name = 'nglogman'
+
+    def ready(self):
+        connection_created.connect(configureSQLite,
+                                   dispatch_uid='configureSQLite')
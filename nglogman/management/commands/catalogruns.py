@@ -0,0 +1,53 @@
+import os
+import uuid
+
+from django.core.management.base import BaseCommand, CommandError
+
+from nglogman.models import LGNode, Task, TestRun
+from nglm_grpc.gRPCMethods import ROOT_DIR, catalogRuns
+
+
+class Command(BaseCommand):
+    help = 'Backfills the run catalog from the runs and result files found ' \
+           'in the Reports directory.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--prune', action='store_true',
+                            help='Also remove cataloged runs whose directory '
+                                 'no longer exists.')
+
+    def handle(self, *args, **options):
+        reports = os.path.join(ROOT_DIR, 'Reports')
+        if not os.path.isdir(reports):
+            raise CommandError('No Reports directory at %s.' % reports)
+        nodes = {node.hostname + '_' + node.ip.split('.')[-1]: node
+                 for node in LGNode.objects.all()}
+        runCount = fileCount = 0
+
+        for taskDir in sorted(os.listdir(reports)):
+            taskPath = os.path.join(reports, taskDir)
+            if not os.path.isdir(taskPath):
+                continue
+            try:
+                taskUUID = uuid.UUID(taskDir.rpartition('_')[2])
+                task = Task.objects.get(taskUUID=taskUUID)
+            except (ValueError, Task.DoesNotExist):
+                self.stderr.write('Skipping %s, no matching task.' % taskDir)
+                continue
+
+            runs = sorted(name for name in os.listdir(taskPath)
+                          if os.path.isdir(os.path.join(taskPath, name)))
+            counts = catalogRuns(task, taskPath, runs, nodes)
+            runCount += counts[0]
+            fileCount += counts[1]
+
+            if options['prune']:
+                _, deleted = TestRun.objects.filter(task=task).exclude(
+                    testTime__in=runs).delete()
+                deleted = deleted.get(TestRun._meta.label, 0)
+                if deleted:
+                    self.stdout.write('Pruned %d missing run(s) of %s.'
+                                      % (deleted, task))
+
+        self.stdout.write('Cataloged %d run(s) and %d result file(s).'
+                          % (runCount, fileCount))
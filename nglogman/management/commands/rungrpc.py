@@ -0,0 +1,101 @@
+import multiprocessing
+import threading
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from nglm_grpc.gRPCMethods import SCHEDULER, checkNodes, reapNodes, \
+    syncSchedule
+from nglm_grpc.gRPCServer import startServer, serveForever
+from NGLogmanServer.settings import GRPC_ADDRESS, GRPC_SERVER_MODE, \
+    GRPC_PROCESSES, SCHEDULE_SYNC_SECS
+
+# A worker exiting within this many seconds of starting is treated as a
+# startup failure rather than restarted.
+WORKER_STARTUP_SECS = 10
+
+
+class Command(BaseCommand):
+    help = 'Runs the gRPC server in one or more worker processes sharing ' \
+           'one port, along with the node health checks and task scheduler.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--address', default=GRPC_ADDRESS,
+                            help='Address to listen on. Defaults to '
+                                 'GRPC_ADDRESS.')
+        parser.add_argument('--processes', type=int, default=GRPC_PROCESSES,
+                            help='Number of gRPC worker processes. Defaults '
+                                 'to GRPC_PROCESSES.')
+        parser.add_argument('--mode', choices=['thread', 'aio'],
+                            default=GRPC_SERVER_MODE,
+                            help='gRPC server mode. Defaults to '
+                                 'GRPC_SERVER_MODE.')
+        parser.add_argument('--no-healthcheck', action='store_true',
+                            help='Do not run the background node health '
+                                 'checks.')
+
+    def handle(self, *args, **options):
+        address = options['address']
+        mode = options['mode']
+        processes = max(1, options['processes'])
+
+        workers = []
+        self.server = None
+        if processes == 1:
+            # Held for the life of the command, as gRPC stops a server once
+            # it is garbage collected.
+            self.server = startServer(address, mode)
+        else:
+            # Workers are spawned rather than forked, as gRPC channels and
+            # threads held by this process do not survive a fork.
+            context = multiprocessing.get_context('spawn')
+            workers = [self.startWorker(context, address, mode)
+                       for _ in range(processes)]
+        self.stdout.write('gRPC server listening on %s with %d %s '
+                          'process(es).' % (address, processes, mode))
+
+        # The health checks and scheduler only ever run in this process.
+        if not options['no_healthcheck']:
+            threading.Thread(target=checkNodes, kwargs={'repeat': True},
+                             daemon=True).start()
+            threading.Thread(target=reapNodes, kwargs={'repeat': True},
+                             daemon=True).start()
+        if not SCHEDULER.running:
+            SCHEDULER.start()
+        syncSchedule()
+        SCHEDULER.add_job(syncSchedule, trigger='interval',
+                          seconds=SCHEDULE_SYNC_SECS, id='syncSchedule',
+                          replace_existing=True)
+
+        try:
+            while True:
+                time.sleep(1)
+                for i, worker in enumerate(workers):
+                    if worker.is_alive():
+                        continue
+                    if time.time() - worker.startTime < WORKER_STARTUP_SECS:
+                        raise CommandError(
+                            'A gRPC worker failed to start. Several processes '
+                            'can only share one port with SO_REUSEPORT '
+                            'support, which needs grpcio 1.32 or newer. Use '
+                            '--processes 1 otherwise.')
+                    self.stderr.write('gRPC worker %d exited with code %s, '
+                                      'restarting.'
+                                      % (worker.pid, worker.exitcode))
+                    workers[i] = self.startWorker(context, address, mode)
+        except KeyboardInterrupt:
+            pass
+        finally:
+            for worker in workers:
+                worker.terminate()
+            for worker in workers:
+                worker.join()
+            SCHEDULER.shutdown(wait=False)
+
+    def startWorker(self, context, address, mode):
+        worker = context.Process(
+            target=serveForever, daemon=True,
+            args=(address, mode, [('grpc.so_reuseport', 1)]))
+        worker.start()
+        worker.startTime = time.time()
+        return worker
@@ -0,0 +1,96 @@
+# Generated by Django 2.1.7 on 2026-10-18 11:31
+
+from django.db import migrations, models
+import django.db.models.deletion
+import uuid
+
+
+def assignUngrouped(apps, schema_editor):
+    # Tasks created before node groups existed are kept, and assigned to an
+    # empty group which can then be filled, or the tasks reassigned.
+    Task = apps.get_model('nglogman', 'Task')
+    NodeGroup = apps.get_model('nglogman', 'NodeGroup')
+    tasks = Task.objects.filter(assignedNode=None)
+    if tasks.exists():
+        group = NodeGroup.objects.create(
+            groupname='Ungrouped',
+            comments='Created for tasks made before node groups existed.')
+        tasks.update(assignedNode=group)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('nglogman', '0007_auto_20190115_2213'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='NodeGroup',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('groupname', models.CharField(max_length=200)),
+                ('currentTask', models.UUIDField(editable=False, null=True)),
+                ('comments', models.TextField(blank=True, default='')),
+            ],
+        ),
+        migrations.AlterModelOptions(
+            name='lgnode',
+            options={'verbose_name': 'Logman Node', 'verbose_name_plural': 'Logman Nodes'},
+        ),
+        migrations.RemoveField(
+            model_name='task',
+            name='owner',
+        ),
+        migrations.AddField(
+            model_name='lgnode',
+            name='currentTask',
+            field=models.UUIDField(editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='lgnode',
+            name='port',
+            field=models.IntegerField(default=50052),
+        ),
+        migrations.AddField(
+            model_name='lgnode',
+            name='status',
+            field=models.CharField(default='Offline', editable=False, max_length=200),
+        ),
+        migrations.AddField(
+            model_name='task',
+            name='status',
+            field=models.CharField(default='Scheduled', editable=False, max_length=200),
+        ),
+        migrations.AlterField(
+            model_name='lgnode',
+            name='nodeUUID',
+            field=models.UUIDField(default=uuid.uuid4, primary_key=True, serialize=False),
+        ),
+        migrations.AlterField(
+            model_name='task',
+            name='duration',
+            field=models.DurationField(help_text='{hh}:{mm}:{ss} or {%s}'),
+        ),
+        migrations.AlterField(
+            model_name='task',
+            name='interval',
+            field=models.PositiveSmallIntegerField(default=4, help_text='{%s}'),
+        ),
+        migrations.AddField(
+            model_name='nodegroup',
+            name='nodes',
+            field=models.ManyToManyField(to='nglogman.LGNode'),
+        ),
+        migrations.AddField(
+            model_name='task',
+            name='assignedNode',
+            field=models.ForeignKey(null=True, on_delete=django.db.models.deletion.CASCADE, to='nglogman.NodeGroup', verbose_name='Assigned Group'),
+        ),
+        migrations.RunPython(assignUngrouped, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='task',
+            name='assignedNode',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='nglogman.NodeGroup', verbose_name='Assigned Group'),
+        ),
+    ]
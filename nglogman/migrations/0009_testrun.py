@@ -0,0 +1,29 @@
+# Generated by Django 2.1.7 on 2026-10-18 11:32
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('nglogman', '0008_sync_models'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TestRun',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('testTime', models.CharField(max_length=50)),
+                ('reportStatus', models.CharField(default='Queued', max_length=20)),
+                ('reportMessage', models.TextField(blank=True, default='')),
+                ('updateTime', models.DateTimeField(auto_now=True)),
+                ('task', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='nglogman.Task')),
+            ],
+        ),
+        migrations.AlterUniqueTogether(
+            name='testrun',
+            unique_together={('task', 'testTime')},
+        ),
+    ]
@@ -0,0 +1,45 @@
+# Generated by Django 2.1.7 on 2026-10-18 11:42
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def markOverviews(apps, schema_editor):
+    # Runs whose report finished already have an overview workbook.
+    TestRun = apps.get_model('nglogman', 'TestRun')
+    TestRun.objects.filter(reportStatus='Done').update(hasOverview=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('nglogman', '0009_testrun'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ResultFile',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=255)),
+                ('size', models.BigIntegerField(default=0)),
+                ('updateTime', models.DateTimeField(auto_now=True)),
+                ('node', models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, to='nglogman.LGNode')),
+            ],
+        ),
+        migrations.AddField(
+            model_name='testrun',
+            name='hasOverview',
+            field=models.BooleanField(default=False),
+        ),
+        migrations.AddField(
+            model_name='resultfile',
+            name='run',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='files', to='nglogman.TestRun'),
+        ),
+        migrations.AlterUniqueTogether(
+            name='resultfile',
+            unique_together={('run', 'name')},
+        ),
+        migrations.RunPython(markOverviews, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 2.1.7 on 2026-10-18 11:44
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('nglogman', '0010_run_catalog'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='lgnode',
+            name='configHash',
+            field=models.CharField(blank=True, default='', editable=False, max_length=64),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 2.1.7 on 2026-10-18 14:02
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('nglogman', '0011_lgnode_confighash'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='lgnode',
+            name='lastSeen',
+            field=models.DateTimeField(editable=False, null=True),
+        ),
+    ]
@@ -0,0 +1,47 @@
+# Generated by Django 2.1.7 on 2026-10-18 11:55
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def reserveTasks(apps, schema_editor):
+    # Historical models lack Task.reserve, so reservations are built here.
+    Task = apps.get_model('nglogman', 'Task')
+    NodeReservation = apps.get_model('nglogman', 'NodeReservation')
+    reservations = []
+    for task in Task.objects.prefetch_related('assignedNode__nodes'):
+        end = task.startTime + task.duration
+        reservations.extend(
+            NodeReservation(task=task, node=node, start=task.startTime,
+                            end=end)
+            for node in task.assignedNode.nodes.all())
+    NodeReservation.objects.bulk_create(reservations, batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('nglogman', '0012_lgnode_lastseen'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='NodeReservation',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('start', models.DateTimeField()),
+                ('end', models.DateTimeField()),
+                ('node', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='reservations', to='nglogman.LGNode')),
+                ('task', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='reservations', to='nglogman.Task')),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='nodereservation',
+            index=models.Index(fields=['node', 'start', 'end'], name='nglogman_no_node_id_2996b1_idx'),
+        ),
+        migrations.AlterUniqueTogether(
+            name='nodereservation',
+            unique_together={('task', 'node')},
+        ),
+        migrations.RunPython(reserveTasks, migrations.RunPython.noop),
+    ]
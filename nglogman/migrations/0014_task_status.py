@@ -0,0 +1,69 @@
+# Generated by Django 2.1.7 on 2026-10-18 11:57
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def splitFailures(apps, schema_editor):
+    # Failure messages were appended to the status, one 'ip: error' line per
+    # node, after a first line of 'Failed: ' and any error starting the task.
+    Task = apps.get_model('nglogman', 'Task')
+    TaskFailure = apps.get_model('nglogman', 'TaskFailure')
+    failures = []
+    for task in Task.objects.filter(status__startswith='Failed') \
+            .prefetch_related('assignedNode__nodes'):
+        nodes = {node.ip: node for node in task.assignedNode.nodes.all()}
+        lines = task.status[len('Failed:'):].split('\n')
+        for line in lines:
+            ip, sep, message = line.strip().partition(': ')
+            if sep and ip in nodes:
+                failures.append(TaskFailure(task=task, node=nodes[ip],
+                                            message=message))
+            elif line.strip():
+                failures.append(TaskFailure(task=task, message=line.strip()))
+    TaskFailure.objects.bulk_create(failures, batch_size=500)
+    Task.objects.filter(status__startswith='Failed').update(status='Failed')
+
+
+def joinFailures(apps, schema_editor):
+    Task = apps.get_model('nglogman', 'Task')
+    for task in Task.objects.filter(status='Failed') \
+            .prefetch_related('failures__node'):
+        lines = ['%s: %s' % (failure.node.ip, failure.message)
+                 if failure.node else failure.message
+                 for failure in task.failures.all()]
+        task.status = 'Failed: \n' + '\n'.join(lines)
+        task.save(update_fields=['status'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('nglogman', '0013_node_reservation'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TaskFailure',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('message', models.TextField()),
+                ('createTime', models.DateTimeField(auto_now_add=True)),
+                ('node', models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, to='nglogman.LGNode')),
+            ],
+            options={
+                'ordering': ('createTime',),
+            },
+        ),
+        migrations.AddField(
+            model_name='taskfailure',
+            name='task',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='failures', to='nglogman.Task'),
+        ),
+        migrations.RunPython(splitFailures, joinFailures),
+        migrations.AlterField(
+            model_name='task',
+            name='status',
+            field=models.CharField(choices=[('Scheduled', 'Scheduled'), ('In Progress', 'In Progress'), ('Completed', 'Completed'), ('Failed', 'Failed')], db_index=True, default='Scheduled', editable=False, max_length=20),
+        ),
+    ]
@@ -0,0 +1,45 @@
+# Generated by Django 2.1.7 on 2026-10-18 11:59
+
+from django.db import migrations, models
+from django.utils.ipv6 import clean_ipv6_address
+
+
+def normalizeIPs(apps, schema_editor):
+    # Lookups by ip were case-insensitive, so IPv6 addresses saved other than
+    # through the model may not be in normalized form.
+    LGNode = apps.get_model('nglogman', 'LGNode')
+    for node in LGNode.objects.filter(ip__contains=':'):
+        ip = clean_ipv6_address(node.ip)
+        if ip != node.ip:
+            LGNode.objects.filter(pk=node.pk).update(ip=ip)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('nglogman', '0014_task_status'),
+    ]
+
+    operations = [
+        migrations.RunPython(normalizeIPs, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='lgnode',
+            name='currentTask',
+            field=models.UUIDField(db_index=True, editable=False, null=True),
+        ),
+        migrations.AlterField(
+            model_name='lgnode',
+            name='ip',
+            field=models.GenericIPAddressField(db_index=True),
+        ),
+        migrations.AlterField(
+            model_name='lgnode',
+            name='status',
+            field=models.CharField(db_index=True, default='Offline', editable=False, max_length=200),
+        ),
+        migrations.AlterField(
+            model_name='nodegroup',
+            name='currentTask',
+            field=models.UUIDField(db_index=True, editable=False, null=True),
+        ),
+    ]
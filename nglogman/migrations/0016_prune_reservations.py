@@ -0,0 +1,22 @@
+# Generated by Django 2.1.7 on 2026-10-18 12:40
+
+from django.db import migrations
+
+
+def pruneReservations(apps, schema_editor):
+    # Reservations of finished tasks were kept, and are now released as
+    # tasks finish.
+    NodeReservation = apps.get_model('nglogman', 'NodeReservation')
+    NodeReservation.objects.filter(
+        task__status__in=('Completed', 'Failed')).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('nglogman', '0015_lookup_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(pruneReservations, migrations.RunPython.noop),
+    ]
@@ -1,20 +1,42 @@
-from django.db import models
+from django.db import models, transaction
+from django.db.models.signals import m2m_changed
+from django.dispatch import receiver
 from django.utils import timezone
 from django.core.exceptions import ValidationError
 from django.db.models import Q
 import uuid
 
+# Task fields that determine the nodes a task reserves, and when.
+RESERVATION_FIELDS = {'startTime', 'duration', 'assignedNode'}
+TASK_STATUSES = (
+    ('Scheduled', 'Scheduled'),
+    ('In Progress', 'In Progress'),
+    ('Completed', 'Completed'),
+    ('Failed', 'Failed'),
+)
+# Statuses a task does not leave, other than by being rescheduled.
+FINISHED_STATUSES = ('Completed', 'Failed')
+
 class LGNode(models.Model):
     """
     A data model that maps a Node entity to database
     """
     hostname = models.CharField(max_length=200)
-    ip = models.GenericIPAddressField()
+    # Stored in the normalized form of GenericIPAddressField, lowercase for
+    # IPv6, so that lookups are exact and use the index.
+    ip = models.GenericIPAddressField(db_index=True)
     port = models.IntegerField(default=50052)
-    currentTask = models.UUIDField(null=True, editable=False)
+    currentTask = models.UUIDField(null=True, editable=False, db_index=True)
     comments = models.TextField(default='')
-    status = models.CharField(max_length=200,
-                              editable=False, default='Offline')
+    status = models.CharField(max_length=200, editable=False,
+                              default='Offline', db_index=True)
+    # SHA-256 of the node's config as last fetched or set, or empty if it may
+    # have changed since.
+    configHash = models.CharField(max_length=64, default='', blank=True,
+                                  editable=False)
+    # Time of the last heartbeat on the node's control stream, or null if it
+    # has none open.
+    lastSeen = models.DateTimeField(null=True, editable=False)
     nodeUUID = models.UUIDField(primary_key=True, default=uuid.uuid4,
                                 null=False, editable=True)
 
@@ -31,7 +53,7 @@ class NodeGroup(models.Model):
     A data model that reflects a group of LGNode instances.
     """
     groupname = models.CharField(max_length=200)
-    currentTask = models.UUIDField(null=True, editable=False)
+    currentTask = models.UUIDField(null=True, editable=False, db_index=True)
     comments = models.TextField(default='', blank=True)
     nodes = models.ManyToManyField(LGNode)
 
@@ -44,8 +66,9 @@ class Task(models.Model):
     A data model that maps a Node entity to database
     """
     taskName = models.CharField(max_length=200, null=False)
-    status = models.CharField(max_length=200,
-                              editable=False, default='Scheduled')
+    status = models.CharField(max_length=20, choices=TASK_STATUSES,
+                              editable=False, default='Scheduled',
+                              db_index=True)
     assignedNode = models.ForeignKey(NodeGroup, on_delete=models.CASCADE,
                                      verbose_name='Assigned Group')
     createTime = models.DateTimeField(auto_now=True)
@@ -64,15 +87,156 @@ class Task(models.Model):
         if self.startTime < timezone.now():
             raise ValidationError("Chosen start time has already passed.")
 
-        qs = Task.objects.exclude(Q(status__exact='Completed') |
-                                  Q(status__contains='Failed'))
-        for task in qs:
-            end = task.startTime + task.duration
-            if task.startTime <= self.startTime <= end:
-                busyNodes = []
-                for node in self.assignedNode.nodes.all():
-                    if node in task.assignedNode.nodes.all():
-                        busyNodes.append(node.ip)
-                raise ValidationError("The following nodes are unavailable"
-                                      " at the specified time: \n %s"
-                                      % ', '.join(busyNodes))
+        busyNodes = NodeReservation.objects.filter(
+            node__in=self.assignedNode.nodes.all(),
+            start__lt=self.startTime + self.duration,
+            end__gt=self.startTime
+        ).exclude(task=self.pk).values_list('node__ip', flat=True).distinct()
+        busyNodes = sorted(busyNodes)
+        if busyNodes:
+            raise ValidationError("The following nodes are unavailable"
+                                  " at the specified time: \n %s"
+                                  % ', '.join(busyNodes))
+
+    def transition(self, status, fromStatuses):
+        """
+        Changes the task's status, only if it is still one of the expected
+        statuses. The check and the update are a single query, so concurrent
+        transitions of the same task cannot overwrite one another. A task
+        that finishes releases its node reservations.
+        :param status: The new status.
+        :param fromStatuses: The statuses the task may move to it from.
+        :return: Whether the status was changed.
+        """
+        with transaction.atomic():
+            changed = Task.objects.filter(
+                taskUUID=self.taskUUID, status__in=fromStatuses
+            ).update(status=status)
+            if changed and status in FINISHED_STATUSES:
+                NodeReservation.objects.filter(task=self.taskUUID).delete()
+        if changed:
+            self.status = status
+        return bool(changed)
+
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        fields = kwargs.get('update_fields')
+        if self.status not in FINISHED_STATUSES and (
+                fields is None or RESERVATION_FIELDS.intersection(fields)):
+            self.reserve()
+
+    def reserve(self):
+        """
+        Replaces the task's node reservations with one for each node of its
+        group, covering the task's start time to its end.
+        :return: None.
+        """
+        end = self.startTime + self.duration
+        with transaction.atomic():
+            NodeReservation.objects.filter(task=self).delete()
+            NodeReservation.objects.bulk_create(
+                NodeReservation(task=self, node_id=nodeUUID,
+                                start=self.startTime, end=end)
+                for nodeUUID in self.assignedNode.nodes.values_list(
+                    'nodeUUID', flat=True))
+
+
+class TaskFailure(models.Model):
+    """
+    A data model that maps an error reported by, or when starting, one node
+    of a failed Task.
+    """
+    task = models.ForeignKey(Task, on_delete=models.CASCADE,
+                             related_name='failures')
+    node = models.ForeignKey(LGNode, on_delete=models.SET_NULL, null=True)
+    message = models.TextField()
+    createTime = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        if self.node is None:
+            return self.message
+        return '%s: %s' % (self.node.ip, self.message)
+
+    class Meta:
+        ordering = ('createTime',)
+
+
+class NodeReservation(models.Model):
+    """
+    A data model that maps the time a node is reserved by a Task, from its
+    start to its end. Indexed by node and time, so that scheduling conflicts
+    are found with a single query rather than by comparing every task.
+    """
+    task = models.ForeignKey(Task, on_delete=models.CASCADE,
+                             related_name='reservations')
+    node = models.ForeignKey(LGNode, on_delete=models.CASCADE,
+                             related_name='reservations')
+    start = models.DateTimeField()
+    end = models.DateTimeField()
+
+    def __str__(self):
+        return '%s: %s - %s' % (self.node, self.start, self.end)
+
+    class Meta:
+        unique_together = ('task', 'node')
+        indexes = [models.Index(fields=['node', 'start', 'end'])]
+
+
+@receiver(m2m_changed, sender=NodeGroup.nodes.through)
+def groupNodesChanged(sender, instance, action, reverse, pk_set, **kwargs):
+    """
+    Updates the reservations of a group's tasks when nodes are added to or
+    removed from the group.
+    """
+    if action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+    if reverse:
+        # Nodes removed from every group leave no pk_set, so the tasks
+        # already reserving the node are updated too.
+        tasks = Task.objects.filter(
+            Q(assignedNode__in=pk_set or []) | Q(reservations__node=instance)
+        ).distinct()
+    else:
+        tasks = Task.objects.filter(assignedNode=instance)
+    for task in tasks.exclude(status__in=FINISHED_STATUSES):
+        task.reserve()
+
+
+class TestRun(models.Model):
+    """
+    A data model that maps a single run of a Task, and tracks the background
+    job that builds its overview report. Together with ResultFile, it
+    catalogs the run's output directory, so results are listed and checked
+    for completion without touching the file system.
+    """
+    task = models.ForeignKey(Task, on_delete=models.CASCADE)
+    testTime = models.CharField(max_length=50)
+    reportStatus = models.CharField(max_length=20, default='Queued')
+    reportMessage = models.TextField(default='', blank=True)
+    hasOverview = models.BooleanField(default=False)
+    updateTime = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return '%s (%s)' % (self.task, self.testTime)
+
+    class Meta:
+        unique_together = ('task', 'testTime')
+
+
+class ResultFile(models.Model):
+    """
+    A data model that maps the result workbook saved for one node of a
+    TestRun.
+    """
+    run = models.ForeignKey(TestRun, on_delete=models.CASCADE,
+                            related_name='files')
+    node = models.ForeignKey(LGNode, on_delete=models.SET_NULL, null=True)
+    name = models.CharField(max_length=255)
+    size = models.BigIntegerField(default=0)
+    updateTime = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return self.name
+
+    class Meta:
+        unique_together = ('run', 'name')
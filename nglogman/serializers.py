@@ -33,8 +33,9 @@ class TaskViewSerializer(serializers.ModelSerializer):
     """
     class Meta:
         model = Task
-        fields = ('taskName', 'status', 'assignedNode', 'createTime',
-                  'startTime', 'duration', 'interval', 'taskUUID')
+        fields = ('taskName', 'status', 'failures', 'assignedNode',
+                  'createTime', 'startTime', 'duration', 'interval',
+                  'taskUUID')
         depth = 1
 
 
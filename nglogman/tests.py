@@ -1,3 +1,577 @@
-from django.test import TestCase
+import hashlib
+import io
+import os
+import queue
+import re
+import tempfile
+import threading
+import uuid
+import zipfile
+from datetime import timedelta
+from types import SimpleNamespace
+from unittest import mock
 
-# Create your tests here.
+import numpy
+import pandas as pd
+
+import grpc
+from django.db import connection
+from django.core.exceptions import ValidationError
+from django.test import RequestFactory, TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from nglogman import views
+from nglogman.models import LGNode, NodeGroup, NodeReservation, Task, \
+    TestRun
+from nglm_grpc import gRPCMethods, nglm_pb2
+from nglm_grpc.modules.Admission import AdmissionController
+from nglm_grpc.modules.Archive import runFiles, streamZip
+from nglm_grpc.modules.ControlHub import ControlError, ControlHub
+from nglm_grpc.modules.MetricStore import MetricWriter, columnFile, \
+    readMetrics
+from nglm_grpc.modules.Upload import PartialUpload, UploadError
+from nglm_grpc.modules.Utility import lttb
+
+# A plan step reading every row of a table, rather than searching an index.
+TABLE_SCAN = re.compile(r'^SCAN (?:TABLE )?(\w+)(?: AS \w+)?$')
+
+
+class QueryPlanTests(TestCase):
+    """
+    Runs EXPLAIN QUERY PLAN on the queries made by the gRPC handlers and the
+    dashboard views, and fails should any of them scan a whole table.
+    """
+    def setUp(self):
+        # Writes are made on this thread, inside the test's transaction,
+        # rather than on the DB_WRITER thread.
+        patcher = mock.patch.object(gRPCMethods.DB_WRITER, 'call',
+                                    lambda func, *args: func(*args))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.nodes = [LGNode.objects.create(hostname='node%d' % i,
+                                            ip='10.0.0.%d' % i,
+                                            status='Available')
+                      for i in range(4)]
+        self.group = NodeGroup.objects.create(groupname='group')
+        self.group.nodes.add(*self.nodes)
+        self.task = Task.objects.create(
+            taskName='task', assignedNode=self.group,
+            startTime=timezone.now() + timedelta(hours=1),
+            duration=timedelta(minutes=5))
+        self.task.transition('In Progress', ('Scheduled',))
+        LGNode.objects.update(status='Busy', currentTask=self.task.taskUUID)
+        NodeGroup.objects.update(currentTask=self.task.taskUUID)
+
+    def assertIndexed(self, queries, allowScans=()):
+        """
+        Fails if the plan of any captured query scans a table.
+        :param queries: The CaptureQueriesContext of the queries.
+        :param allowScans: Tables that the queries are expected to read in
+        full, such as those listed in full on a page.
+        """
+        tables = set(connection.introspection.table_names())
+        with connection.cursor() as cursor:
+            for query in queries:
+                sql = query['sql']
+                if not sql.startswith(('SELECT', 'UPDATE', 'DELETE')):
+                    continue
+                cursor.execute('EXPLAIN QUERY PLAN ' + sql)
+                for row in cursor.fetchall():
+                    match = TABLE_SCAN.match(row[-1])
+                    if match and match.group(1) in tables and \
+                            match.group(1) not in allowScans:
+                        self.fail('%s scans %s:\n%s'
+                                  % (row[-1], match.group(1), sql))
+
+    def testRegister(self):
+        servicer = gRPCMethods.ServerServicer()
+        with CaptureQueriesContext(connection) as queries:
+            servicer.register(nglm_pb2.clientInfo(
+                hostname='new', ipv4='10.0.1.1', port=50052,
+                uuid=str(uuid.uuid4())), None)
+            servicer.register(nglm_pb2.clientInfo(
+                hostname='node0', ipv4='10.0.0.0', port=50053,
+                uuid=str(self.nodes[0].nodeUUID)), None)
+        self.assertIndexed(queries)
+
+    def testOutput(self):
+        node = self.nodes[0]
+        inline = SimpleNamespace(submit=lambda f, *a: f(*a))
+        with tempfile.TemporaryDirectory() as root, \
+                mock.patch.object(gRPCMethods, 'ROOT_DIR', root), \
+                mock.patch.object(gRPCMethods, 'REPORT_QUEUE', inline):
+            path = gRPCMethods.getResultPath(node, self.task)
+            os.makedirs(os.path.dirname(path))
+            open(path, 'wb').close()
+            with CaptureQueriesContext(connection) as queries:
+                node, task = gRPCMethods.getNodeTask(node.nodeUUID)
+                gRPCMethods.completeOutput(node, task)
+        self.assertIndexed(queries)
+
+    def testErr(self):
+        with CaptureQueriesContext(connection) as queries:
+            gRPCMethods.recordError(self.nodes[0].nodeUUID, 'error')
+        self.assertIndexed(queries)
+
+    def testUpdateNodes(self):
+        LGNode.objects.update(status='Available', currentTask=None)
+        with CaptureQueriesContext(connection) as queries:
+            gRPCMethods.updateNodes(self.nodes[:2])
+        self.assertIndexed(queries)
+
+    def testDashboard(self):
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get('/dashboard')
+        # Every group is listed on the dashboard.
+        self.assertIndexed(queries, allowScans=('nglogman_nodegroup',))
+
+    def testTaskList(self):
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get('/tasks')
+        self.assertIndexed(queries)
+
+
+class UpdateNodesTests(TestCase):
+    """
+    Checks that a health-check sweep writes only the nodes whose status
+    changed, in at most two updates.
+    """
+    def setUp(self):
+        patcher = mock.patch.object(gRPCMethods.DB_WRITER, 'call',
+                                    lambda func, *args: func(*args))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.nodes = [LGNode.objects.create(hostname='node%d' % i,
+                                            ip='10.0.0.%d' % i,
+                                            status=status)
+                      for i, status in enumerate(
+                          ['Available', 'Available', 'Offline', 'Offline',
+                           'Busy'])]
+
+    def updates(self, queries):
+        return [query['sql'] for query in queries
+                if query['sql'].startswith('UPDATE')]
+
+    def testChanges(self):
+        with CaptureQueriesContext(connection) as queries:
+            gRPCMethods.updateNodes([self.nodes[0], self.nodes[2]])
+        self.assertEqual(len(self.updates(queries)), 2)
+        self.assertEqual(
+            list(LGNode.objects.order_by('hostname')
+                 .values_list('status', flat=True)),
+            ['Available', 'Offline', 'Available', 'Offline', 'Busy'])
+
+    def testUnchanged(self):
+        with CaptureQueriesContext(connection) as queries:
+            gRPCMethods.updateNodes(self.nodes[:2] + self.nodes[4:])
+        self.assertEqual(self.updates(queries), [])
+        self.assertEqual(LGNode.objects.get(hostname='node4').status, 'Busy')
+
+    def testLargeSweep(self):
+        nodes = LGNode.objects.bulk_create(
+            LGNode(hostname='bulk%d' % i,
+                   ip='10.1.%d.%d' % (i // 256, i % 256))
+            for i in range(2000))
+        gRPCMethods.updateNodes(nodes)
+        self.assertEqual(LGNode.objects.filter(status='Available').count(),
+                         2000)
+
+
+class AdmissionTests(TestCase):
+    """
+    Checks that uploads beyond the limits are turned away with a hint of
+    when to retry, and that chunks are held only until they are written.
+    """
+    def setUp(self):
+        self.uploads = AdmissionController(maxUploads=2, maxPendingBytes=100,
+                                           retrySecs=5)
+
+    def testRejectOverLimit(self):
+        tickets = [self.uploads.admit(), self.uploads.admit()]
+        self.assertIsNone(self.uploads.admit())
+        # Twice the base delay with every upload slot taken, plus jitter.
+        self.assertTrue(10 <= self.uploads.retryAfter() <= 20)
+        tickets[0].close()
+        self.assertIsNotNone(self.uploads.admit())
+        stats = self.uploads.snapshot()
+        self.assertEqual((stats['admitted'], stats['rejected']), (3, 1))
+
+    def testRejectOverPendingBytes(self):
+        chunks = iter(self.uploads.admit().track(
+            [nglm_pb2.uploadChunk(buffer=b'x' * 100)]))
+        next(chunks)
+        self.assertIsNone(self.uploads.admit())
+        next(chunks, None)
+        self.assertIsNotNone(self.uploads.admit())
+
+    def testTrackReleasesWrittenChunks(self):
+        ticket = self.uploads.admit()
+        chunks = ticket.track(nglm_pb2.uploadChunk(buffer=b'x' * size)
+                              for size in (10, 20))
+        held = [self.uploads.snapshot()['pendingBytes'] for chunk in chunks]
+        self.assertEqual(held, [10, 20])
+        self.assertEqual(self.uploads.snapshot()['pendingBytes'], 0)
+        ticket.close()
+        self.assertEqual(self.uploads.snapshot()['activeUploads'], 0)
+
+    def testAdmitUploadAborts(self):
+        context = mock.Mock()
+        with mock.patch.object(gRPCMethods, 'UPLOADS', AdmissionController(
+                maxUploads=0, maxPendingBytes=100, retrySecs=5)):
+            gRPCMethods.admitUpload(context)
+        self.assertEqual(context.abort.call_args[0][0],
+                         grpc.StatusCode.RESOURCE_EXHAUSTED)
+        (key, value), = context.set_trailing_metadata.call_args[0][0]
+        self.assertEqual(key, 'retry-after')
+        self.assertGreaterEqual(float(value), 5)
+
+
+class StartDelayTests(TestCase):
+    """
+    Checks that a task's common start time leaves time to reach every
+    client of its group.
+    """
+    def testStartDelay(self):
+        with mock.patch.multiple(gRPCMethods, DISPATCH_WORKERS=32,
+                                 DISPATCH_TIMEOUT_SECS=10,
+                                 DISPATCH_START_DELAY=2):
+            self.assertEqual(gRPCMethods.startDelay(1), 10)
+            self.assertEqual(gRPCMethods.startDelay(32), 10)
+            self.assertEqual(gRPCMethods.startDelay(33), 20)
+            self.assertEqual(gRPCMethods.startDelay(100), 40)
+        with mock.patch.multiple(gRPCMethods, DISPATCH_TIMEOUT_SECS=1,
+                                 DISPATCH_START_DELAY=5):
+            self.assertEqual(gRPCMethods.startDelay(1), 5)
+
+
+class CatalogBackfillTests(TestCase):
+    """
+    Checks that runs on disk but missing from the run catalog are listed on
+    the results page once it is visited.
+    """
+    def testResultsPageCatalogsRuns(self):
+        node = LGNode.objects.create(hostname='node', ip='10.0.0.1')
+        group = NodeGroup.objects.create(groupname='group')
+        group.nodes.add(node)
+        task = Task.objects.create(
+            taskName='task', assignedNode=group, startTime=timezone.now(),
+            duration=timedelta(minutes=5))
+        with tempfile.TemporaryDirectory() as root, \
+                mock.patch.object(views, 'ROOT_DIR', root):
+            run = os.path.join(root, 'Reports', 'task_%s' % task.taskUUID,
+                               '2019-01-01T00-00-00')
+            os.makedirs(run)
+            for name in ('overview.xlsx',
+                         'node_1_%s_result.xlsx' % task.taskUUID):
+                open(os.path.join(run, name), 'wb').close()
+            response = self.client.get('/tasks/%s/results' % task.taskUUID)
+        self.assertEqual(response.status_code, 200)
+        run = TestRun.objects.get(task=task)
+        self.assertEqual(run.testTime, '2019-01-01T00-00-00')
+        self.assertTrue(run.hasOverview)
+        self.assertEqual(run.files.get().node, node)
+
+
+class LttbTests(TestCase):
+    """
+    Checks the downsampling of graphed series.
+    """
+    def setUp(self):
+        self.x = numpy.arange(100, dtype=float)
+        self.y = numpy.sin(self.x / 5)
+
+    def testShortSeriesKept(self):
+        x, y = lttb(self.x[:10], self.y[:10], 10)
+        numpy.testing.assert_array_equal(x, self.x[:10])
+        x, y = lttb(self.x[:10], self.y[:10], 20)
+        numpy.testing.assert_array_equal(y, self.y[:10])
+
+    def testEndsKept(self):
+        x, y = lttb(self.x, self.y, 10)
+        self.assertEqual(len(x), 10)
+        self.assertEqual((x[0], x[-1]), (0, 99))
+        self.assertEqual((y[0], y[-1]), (self.y[0], self.y[-1]))
+        self.assertTrue((numpy.diff(x) > 0).all())
+
+    def testNaNLeftOut(self):
+        self.y[[0, 50, 51]] = numpy.nan
+        x, y = lttb(self.x, self.y, 10)
+        self.assertEqual(len(x), 10)
+        self.assertFalse(numpy.isnan(y).any())
+        self.assertEqual(x[0], 1)
+        x, y = lttb(self.x, numpy.full(100, numpy.nan), 10)
+        self.assertEqual(len(x), 0)
+
+    def testSeriesPoints(self):
+        sheet = pd.DataFrame({'elapsed': [0.0, 1.0, 2.0, 3.0],
+                              'cpu': [1, None, 'n/a', 4]})
+        x, y = views.seriesPoints(sheet, 'cpu')
+        self.assertEqual((x.tolist(), y.tolist()), ([0, 3], [1, 4]))
+
+
+class PartialUploadTests(TestCase):
+    """
+    Checks that an interrupted upload resumes from its committed offset, and
+    is only moved into place once it matches its digest.
+    """
+    def setUp(self):
+        root = tempfile.TemporaryDirectory()
+        self.addCleanup(root.cleanup)
+        self.path = os.path.join(root.name, 'run', 'result.xlsx')
+        self.data = os.urandom(3000)
+        self.digest = hashlib.sha256(self.data).hexdigest()
+
+    def testResume(self):
+        upload = PartialUpload(self.path)
+        upload.write(0, self.data[:1000])
+        upload.close()
+        upload = PartialUpload(self.path)
+        self.assertEqual(upload.offset, 1000)
+        # Resent bytes before the committed offset are overwritten.
+        upload.write(500, self.data[500:2000])
+        upload.write(2000, self.data[2000:])
+        upload.commit(self.digest)
+        with open(self.path, 'rb') as f:
+            self.assertEqual(f.read(), self.data)
+        self.assertFalse(os.path.exists(upload.partPath))
+
+    def testOutOfOrder(self):
+        upload = PartialUpload(self.path)
+        with self.assertRaises(UploadError):
+            upload.write(10, self.data[10:])
+        upload.write(0, self.data[:100])
+        with self.assertRaises(UploadError):
+            upload.write(200, self.data[200:])
+        upload.close()
+
+    def testDigestMismatch(self):
+        upload = PartialUpload(self.path)
+        upload.write(0, self.data)
+        with self.assertRaises(UploadError):
+            upload.commit(hashlib.sha256(b'other').hexdigest())
+        self.assertFalse(os.path.exists(self.path))
+        self.assertEqual(PartialUpload(self.path).offset, 0)
+
+
+class RangeDownloadTests(TestCase):
+    """
+    Checks that downloads honour a single byte range, answering 206 with the
+    requested bytes, or 416 if the range lies outside the file.
+    """
+    def setUp(self):
+        root = tempfile.TemporaryDirectory()
+        self.addCleanup(root.cleanup)
+        self.root = root.name
+        self.data = bytes(range(256)) * 4
+        with open(os.path.join(self.root, 'result.xlsx'), 'wb') as f:
+            f.write(self.data)
+
+    def download(self, **headers):
+        request = RequestFactory().get('/Reports/result.xlsx', **headers)
+        return views.outputDownload(request, self.root, 'result.xlsx')
+
+    def testParseRange(self):
+        self.assertEqual(views.parseRange('bytes=0-99', 1024), (0, 99))
+        self.assertEqual(views.parseRange('bytes=1000-', 1024), (1000, 1023))
+        self.assertEqual(views.parseRange('bytes=-24', 1024), (1000, 1023))
+        self.assertEqual(views.parseRange('bytes=0-5000', 1024), (0, 1023))
+        self.assertEqual(views.parseRange('bytes=2000-', 1024), 'invalid')
+        self.assertIsNone(views.parseRange('bytes=0-1,5-6', 1024))
+        self.assertIsNone(views.parseRange(None, 1024))
+
+    def testPartialContent(self):
+        response = self.download(HTTP_RANGE='bytes=100-299')
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(response['Content-Range'], 'bytes 100-299/1024')
+        self.assertEqual(b''.join(response.streaming_content),
+                         self.data[100:300])
+
+    def testUnsatisfiable(self):
+        response = self.download(HTTP_RANGE='bytes=2000-')
+        self.assertEqual(response.status_code, 416)
+        self.assertEqual(response['Content-Range'], 'bytes */1024')
+
+    def testStaleIfRange(self):
+        response = self.download(HTTP_RANGE='bytes=100-299',
+                                 HTTP_IF_RANGE='"stale"')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(b''.join(response.streaming_content), self.data)
+
+    def testReadRange(self):
+        path = os.path.join(self.root, 'result.xlsx')
+        chunks = list(views.readRange(path, 10, 300, chunkSize=128))
+        self.assertEqual([len(chunk) for chunk in chunks], [128, 128, 44])
+        self.assertEqual(b''.join(chunks), self.data[10:310])
+
+
+class StreamZipTests(TestCase):
+    """
+    Checks that a streamed archive holds every file of a run, less partial
+    files, and skips files deleted before they are reached.
+    """
+    def testArchive(self):
+        with tempfile.TemporaryDirectory() as root:
+            files = {'result.xlsx': os.urandom(200 << 10),
+                     'metrics/node/col_000.f64': b'\0' * 80,
+                     'result.xlsx.part': b'partial'}
+            for name, data in files.items():
+                os.makedirs(os.path.dirname(os.path.join(root, name)),
+                            exist_ok=True)
+                with open(os.path.join(root, name), 'wb') as f:
+                    f.write(data)
+            members = list(runFiles(root, 'run'))
+            members.append((os.path.join(root, 'gone.xlsx'), 'run/gone'))
+            chunks = list(streamZip(members))
+        self.assertGreater(len(chunks), 2)
+        with zipfile.ZipFile(io.BytesIO(b''.join(chunks))) as zf:
+            self.assertEqual(sorted(zf.namelist()),
+                             ['run/metrics/node/col_000.f64',
+                              'run/result.xlsx'])
+            self.assertEqual(zf.read('run/result.xlsx'),
+                             files['result.xlsx'])
+            self.assertIsNone(zf.testzip())
+
+
+class MetricStoreTests(TestCase):
+    """
+    Checks that streamed metric samples read back as they were written,
+    including while a stream is still writing them.
+    """
+    def setUp(self):
+        root = tempfile.TemporaryDirectory()
+        self.addCleanup(root.cleanup)
+        self.path = os.path.join(root.name, 'node_1')
+
+    def testReadBack(self):
+        with MetricWriter(self.path, ['cpu', 'mem'], flushEvery=4) as writer:
+            for i in range(10):
+                writer.append(100.0 + i, [i, i * 2])
+            # Only the samples flushed so far are read.
+            self.assertEqual(len(readMetrics(self.path)['Time']), 8)
+        metrics = readMetrics(self.path, since=105)
+        self.assertEqual(metrics['Time'].tolist(), [106, 107, 108, 109])
+        self.assertEqual(metrics['mem'].tolist(), [12, 14, 16, 18])
+
+    def testPartialSample(self):
+        with MetricWriter(self.path, ['cpu', 'mem']) as writer:
+            writer.append(100.0, [1, 2])
+        # A sample cut short, with only some of its columns written.
+        with open(columnFile(self.path, 0), 'ab') as f:
+            numpy.array([101.0]).tofile(f)
+        self.assertEqual(readMetrics(self.path)['Time'].tolist(), [100])
+        os.remove(columnFile(self.path, 2))
+        self.assertEqual(readMetrics(self.path)['Time'].tolist(), [])
+        # Reopening the store discards the partial sample.
+        with MetricWriter(self.path, ['cpu', 'mem']) as writer:
+            writer.append(102.0, [3, 4])
+        self.assertEqual(readMetrics(self.path)['cpu'].tolist(), [3])
+
+    def testNamesMismatch(self):
+        MetricWriter(self.path, ['cpu']).close()
+        with self.assertRaises(ValueError):
+            MetricWriter(self.path, ['mem'])
+
+
+class ControlHubTests(TestCase):
+    """
+    Checks that commands sent down a control stream are matched to their
+    results, and that sessions beyond the limit are refused.
+    """
+    def setUp(self):
+        self.hub = ControlHub()
+        self.sent = queue.Queue()
+        self.session = self.hub.open('node', self.sent.put)
+
+    def answer(self, success=True):
+        command = self.sent.get(timeout=5)
+        self.session.resolve(nglm_pb2.commandResult(
+            id=command.id, success=success, message='refused'))
+
+    def testSend(self):
+        client = threading.Thread(target=self.answer)
+        client.start()
+        result = self.hub.send('node', nglm_pb2.controlCommand(), 5)
+        client.join()
+        self.assertTrue(result.success)
+        client = threading.Thread(target=self.answer, args=(False,))
+        client.start()
+        with self.assertRaisesRegex(ControlError, 'refused'):
+            self.hub.send('node', nglm_pb2.controlCommand(), 5)
+        client.join()
+
+    def testTimeoutAndClose(self):
+        with self.assertRaises(ControlError):
+            self.hub.send('node', nglm_pb2.controlCommand(), 0.01)
+        self.assertTrue(self.hub.close(self.session))
+        self.assertFalse(self.hub.isConnected('node'))
+        with self.assertRaises(ControlError):
+            self.hub.send('node', nglm_pb2.controlCommand(), 5)
+
+    def testLimit(self):
+        self.assertIsNone(self.hub.open('other', self.sent.put, limit=1))
+        # A client reconnecting replaces its own session.
+        session = self.hub.open('node', self.sent.put, limit=1)
+        self.assertIsNotNone(session)
+        self.assertTrue(self.session.closed)
+        self.assertFalse(self.hub.close(self.session))
+        self.assertTrue(self.hub.isConnected('node'))
+
+
+class TransitionTests(TestCase):
+    """
+    Checks that a task's status only changes from the expected statuses,
+    even when another copy of the task has already moved it on.
+    """
+    def testCompareAndSet(self):
+        group = NodeGroup.objects.create(groupname='group')
+        task = Task.objects.create(
+            taskName='task', assignedNode=group,
+            startTime=timezone.now() + timedelta(hours=1),
+            duration=timedelta(minutes=5))
+        stale = Task.objects.get(pk=task.pk)
+        self.assertTrue(task.transition('In Progress', ('Scheduled',)))
+        self.assertEqual(task.status, 'In Progress')
+        self.assertFalse(stale.transition('Failed', ('Scheduled',)))
+        self.assertEqual(stale.status, 'Scheduled')
+        self.assertEqual(Task.objects.get(pk=task.pk).status, 'In Progress')
+        self.assertTrue(stale.transition('Completed', ('In Progress',)))
+        self.assertEqual(Task.objects.get(pk=task.pk).status, 'Completed')
+
+
+class ReservationTests(TestCase):
+    """
+    Checks that tasks overlapping on a node are refused, and that a task
+    releases its reservations once it finishes.
+    """
+    def setUp(self):
+        self.node = LGNode.objects.create(hostname='node', ip='10.0.0.1')
+        self.group = NodeGroup.objects.create(groupname='group')
+        self.group.nodes.add(self.node)
+        self.start = timezone.now() + timedelta(hours=1)
+        self.task = self.createTask(self.start)
+
+    def createTask(self, start):
+        return Task.objects.create(
+            taskName='task', assignedNode=self.group, startTime=start,
+            duration=timedelta(minutes=30))
+
+    def newTask(self, start):
+        return Task(taskName='other', assignedNode=self.group,
+                    startTime=start, duration=timedelta(minutes=30))
+
+    def testOverlap(self):
+        with self.assertRaisesRegex(ValidationError, '10.0.0.1'):
+            self.newTask(self.start + timedelta(minutes=20)).clean()
+        self.newTask(self.start + timedelta(minutes=30)).clean()
+        # A task is not in conflict with its own reservations.
+        self.task.clean()
+
+    def testReleasedOnFinish(self):
+        self.task.transition('In Progress', ('Scheduled',))
+        self.assertTrue(self.task.reservations.exists())
+        self.task.transition('Completed', ('In Progress',))
+        self.assertFalse(NodeReservation.objects.exists())
+        self.newTask(self.start).clean()
+        self.task.save()
+        self.assertFalse(NodeReservation.objects.exists())
@@ -18,6 +18,8 @@ urlpatterns = [
             views.TaskResultsView),
     re_path(r'tasks/(?P<taskUUID>.*)/results/(?P<testTime>.*)/overview$',
             views.overviewGraph),
+    re_path(r'tasks/(?P<taskUUID>.*)/results/(?P<testTime>.*)/series$',
+            views.overviewSeries),
     re_path(r'^Reports/(?P<path>.*)$', views.outputDownload,
             {'document_root': OUTPUT_ROOT}),
     re_path(r'search', views.SearchView, name='search'),
@@ -25,8 +27,14 @@ urlpatterns = [
     path('api', api_views.api_root),
     path('api/tasks', api_views.TaskInterface.as_view(), name='api-task'),
     path('api/tasks/<pk>', api_views.TaskView.as_view(), name='api-task-view'),
+    path('api/tasks/<pk>/metrics', api_views.TaskMetricsView.as_view(),
+         name='api-task-metrics'),
     path('api/nodes', api_views.NodeInterface.as_view(), name='api-node'),
     path('api/nodes/<pk>', api_views.NodeView.as_view(), name='api-node-view'),
     path('api/groups', api_views.GroupInterface.as_view(), name='api-group'),
-    path('api/groups/<pk>', api_views.GroupView.as_view(), name='api-group-view')
+    path('api/groups/<pk>', api_views.GroupView.as_view(), name='api-group-view'),
+    path('api/stats/compression', api_views.CompressionStatsView.as_view(),
+         name='api-compression'),
+    path('api/stats/uploads', api_views.UploadStatsView.as_view(),
+         name='api-uploads')
 ]
\ No newline at end of file
@@ -1,10 +1,16 @@
 import os
 import re
 import itertools
+import mimetypes
 import numpy
 
 from django.template import loader
-from django.http import HttpResponse
+from django.http import HttpResponse, HttpResponseBadRequest, Http404, \
+    JsonResponse, FileResponse, StreamingHttpResponse
+from django.core.exceptions import SuspiciousFileOperation
+from django.utils._os import safe_join
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
 from django.shortcuts import redirect
 from django.contrib import messages
 from django.db.models import Count, Q
@@ -16,18 +22,34 @@ from dateutil import parser
 from bokeh.layouts import column
 from bokeh.models.widgets import Panel, Tabs
 from bokeh.plotting import figure
+from bokeh.models import ColumnDataSource, CustomJS
 from bokeh.embed import components
 
 
-from . models import Task, LGNode, NodeGroup
-from nglm_grpc.gRPCMethods import setConfig, ROOT_DIR, getConfig, checkNodes
-from nglm_grpc.modules.Utility import acronymTitleCase, timestamp
+from . models import Task, LGNode, NodeGroup, TestRun
+from nglm_grpc.gRPCMethods import setConfig, ROOT_DIR, getConfig, checkNodes, \
+    catalogRuns
+from nglm_grpc.modules.Archive import streamZip, runFiles
+from nglm_grpc.modules.Utility import acronymTitleCase, timestamp, LRUCache, \
+    lttb
+from NGLogmanServer.settings import GRAPH_CACHE_ENTRIES, GRAPH_CACHE_BYTES, \
+    GRAPH_POINTS_PER_SERIES, GRAPH_FRAME_ENTRIES, GRAPH_FRAME_BYTES
 
 """
 Contains the various views used for the Django webserver. Functional views
 are used in conjunction with Jinja2 templating to render the pages.
 """
 
+# Rendered overview graphs, keyed by run and overview file version.
+GRAPH_CACHE = LRUCache(maxEntries=GRAPH_CACHE_ENTRIES,
+                       maxSize=GRAPH_CACHE_BYTES,
+                       sizeof=lambda rendered: sum(map(len, rendered)))
+# Parsed overview workbooks, keyed by path and file version. Sized deeply,
+# so that the strings of object columns, such as 'node', are counted too.
+FRAME_CACHE = LRUCache(
+    maxEntries=GRAPH_FRAME_ENTRIES, maxSize=GRAPH_FRAME_BYTES,
+    sizeof=lambda frame: frame.memory_usage(deep=True).sum())
+
 def SearchView(request):
     """
     The view for the search results page. Searches for UUID matches, or
@@ -74,7 +96,8 @@ def TaskListView(request):
         'scheduled_tasks': Task.objects.filter(status='Scheduled'),
         'in_progress': Task.objects.filter(status='In Progress'),
         'completed_tasks': Task.objects.filter(status='Completed'),
-        'failed_tasks': Task.objects.filter(status__contains='Failed'),
+        'failed_tasks': Task.objects.filter(status='Failed')
+        .prefetch_related('failures__node'),
     }
     return HttpResponse(template.render(context, request))
 
@@ -90,27 +113,82 @@ def TaskResultsView(request, taskUUID=''):
     template = loader.get_template('results.html')
     task = Task.objects.get(taskUUID=uuid.UUID(taskUUID))
     path = os.path.join(ROOT_DIR, 'Reports', task.taskName + '_' + taskUUID)
+    catalogNewRuns(task, path)
     if request.method == 'POST':
         import shutil
         val = request.POST.get('delete')
-        if os.path.isdir(os.path.join(path, val)):
-            shutil.rmtree(os.path.join(path, val))
+        deleted, _ = TestRun.objects.filter(task=task, testTime=val).delete()
+        if deleted:
+            shutil.rmtree(os.path.join(path, val), ignore_errors=True)
         messages.success(request, 'The test was successfully deleted.')
         return redirect(request.path_info)
 
-    all_tests_list = sorted(next(os.walk(path))[1], reverse=True)
-    completed_tests = []
-    for test in all_tests_list:
-        if os.path.isfile(os.path.join(path, test, 'overview.xlsx')):
-            completed_tests.append(test)
+    completed_tests = list(
+        TestRun.objects.filter(task=task, hasOverview=True)
+        .order_by('-testTime').values_list('testTime', flat=True))
+
+    if request.GET.get('archive'):
+        runs = request.GET.getlist('archive')
+        if runs == ['all']:
+            runs = completed_tests
+        return archiveRuns(path, runs, task.taskName + '_' + taskUUID)
 
     context = {
         'task': task,
-        'test_list': completed_tests
+        'test_list': completed_tests,
+        'node_count': task.assignedNode.nodes.count(),
+        'report_jobs': TestRun.objects.filter(task=task).exclude(
+            reportStatus='Done').order_by('-testTime').annotate(
+            file_count=Count('files'))
     }
     return HttpResponse(template.render(context, request))
 
 
+def catalogNewRuns(task, path):
+    """
+    Catalogs the runs of a task found on disk but not in the run catalog,
+    such as those written before the catalog existed, so that they are
+    listed and can be deleted without running `manage.py catalogruns`.
+    :param task: The Task instance.
+    :param path: The task's directory under Reports.
+    :return: None.
+    """
+    if not os.path.isdir(path):
+        return
+    known = set(TestRun.objects.filter(task=task).values_list(
+        'testTime', flat=True))
+    runs = [name for name in sorted(os.listdir(path)) if name not in known
+            and os.path.isdir(os.path.join(path, name))]
+    if runs:
+        catalogRuns(task, path, runs)
+
+
+def archiveRuns(path, runs, name):
+    """
+    Streams a ZIP archive of one or more runs of a task, as it is built.
+    :param path: The task's output directory.
+    :param runs: The names of the run directories to archive.
+    :param name: The name of the archive when several runs are archived.
+    :return: A streaming response of the archive.
+    """
+    files = []
+    for run in runs:
+        try:
+            runPath = safe_join(path, run)
+        except SuspiciousFileOperation:
+            raise Http404('Test not found.')
+        if not os.path.isdir(runPath) or runPath == path:
+            raise Http404('Test not found.')
+        files.append(runFiles(runPath, run))
+    if len(runs) == 1:
+        name = runs[0]
+
+    response = StreamingHttpResponse(streamZip(itertools.chain(*files)),
+                                     content_type='application/zip')
+    response['Content-Disposition'] = 'attachment; filename="%s.zip"' % name
+    return response
+
+
 def DashboardView(request):
     """
     The view for the landing page (dashboard). Summarizes Tasks/Nodes/Groups.
@@ -132,19 +210,102 @@ def DashboardView(request):
 def outputDownload(request, document_root, path=''):
     """
     Function called for file download. Redirects download links to the
-    corresponding files in the local file hierarchy.
-    :param request: Django HTTP Request object. Unused but required parameter.
+    corresponding files in the local file hierarchy. Files are streamed from
+    disk in chunks rather than read into memory. A single byte range may be
+    requested to resume a download, and repeat downloads are answered with
+    304 Not Modified using the ETag and Last-Modified headers.
+    :param request: Django HTTP Request object.
     :param document_root: The path to the directory containing hosted files.
     :param path: The relative path to the desired file.
-    :return: A response containing the desired file.
+    :return: A response containing the desired file, or part of it.
     """
-    filePath = os.path.join(document_root, path)
-    with open(filePath, 'rb') as f:
-        response = HttpResponse(f.read())
-        response['content_type'] = 'application/vnd.ms-excel'
-        response['Content-Disposition'] = 'attachment;filename=' + path
+    try:
+        filePath = safe_join(document_root, path)
+    except SuspiciousFileOperation:
+        raise Http404('File not found.')
+    if not os.path.isfile(filePath):
+        raise Http404('File not found.')
+    stat = os.stat(filePath)
+    # Like Django's static file serving, the ETag is derived from the file's
+    # version rather than its contents, so it costs no reads.
+    etag = quote_etag('%x-%x' % (stat.st_mtime_ns, stat.st_size))
+    lastModified = int(stat.st_mtime)
+    response = get_conditional_response(request, etag=etag,
+                                        last_modified=lastModified)
+    if response is not None:
         return response
 
+    byteRange = None
+    if request.META.get('HTTP_IF_RANGE', etag) == etag:
+        byteRange = parseRange(request.META.get('HTTP_RANGE'), stat.st_size)
+    if byteRange == 'invalid':
+        response = HttpResponse(status=416)
+        response['Content-Range'] = 'bytes */%d' % stat.st_size
+        return response
+
+    if byteRange is None:
+        response = FileResponse(open(filePath, 'rb'), as_attachment=True)
+    else:
+        first, last = byteRange
+        response = StreamingHttpResponse(
+            readRange(filePath, first, last - first + 1), status=206,
+            content_type=mimetypes.guess_type(filePath)[0]
+            or 'application/octet-stream')
+        response['Content-Length'] = last - first + 1
+        response['Content-Range'] = 'bytes %d-%d/%d' % (first, last,
+                                                        stat.st_size)
+        response['Content-Disposition'] = 'attachment; filename="%s"' \
+            % os.path.basename(filePath)
+    response['Accept-Ranges'] = 'bytes'
+    response['ETag'] = etag
+    response['Last-Modified'] = http_date(lastModified)
+    return response
+
+
+def parseRange(header, size):
+    """
+    Parses an HTTP Range header holding a single byte range. Multiple ranges
+    are not supported, and fall back to sending the whole file.
+    :param header: The value of the Range header, or None.
+    :param size: The size of the file in bytes.
+    :return: A tuple of the first and last byte positions, None to send the
+    whole file, or 'invalid' if the range cannot be satisfied.
+    """
+    match = re.match(r'^bytes=(\d*)-(\d*)$', (header or '').strip())
+    if not match or match.groups() == ('', ''):
+        return None
+    first, last = match.groups()
+    if not first:
+        # A suffix range, requesting the last bytes of the file.
+        first, last = max(0, size - int(last)), size - 1
+    else:
+        first = int(first)
+        if last and int(last) < first:
+            return None
+        last = min(int(last), size - 1) if last else size - 1
+    if first >= size or last < first:
+        return 'invalid'
+    return first, last
+
+
+def readRange(filePath, offset, length, chunkSize=64 << 10):
+    """
+    Yields part of a file in chunks.
+    :param filePath: The path of the file.
+    :param offset: The position of the first byte to read.
+    :param length: The number of bytes to read.
+    :param chunkSize: The size of each yielded chunk.
+    :return: A generator of byte strings.
+    """
+    with open(filePath, 'rb') as f:
+        f.seek(offset)
+        while length > 0:
+            chunk = f.read(min(chunkSize, length))
+            if not chunk:
+                break
+            length -= len(chunk)
+            yield chunk
+
 
 def GroupListView(request):
     """
@@ -189,7 +350,9 @@ def NodeListView(request):
 def ConfigUpload(request, groupID=''):
     """
     The view used for uploading of configuration files to clients. A warning
-    is returned if any of the nodes ni the group are offline. An error is
+    is returned if any of the nodes ni the group are offline. The cached
+    configs of online nodes are fetched if stale, or all of them if the
+    refresh parameter is given. An error is
     displayed if any of the configs failed to be set. The POST method submits
     the form and begins the upload process.
     :param request: Django HTTP requset object.
@@ -209,8 +372,15 @@ def ConfigUpload(request, groupID=''):
         Updated configs will not be fetched and uploaded configs will not be applied.
         ''' % '\n'.join(offline)
         messages.warning(request, msg)
-    else:
-        getConfig(NodeGroup.objects.get(id=groupID).nodes.all())
+
+    # Only configs that are missing or may be stale are fetched, unless a
+    # refresh is requested.
+    online = NodeGroup.objects.get(id=groupID).nodes.exclude(
+        status__iexact="offline")
+    if request.GET.get('refresh'):
+        getConfig(online, refresh=True)
+        return redirect(request.path_info)
+    getConfig(online)
 
     if request.method == 'POST':
         form = ConfigForm(groupID, request.POST, request.FILES)
@@ -241,78 +411,157 @@ def overviewGraph(request, taskUUID='', testTime=''):
     :param testTime: The start time of the test to graph.
     :return: HTTP Response containing the rendered view.
     """
-    from dateutil import parser
+    template = loader.get_template('overview.html')
+    path = getOverviewPath(taskUUID, testTime)
+
+    # A rebuilt overview changes mtime or size, so stale entries are never
+    # served; they age out of the cache instead.
+    stat = os.stat(path)
+    key = (path, stat.st_mtime, stat.st_size)
+    rendered = GRAPH_CACHE.get(key)
+    if rendered is None:
+        rendered = renderOverview(path)
+        GRAPH_CACHE.set(key, rendered)
+    script, div = rendered
+    context = {'bokehScript': script, 'bokehDiv': div}
+    return HttpResponse(template.render(context, request))
+
+
+def overviewSeries(request, taskUUID='', testTime=''):
+    """
+    Returns one node's series for a metric between two elapsed times,
+    downsampled to GRAPH_POINTS_PER_SERIES points. Requested by the overview
+    graphs as they are zoomed or panned, so the visible range is always shown
+    in as much detail as the budget allows.
+    :param request: The HTTP Request object. The GET parameters 'node' and
+    'col' select the series, and 'start' and 'end' the elapsed time range.
+    :param taskUUID: The UUID of the task to graph.
+    :param testTime: The start time of the test to graph.
+    :return: A JSON response with the 'x' and 'y' lists of the series.
+    """
+    frame = loadOverview(getOverviewPath(taskUUID, testTime))
+    col = request.GET.get('col')
+    if col not in frame.columns or col in ('node', 'Time', 'elapsed'):
+        raise Http404('No such metric.')
+    x, y = seriesPoints(frame[frame['node'] == request.GET.get('node')], col)
+    try:
+        start = float(request.GET.get('start', x[0] if len(x) else 0))
+        end = float(request.GET.get('end', x[-1] if len(x) else 0))
+    except ValueError:
+        return HttpResponseBadRequest('start and end must be numbers.')
+
+    # One sample either side of the range is kept, so the line runs to the
+    # edges of the graph.
+    first = max(0, numpy.searchsorted(x, start, side='left') - 1)
+    last = numpy.searchsorted(x, end, side='right') + 1
+    x, y = lttb(x[first:last], y[first:last], GRAPH_POINTS_PER_SERIES)
+    return JsonResponse({'x': x.tolist(), 'y': y.tolist()})
+
+
+def getOverviewPath(taskUUID, testTime):
+    """
+    Returns the path of a run's overview workbook.
+    :param taskUUID: The UUID of the task, as a string.
+    :param testTime: The start time of the run, as formatted in the URL.
+    :return: The path of the overview workbook.
+    """
     dts = testTime.partition('T')
     dts = dts[0] + dts[1] + dts[2].replace('-', ':')
     testTime = parser.parse(dts, ignoretz=True)
-    template = loader.get_template('overview.html')
     task = Task.objects.get(taskUUID=uuid.UUID(taskUUID))
-    xlsx = pd.ExcelFile(os.path.join(
+    return os.path.join(
         ROOT_DIR, "Reports", task.taskName + '_' + taskUUID,
         timestamp(testTime),
-        'overview.xlsx'))
+        'overview.xlsx')
+
+
+def loadOverview(path):
+    """
+    Reads a run's overview workbook into a single DataFrame, with a 'node'
+    column naming the sheet of each row and an 'elapsed' column holding the
+    seconds since the node's first sample. Summary rows are dropped. Frames
+    are cached until the workbook changes.
+    :param path: The path of the run's overview workbook.
+    :return: The overview DataFrame.
+    """
+    stat = os.stat(path)
+    key = (path, stat.st_mtime, stat.st_size)
+    full_df = FRAME_CACHE.get(key)
+    if full_df is not None:
+        return full_df
+
+    xlsx = pd.ExcelFile(path)
     dfs = pd.read_excel(xlsx, sheet_name=None)
-    full_df = pd.DataFrame()
     for name, sheet in dfs.items():
         sheet['node'] = name
-        full_df = full_df.append(sheet)
+    full_df = pd.concat(dfs.values(), ignore_index=True, sort=False)
+    full_df.columns = full_df.columns.str.replace(r'\s+', '_')
+
+    # Summary rows (averages etc.) hold text rather than a time, and are
+    # dropped. Times are parsed once, and the elapsed time of each sample is
+    # measured from the first sample of its node.
+    full_df['Time'] = pd.to_datetime(full_df['Time'], errors='coerce',
+                                     infer_datetime_format=True)
+    full_df = full_df[full_df['Time'].notnull()]
+    first = full_df.groupby('node', sort=False)['Time'].transform('first')
+    full_df['elapsed'] = (full_df['Time'] - first).dt.total_seconds()
+    FRAME_CACHE.set(key, full_df)
+    return full_df
+
+
+def renderOverview(path):
+    """
+    Renders the overview graphs of a run using the Bokeh module. Graphs data
+    from all nodes for each metric.
+    :param path: The path of the run's overview workbook.
+    :return: A tuple of the Bokeh script and div to embed.
+    """
+    full_df = loadOverview(path)
+    nodes = [(node, sheet) for node, sheet
+             in full_df.groupby('node', sort=False)]
 
     figures = {'CPU': [], 'Memory': [], 'Disk IO': [], 'Network IO': [],
                'Other': []}
     # statlines = {}
-    full_df.columns = full_df.columns.str.replace(r'\s+', '_')
     tooltips = [('(x, y)', '($x{int}, $y)')]
-    times = {}
-    start = {}
+    # Fixed ranges keep the reset tool returning to the whole run, rather
+    # than to the extent of whichever zoomed series was last fetched.
+    x_range = (0, full_df['elapsed'].max() if len(full_df) else 0)
 
     cpu_plots = {}
     from bokeh.palettes import Category10_10 as small_palette
     cpu_colors = itertools.cycle(small_palette)
 
-    for row in full_df.itertuples():
-        if not row.Time.upper().isupper():
-            if row.node not in start:
-                start[row.node] = parser.parse(row.Time, ignoretz=True)
-            if row.node not in times:
-                times[row.node] = []
-            elapsed = parser.parse(row.Time) - start[row.node]
-            times[row.node].append(elapsed.total_seconds())
     for col in full_df:
-        if col == 'node' or col == 'Time':
+        if col in ('node', 'Time', 'elapsed'):
             continue
 
         if re.search('CPU\d', col):
-            data = {}
-            for row in full_df.itertuples():
-                if row.node not in cpu_plots:
-                    cpu_plots[row.node] = figure(
+            for node, sheet in nodes:
+                if node not in cpu_plots:
+                    cpu_plots[node] = figure(
                         width=1000, height=300,
                         x_axis_label='Time Elapsed (s)',
                         y_axis_label='CPU Used Percentage',
-                        title=row.node + ' CPU Used Percentage',
-                        sizing_mode='stretch_both',
+                        title=node + ' CPU Used Percentage',
+                        sizing_mode='stretch_both', x_range=x_range,
                         tooltips=tooltips
                     )
-                    cpu_plots[row.node].title.text_font_size = '14pt'
-                    cpu_plots[row.node].title.text_font_style = 'bold'
-
-                if row.node not in data:
-                    data[row.node] = []
-
-                data[row.node].append(getattr(row, col))
-
-            for node, val in data.items():
-                if not numpy.isnan(val).any():
-                    y_average = [sum(val) / len(val)] * len(val)
-                    color = next(cpu_colors)
-                    cpu_plots[node].line(times[node], val,
-                                         legend=acronymTitleCase(
-                                             col.replace('_', ' ')
-                                         ),
-                                         color=color, line_width=2)
-                    cpu_plots[node].line(times[node], y_average,
-                                         line_dash='dashed', color=color)
-                    cpu_plots[node].legend.click_policy = "hide"
+                    cpu_plots[node].title.text_font_size = '14pt'
+                    cpu_plots[node].title.text_font_style = 'bold'
+
+                source = seriesSource(node, sheet, col)
+                if source is None:
+                    continue
+                color = next(cpu_colors)
+                cpu_plots[node].line('x', 'y', source=source,
+                                     legend=acronymTitleCase(
+                                         col.replace('_', ' ')
+                                     ),
+                                     color=color, line_width=2)
+                cpu_plots[node].line(*averageLine(sheet, col),
+                                     line_dash='dashed', color=color)
+                cpu_plots[node].legend.click_policy = "hide"
             continue
 
         plot = figure(
@@ -320,40 +569,29 @@ def overviewGraph(request, taskUUID='', testTime=''):
             x_axis_label='Time Elapsed (s)',
             y_axis_label=acronymTitleCase(col.replace('_', ' ')),
             title=acronymTitleCase(col.replace('_', ' ')),
-            sizing_mode='stretch_both',
+            sizing_mode='stretch_both', x_range=x_range,
             tooltips=tooltips
         )
         plot.title.text_font_size = '14pt'
         plot.title.text_font_style = 'bold'
 
-        data = {}
-        for row in full_df.itertuples():
-            if not row.Time.upper().isupper():
-                if row.node not in data:
-                    data[row.node] = []
-                data[row.node].append(getattr(row, col))
-            # else:
-            #     if not statlines.get(row.Time):
-            #         statlines[row.Time] = []
-            #     statlines[row.Time].append(plot.line(
-            #         row.Index, col, line_dash='dashed', visible=False))
-        if len(data.items()) <= 10:
+        if len(nodes) <= 10:
             palette = small_palette
         else:
             from bokeh.palettes import Category20_20 as palette
 
         colors = itertools.cycle(palette)
-        for node, val in data.items():
-            if not numpy.isnan(val).any():
-                y_average = [sum(val) / len(val)] * len(val)
-                color = next(colors)
-                plot.line(times[node], val, legend=node, color=color,
-                          line_width=2)
-                plot.line(times[node], y_average,
-                          line_dash='dashed', color=color)
-    #        plot.circle(val[0], val[1], fill_color="white", color=color,
-    #                    size=8)
+        for node, sheet in nodes:
+            source = seriesSource(node, sheet, col)
+            if source is None:
+                continue
+            color = next(colors)
+            plot.line('x', 'y', source=source, legend=node, color=color,
+                      line_width=2)
+            plot.line(*averageLine(sheet, col), line_dash='dashed',
+                      color=color)
         plot.legend.click_policy = "hide"
+        fetchOnZoom(plot)
 
         if 'cpu' in col.lower():
             figures['CPU'].append(plot)
@@ -368,6 +606,7 @@ def overviewGraph(request, taskUUID='', testTime=''):
             figures['Other'].append(plot)
 
     for node, plot in cpu_plots.items():
+        fetchOnZoom(plot)
         figures['CPU'].append(plot)
 
     tabs = []
@@ -380,6 +619,80 @@ def overviewGraph(request, taskUUID='', testTime=''):
     # select.callback = CustomJS(args=statlines, code="""
     #
     # """)
-    script, div = components(tabs)
-    context = {'bokehScript': script, 'bokehDiv': div}
-    return HttpResponse(template.render(context, request))
+    return components(tabs)
+
+
+def seriesSource(node, sheet, col):
+    """
+    Builds the Bokeh data source of one node's series for a metric,
+    downsampled to GRAPH_POINTS_PER_SERIES points. The source is tagged with
+    the node and metric, so it can be refetched by overviewSeries.
+    :param node: The name of the node.
+    :param sheet: The node's rows of the overview DataFrame.
+    :param col: The metric column to graph.
+    :return: A ColumnDataSource with 'x' (elapsed seconds) and 'y' columns,
+    or None if the series has no values.
+    """
+    x, y = seriesPoints(sheet, col)
+    if not len(x):
+        return None
+    x, y = lttb(x, y, GRAPH_POINTS_PER_SERIES)
+    return ColumnDataSource(data={'x': x, 'y': y}, tags=[node, col])
+
+
+def seriesPoints(sheet, col):
+    """
+    Returns the elapsed times and values of one node's series for a metric.
+    Samples whose value is missing, or not a number, are left out, so that
+    no NaN reaches the graphs or their JSON.
+    :param sheet: The node's rows of the overview DataFrame.
+    :param col: The metric column of the series.
+    :return: A tuple of numpy arrays of the x and y values.
+    """
+    x = sheet['elapsed'].values.astype(float)
+    y = pd.to_numeric(sheet[col], errors='coerce').values.astype(float)
+    present = ~(numpy.isnan(x) | numpy.isnan(y))
+    return x[present], y[present]
+
+
+def averageLine(sheet, col):
+    """
+    Returns the endpoints of a flat line at the mean of a series, spanning
+    the series' time range. Uses every sample, not the downsampled series.
+    :param sheet: The node's rows of the overview DataFrame.
+    :param col: The metric column of the series.
+    :return: A tuple of the x and y coordinate lists.
+    """
+    x, y = seriesPoints(sheet, col)
+    average = numpy.mean(y)
+    return [x[0], x[-1]], [average, average]
+
+
+def fetchOnZoom(plot):
+    """
+    Makes a figure refetch its series from overviewSeries whenever its x
+    range settles, so zooming in shows the full resolution data.
+    :param plot: The Bokeh figure.
+    :return: None.
+    """
+    sources = [r.data_source for r in plot.renderers
+               if isinstance(getattr(r, 'data_source', None),
+                             ColumnDataSource) and r.data_source.tags]
+    callback = CustomJS(args={'sources': sources}, code="""
+        var range = cb_obj;
+        clearTimeout(range._fetchTimer);
+        range._fetchTimer = setTimeout(function() {
+            sources.forEach(function(source) {
+                var query = 'node=' + encodeURIComponent(source.tags[0]) +
+                    '&col=' + encodeURIComponent(source.tags[1]) +
+                    '&start=' + range.start + '&end=' + range.end;
+                fetch('series?' + query).then(function(response) {
+                    return response.json();
+                }).then(function(data) {
+                    source.data = data;
+                });
+            });
+        }, 250);
+    """)
+    plot.x_range.js_on_change('start', callback)
+    plot.x_range.js_on_change('end', callback)